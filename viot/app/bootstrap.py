@@ -9,6 +9,10 @@ from app.common.exception.handler import register_exception_handlers
 from app.common.fastapi import JSONResponse, setup_openapi
 from app.config import app_settings
 from app.extension.redis.client import RedisClient
+from app.module.auth.service.password_service import PasswordService
+from app.module.device.presence_flusher import DevicePresenceFlusher
+from app.module.device_data.connect_log_writer import ConnectLogWriter
+from app.module.device_data.ingest_batcher import DeviceDataIngestBatcher
 
 from . import __version__
 
@@ -17,10 +21,15 @@ from . import __version__
 async def _lifespan(_: FastAPI) -> AsyncGenerator[None, None]:
     redis_client = injector.get(RedisClient)
     await redis_client.open()
+    injector.get(DevicePresenceFlusher).start()
 
     yield
 
+    await injector.get(DeviceDataIngestBatcher).drain()
+    await injector.get(ConnectLogWriter).drain()
+    await injector.get(DevicePresenceFlusher).stop()
     await redis_client.close()
+    injector.get(PasswordService).shutdown()
 
 
 def create_app() -> FastAPI:
@@ -1,5 +1,5 @@
 from .base import BaseInDto, BaseOutDto, ErrorDto
-from .paging import PagingDto
+from .paging import CursorPagingDto, PagingDto
 from .types import NameStr, NameWithNumberStr, PageQuery, PageSizeQuery, QueryStr, TeamSlug
 
 __all__ = [
@@ -7,6 +7,7 @@ __all__ = [
     "BaseOutDto",
     "ErrorDto",
     "PagingDto",
+    "CursorPagingDto",
     "NameStr",
     "NameWithNumberStr",
     "TeamSlug",
@@ -30,3 +30,17 @@ class PagingDto(BaseOutDto, Generic[T]):
     @property
     def has_previous_page(self) -> bool:
         return self.page > 1
+
+
+class CursorPagingDto(BaseOutDto, Generic[T]):
+    """
+    Cursor paging DTO, `next_cursor` is None on the last page.
+
+    `total_items` is only set when requested. It may be a lower bound, counting stops
+    at a cap so that the count never costs more than the cap, see `total_items_capped`.
+    """
+
+    items: list[T]
+    next_cursor: str | None
+    total_items: int | None = None
+    total_items_capped: bool = False
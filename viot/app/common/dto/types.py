@@ -36,6 +36,26 @@ PageSizeQuery = Annotated[
     Query(ge=1, le=50, alias="pageSize", description="Maximum amount of entities in one page"),
 ]
 
+# Cursor paging
+CursorQuery = Annotated[
+    str | None,
+    Query(
+        alias="cursor",
+        description="The `nextCursor` of the previous page, omit it for the first page",
+    ),
+]
+LimitQuery = Annotated[
+    int,
+    Query(ge=1, le=100, alias="limit", description="Maximum amount of entities in one page"),
+]
+IncludeTotalQuery = Annotated[
+    bool,
+    Query(
+        alias="includeTotal",
+        description="Count the entities of all pages, the count is capped for large results",
+    ),
+]
+
 # Sorting
 OrderByQuery = Annotated[
     SortDirection,
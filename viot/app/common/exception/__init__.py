@@ -3,6 +3,7 @@ from .base import (
     InternalServerException,
     NotFoundException,
     PermissionDeniedException,
+    TooManyRequestsException,
     UnauthorizedException,
     ViotException,
 )
@@ -11,6 +12,7 @@ __all__ = [
     "BadRequestException",
     "NotFoundException",
     "PermissionDeniedException",
+    "TooManyRequestsException",
     "UnauthorizedException",
     "ViotException",
     "InternalServerException",
@@ -58,3 +58,12 @@ class NotFoundException(InternalServerException):
         self, *, code: str = MessageError.NOT_FOUND, message: str = "Resource not found"
     ) -> None:
         super().__init__(code=code, message=message)
+
+
+class TooManyRequestsException(InternalServerException):
+    STATUS_CODE = 429
+
+    def __init__(
+        self, *, code: str = MessageError.TOO_MANY_REQUESTS, message: str = "Too many requests"
+    ) -> None:
+        super().__init__(code=code, message=message)
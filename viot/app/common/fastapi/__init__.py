@@ -1,10 +1,11 @@
 from .context import background_tasks_ctx, request_ctx
 from .dependency import DependBackgroundTasks, DependRequest
 from .open_api import setup_openapi
-from .serializer import JSONResponse
+from .serializer import JSONResponse, MsgspecJSONResponse
 
 __all__ = [
     "JSONResponse",
+    "MsgspecJSONResponse",
     "setup_openapi",
     "request_ctx",
     "background_tasks_ctx",
@@ -46,3 +46,15 @@ class JSONResponse(Response, Generic[T]):
             headers = {}
         headers["content-length"] = "0"
         return cls(content=None, status_code=204, headers=headers, background=background)  # type: ignore
+
+
+class MsgspecJSONResponse(JSONResponse[T]):
+    """
+    JSON response for content that `msgspec` encodes natively, like structs, dicts,
+    lists and datetimes. It skips `jsonable_encoder` and encodes the content in one pass.
+    """
+
+    def render(self, content: T) -> bytes:
+        if content is None:
+            return b""
+        return msgspec.json.encode(content)
@@ -1,5 +1,24 @@
+from collections.abc import Awaitable, Callable
 from contextvars import ContextVar
+from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 session_ctx = ContextVar[AsyncSession]("session")
+
+_AFTER_COMMIT = "after_commit"
+
+
+def after_commit(callback: Callable[[], Awaitable[Any]]) -> None:
+    """
+    Run `callback` once the transaction of the current session commits, dropped if it
+    rolls back. For cache invalidations: invalidated before the commit, a concurrent
+    request would cache the rows being replaced again.
+    """
+    session_ctx.get().info.setdefault(_AFTER_COMMIT, []).append(callback)
+
+
+async def run_after_commit(session: AsyncSession) -> None:
+    """Run the callbacks registered with `after_commit`, after the session committed"""
+    for callback in session.info.pop(_AFTER_COMMIT, []):
+        await callback()
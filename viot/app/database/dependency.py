@@ -3,7 +3,7 @@ from collections.abc import AsyncGenerator
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from .context import session_ctx
+from .context import run_after_commit, session_ctx
 from .engine import async_engine
 
 
@@ -14,7 +14,8 @@ async def get_session() -> AsyncGenerator[None, None]:
     sequence of `AsyncSession` objects. It initializes a new session using
     `AsyncSessionFactory`, associates the session with the `CrudRepository`
     context, and yields the session for use. After the session is utilized,
-    it commits any changes and closes the session.
+    it commits any changes, runs the callbacks registered with `after_commit`
+    and closes the session.
 
     **Important Notes:**
     - This function is designed to be used as a dependency within FastAPI
@@ -37,6 +38,7 @@ async def get_session() -> AsyncGenerator[None, None]:
         try:
             async with session.begin():
                 yield
+            await run_after_commit(session)
         finally:
             session_ctx.reset(token)
 
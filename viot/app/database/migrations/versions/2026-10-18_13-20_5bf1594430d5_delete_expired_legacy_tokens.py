@@ -0,0 +1,37 @@
+"""delete expired legacy tokens
+
+Refresh and password reset tokens moved to Redis. Tokens still in Postgres are
+accepted until they expire, and moved to Redis on first use. Expired rows were
+never deleted, they are dropped here. The tables can be dropped once the longest
+token duration has passed.
+
+Revision ID: 5bf1594430d5
+Revises: 70101732a6a0
+Create Date: 2026-10-18 13:20:44.172903
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+from app.module.auth.constants import FORGOT_PASSWORD_DURATION_SEC
+
+# revision identifiers, used by Alembic.
+revision: str = "5bf1594430d5"
+down_revision: str | None = "70101732a6a0"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.execute("DELETE FROM refresh_tokens WHERE expires_at < now();")
+    op.execute(
+        "DELETE FROM password_resets "
+        f"WHERE created_at < now() - interval '{FORGOT_PASSWORD_DURATION_SEC} seconds';"
+    )
+
+
+def downgrade() -> None:
+    # Deleted rows were expired, there is nothing to restore
+    pass
@@ -0,0 +1,37 @@
+"""backfill device data rollups
+
+The rollups were created WITH NO DATA and their refresh policies only cover the last
+3 hours/3 days/30 days. Once a policy has run, real-time aggregation starts after its
+watermark, so the history before the policy windows is materialized here, once.
+
+refresh_continuous_aggregate can't run in a transaction, the refreshes run in an
+autocommit block. Each refresh reads the whole source, on a large device_data table
+this migration takes a while.
+
+Revision ID: 830f8dda39f8
+Revises: e5707fb8d3f7
+Create Date: 2026-10-18 14:10:36.904417
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "830f8dda39f8"
+down_revision: str | None = "e5707fb8d3f7"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Finest first, each rollup is built on top of the previous one
+    with op.get_context().autocommit_block():
+        for view in ("device_data_1m", "device_data_1h", "device_data_1d"):
+            op.execute(f"CALL refresh_continuous_aggregate('{view}', NULL, NULL);")
+
+
+def downgrade() -> None:
+    # Materialized buckets are the same as computed on read, there is nothing to undo
+    pass
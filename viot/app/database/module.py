@@ -1,9 +1,10 @@
 from contextvars import ContextVar
 
 from injector import Module, provider
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 
 from .context import session_ctx
+from .engine import async_engine
 
 
 class DatabaseModule(Module):
@@ -14,3 +15,7 @@ class DatabaseModule(Module):
     @provider
     def provide_session_context(self) -> ContextVar[AsyncSession]:
         return session_ctx
+
+    @provider
+    def provide_async_engine(self) -> AsyncEngine:
+        return async_engine
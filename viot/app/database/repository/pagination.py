@@ -1,3 +1,5 @@
+import base64
+import binascii
 from collections.abc import Sequence
 from typing import Any, Generic, Literal, TypeVar
 
@@ -31,6 +33,7 @@ FilterOperator = Literal[
 ]
 
 TSelect = TypeVar("TSelect", bound=tuple[Any, ...])
+TCursor = TypeVar("TCursor")
 
 
 class Sort:
@@ -136,7 +139,11 @@ class PageableRepository(CrudRepository[TBaseModel, TPrimaryKey]):
 
         # Count query (apply only filters)
         count_query = select(func.count()).select_from(
-            pageable.apply(base_query, self._model).order_by(None).limit(None).subquery()
+            pageable.apply(base_query, self._model)
+            .order_by(None)
+            .limit(None)
+            .offset(None)
+            .subquery()
         )
 
         # Execute queries
@@ -150,3 +157,24 @@ class PageableRepository(CrudRepository[TBaseModel, TPrimaryKey]):
         return Page(
             items=items, total_items=total_items, page=pageable.page, page_size=pageable.page_size
         )
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encode the keyset values of the last returned row into an opaque, url-safe cursor.
+    """
+    return base64.urlsafe_b64encode(msgspec.json.encode(values)).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, cursor_type: type[TCursor]) -> TCursor:
+    """
+    Decode a cursor created by `encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed or doesn't match the expected type
+    """
+    try:
+        data = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return msgspec.json.decode(data, type=cursor_type)
+    except (binascii.Error, msgspec.DecodeError) as e:
+        raise ValueError("Invalid cursor") from e
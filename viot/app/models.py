@@ -4,12 +4,13 @@ from app.module.auth.model.refresh_token import RefreshToken
 from app.module.auth.model.role import Role
 from app.module.auth.model.role_permission import RolePermission
 from app.module.auth.model.user import User
-from app.module.auth.model.user_team_role import UserTeamRole
+from app.module.auth.model.user_team_role import UserTeamPermission, UserTeamRole
 from app.module.device.model.device import Device, Gateway, SubDevice
 from app.module.device_data.model.connect_log import ConnectLog
 from app.module.device_data.model.device_attribute import DeviceAttribute
 from app.module.device_data.model.device_data import DeviceData
 from app.module.device_data.model.device_data_latest import DeviceDataLatest
+from app.module.device_data.model.device_data_retention_policy import DeviceDataRetentionPolicy
 from app.module.rule_action.model.action import Action
 from app.module.rule_action.model.rule import Rule
 from app.module.rule_action.model.rule_action import RuleAction
@@ -24,6 +25,7 @@ __all__ = [
     "Permission",
     "RolePermission",
     "UserTeamRole",
+    "UserTeamPermission",
     "RefreshToken",
     "TeamInvitation",
     "Device",
@@ -33,6 +35,7 @@ __all__ = [
     "DeviceAttribute",
     "DeviceData",
     "DeviceDataLatest",
+    "DeviceDataRetentionPolicy",
     "Rule",
     "Action",
     "RuleAction",
@@ -0,0 +1,60 @@
+import hashlib
+import time
+
+import msgspec
+from injector import inject
+
+from app.common.lru import TTLCache
+
+from ..config import auth_settings
+from ..constants import ACCESS_TOKEN_DURATION_SEC
+from ..utils.token_utils import AccessToken, decode_access_token
+
+
+class AccessTokenCacheMetrics(msgspec.Struct, rename="camel"):
+    size: int
+    capacity: int
+    hits: int
+    misses: int
+    hit_rate: float | None
+
+
+class AccessTokenCache:
+    """
+    Decoded access tokens of this process, so a token reused by a client is verified once.
+
+    Entries are keyed by a BLAKE2b digest of the raw token and expire with the token,
+    an expired token is decoded again and rejected. Tokens can't be revoked, a token
+    signed with a rotated secret stays valid here until it expires.
+    """
+
+    @inject
+    def __init__(self) -> None:
+        self._local: TTLCache[bytes, AccessToken] = TTLCache(
+            maxsize=auth_settings.ACCESS_TOKEN_CACHE_SIZE, ttl_sec=ACCESS_TOKEN_DURATION_SEC
+        )
+        self._hits = 0
+        self._misses = 0
+
+    def parse(self, token: str) -> AccessToken:
+        """Same as `parse_access_token`, raises on invalid or expired tokens"""
+        key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        access_token = self._local.get(key)
+        if access_token is not None:
+            self._hits += 1
+            return access_token
+
+        self._misses += 1
+        access_token, expires_at = decode_access_token(token)
+        self._local.set(key, access_token, ttl_sec=expires_at - time.time())
+        return access_token
+
+    def metrics(self) -> AccessTokenCacheMetrics:
+        lookups = self._hits + self._misses
+        return AccessTokenCacheMetrics(
+            size=len(self._local),
+            capacity=self._local.maxsize,
+            hits=self._hits,
+            misses=self._misses,
+            hit_rate=self._hits / lookups if lookups else None,
+        )
@@ -0,0 +1,108 @@
+import logging
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.common.lru import TTLCache
+from app.extension.redis.client import RedisClient
+
+from ..config import auth_settings
+from ..dto.user_dto import CurrentUser
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: user key, KEYS[2]: user generation
+# ARGV[1]: generation read before the user was queried, ARGV[2]: ttl in seconds,
+# ARGV[3]: JSON snapshot
+# Snapshots read before an invalidation are dropped, they may be outdated.
+_SET_USER_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[2])
+return 1
+"""
+
+
+def current_user_cache_key(user_id: UUID) -> str:
+    """Redis string of a user, JSON snapshot of the user"""
+    return f"viot:current_user:{user_id}"
+
+
+def current_user_generation_key(user_id: UUID) -> str:
+    """Redis counter of a user, incremented by every invalidation"""
+    return f"viot:current_user_generation:{user_id}"
+
+
+class CurrentUserCache:
+    """
+    Snapshots of authenticated users, cached in process and in Redis.
+
+    Services changing a field of the snapshot, or deleting the user, must call
+    `invalidate` once the change is committed, see `after_commit`. Redis and decoding
+    errors are logged and treated as cache misses.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._set_user = redis_client.register_script(_SET_USER_SCRIPT)
+        self._ttl_sec = auth_settings.CURRENT_USER_CACHE_TTL_SEC
+        self._local: TTLCache[UUID, CurrentUser] = TTLCache(
+            maxsize=auth_settings.CURRENT_USER_LOCAL_CACHE_SIZE,
+            ttl_sec=auth_settings.CURRENT_USER_LOCAL_CACHE_TTL_SEC,
+        )
+        self._decoder = msgspec.json.Decoder(CurrentUser)
+
+    async def get(self, user_id: UUID) -> tuple[str, CurrentUser | None]:
+        """Returns the generation to pass to `set`, and the cached snapshot or None"""
+        user = self._local.get(user_id)
+        if user is not None:
+            return "", user
+
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(current_user_generation_key(user_id))
+                pipe.get(current_user_cache_key(user_id))
+                generation, value = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to read user {user_id} from cache: {e}")
+            return "", None
+
+        if value is None:
+            return generation or "0", None
+
+        try:
+            user = self._decoder.decode(value)
+        except msgspec.DecodeError as e:
+            # Includes ValidationError, e.g. a snapshot cached with a previous layout
+            logger.warning(f"Failed to decode cached user {user_id}: {e}")
+            return generation or "0", None
+        self._local.set(user_id, user)
+        return generation or "0", user
+
+    async def set(self, generation: str, user: CurrentUser) -> None:
+        """Cache a snapshot read from the database, skipped if the user was invalidated since"""
+        self._local.set(user.id, user)
+        if not generation:
+            return
+
+        try:
+            await self._set_user(
+                keys=[current_user_cache_key(user.id), current_user_generation_key(user.id)],
+                args=[generation, self._ttl_sec, msgspec.json.encode(user)],
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to cache user {user.id}: {e}")
+
+    async def invalidate(self, user_id: UUID) -> None:
+        self._local.pop(user_id)
+        try:
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(current_user_generation_key(user_id))
+                pipe.delete(current_user_cache_key(user_id))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate cache of user {user_id}: {e}")
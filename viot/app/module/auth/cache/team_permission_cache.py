@@ -0,0 +1,119 @@
+import logging
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.common.lru import TTLCache
+from app.extension.redis.client import RedisClient
+
+from ..config import auth_settings
+
+logger = logging.getLogger(__name__)
+
+# KEYS[1]: team hash, KEYS[2]: team generation
+# ARGV[1]: generation read before the scopes were queried, ARGV[2]: ttl in seconds,
+# ARGV[3]: user id, ARGV[4]: JSON scopes
+# Scopes read before an invalidation are dropped, they may be outdated.
+_SET_SCOPES_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') ~= ARGV[1] then
+    return 0
+end
+redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+
+def team_permission_cache_key(team_id: UUID) -> str:
+    """Redis hash of a team, field: user id, value: JSON permission scopes of the user"""
+    return f"viot:team_permission:{team_id}"
+
+
+def team_permission_generation_key(team_id: UUID) -> str:
+    """Redis counter of a team, incremented by every invalidation"""
+    return f"viot:team_permission_generation:{team_id}"
+
+
+class TeamPermissionCache:
+    """
+    Permission scopes of users in teams, cached in process and in Redis.
+    A user that isn't a member of the team has no scopes, that is cached too.
+
+    Services changing roles, role permissions or memberships must call
+    `invalidate_team` or `invalidate_member` once the change is committed, see
+    `after_commit`. Redis errors are logged and treated as cache misses.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._set_scopes = redis_client.register_script(_SET_SCOPES_SCRIPT)
+        self._ttl_sec = auth_settings.TEAM_PERMISSION_CACHE_TTL_SEC
+        self._local: TTLCache[tuple[UUID, UUID], frozenset[str]] = TTLCache(
+            maxsize=auth_settings.TEAM_PERMISSION_LOCAL_CACHE_SIZE,
+            ttl_sec=auth_settings.TEAM_PERMISSION_LOCAL_CACHE_TTL_SEC,
+        )
+
+    async def get(self, user_id: UUID, team_id: UUID) -> tuple[str, frozenset[str] | None]:
+        """Returns the generation to pass to `set`, and the cached scopes or None"""
+        scopes = self._local.get((user_id, team_id))
+        if scopes is not None:
+            return "", scopes
+
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(team_permission_generation_key(team_id))
+                pipe.hget(team_permission_cache_key(team_id), str(user_id))
+                generation, value = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to read permissions of team {team_id} from cache: {e}")
+            return "", None
+
+        if value is None:
+            return generation or "0", None
+
+        scopes = frozenset(msgspec.json.decode(value, type=list[str]))
+        self._local.set((user_id, team_id), scopes)
+        return generation or "0", scopes
+
+    async def set(
+        self, user_id: UUID, team_id: UUID, generation: str, scopes: frozenset[str]
+    ) -> None:
+        """Cache scopes read from the database, skipped if the team was invalidated since"""
+        self._local.set((user_id, team_id), scopes)
+        if not generation:
+            return
+
+        try:
+            await self._set_scopes(
+                keys=[team_permission_cache_key(team_id), team_permission_generation_key(team_id)],
+                args=[generation, self._ttl_sec, str(user_id), msgspec.json.encode(sorted(scopes))],
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to cache permissions of team {team_id}: {e}")
+
+    async def invalidate_team(self, team_id: UUID) -> None:
+        """Hook for changes of the roles of a team, drops the scopes of all its members"""
+        self._local.pop_where(lambda key: key[1] == team_id)
+        try:
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(team_permission_generation_key(team_id))
+                pipe.delete(team_permission_cache_key(team_id))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate permission cache of team {team_id}: {e}")
+
+    async def invalidate_member(self, user_id: UUID, team_id: UUID) -> None:
+        """Hook for changes of a membership, drops the scopes of the user in the team"""
+        self._local.pop((user_id, team_id))
+        try:
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                pipe.incr(team_permission_generation_key(team_id))
+                pipe.hdel(team_permission_cache_key(team_id), str(user_id))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(
+                f"Failed to invalidate permission cache of user {user_id} in team {team_id}: {e}"
+            )
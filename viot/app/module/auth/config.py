@@ -1,14 +1,57 @@
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from .constants import BCRYPT_SALT_ROUNDS
+
 
 class AuthSettings(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="VIOT_AUTH_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
     )
 
-    JWT_SECRET: str
+    # Tokens are signed with JWT_ALGORITHM. HS256 uses JWT_SECRET, tokens can only be
+    # verified by this API. EdDSA and ES256 use the private keys of JWT_KEYS_DIR, PEM files
+    # named `<key id>.pem`, and publish their public keys at /.well-known/jwks.json for
+    # other services to verify tokens locally.
+    # Rotation: add the new key and wait for consumers to refresh their JWKS, switch
+    # JWT_SIGNING_KEY_ID to it, then remove the old key once its tokens have expired.
+    # Public key files verify tokens without signing, e.g. a key kept until then.
+    # When JWT_SECRET is set along an asymmetric algorithm, HS256 tokens issued before the
+    # switch are still accepted, it can be unset once they have expired.
+    JWT_ALGORITHM: Literal["HS256", "EdDSA", "ES256"] = "HS256"
+    JWT_SECRET: str = ""
+    JWT_KEYS_DIR: str | None = None
+    JWT_SIGNING_KEY_ID: str | None = None
+
+    # Passwords are hashed with this cost, hashes of another cost are upgraded on login
+    BCRYPT_SALT_ROUNDS: int = BCRYPT_SALT_ROUNDS
+    # bcrypt runs in a dedicated thread pool, calls beyond the pending limit
+    # (running and queued) are rejected with 429 instead of queueing without bound
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Permission scopes of (user, team) pairs, cached in Redis and in each process.
+    # Changes made through the API invalidate both, the local TTL bounds how long another
+    # process may still use scopes that were changed by a concurrent request.
+    TEAM_PERMISSION_CACHE_TTL_SEC: int = 5 * 60
+    TEAM_PERMISSION_LOCAL_CACHE_TTL_SEC: int = 5
+    TEAM_PERMISSION_LOCAL_CACHE_SIZE: int = 10_000
+
+    # Refresh and password reset tokens live in Redis. Tokens issued before, still in
+    # Postgres, are accepted and moved to Redis on first use. Can be disabled once
+    # REFRESH_TOKEN_DURATION_SEC has passed since the upgrade.
+    LEGACY_DB_TOKENS_ENABLED: bool = True
+
+    # Decoded access tokens in each process, keyed by a digest of the raw token.
+    # Entries expire with their token, a cached token skips the signature verification.
+    ACCESS_TOKEN_CACHE_SIZE: int = 10_000
+
+    # Snapshots of authenticated users, same layers and invalidation as the permissions
+    CURRENT_USER_CACHE_TTL_SEC: int = 60
+    CURRENT_USER_LOCAL_CACHE_TTL_SEC: int = 5
+    CURRENT_USER_LOCAL_CACHE_SIZE: int = 10_000
 
 
 @lru_cache
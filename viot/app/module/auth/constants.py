@@ -19,7 +19,6 @@ PASSWORD_REGEX_VALIDATION_ERROR_MSG = (
 
 
 # JWT constants
-JWT_ALG = "HS256"
 ACCESS_TOKEN_DURATION_SEC = 60 * 5  # 5 minutes
 REFRESH_TOKEN_DURATION_SEC = 60 * 60 * 24 * 21  # 21 days
 REFRESH_TOKEN_SAMESITE = "Lax"
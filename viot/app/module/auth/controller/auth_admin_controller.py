@@ -0,0 +1,33 @@
+from classy_fastapi import get
+from injector import inject
+
+from app.common.controller import Controller
+from app.common.fastapi.serializer import MsgspecJSONResponse
+from app.database.dependency import DependSession
+
+from ..cache.access_token_cache import AccessTokenCache, AccessTokenCacheMetrics
+from ..constants import ViotUserRole
+from ..dependency import RequireGlobalRole
+
+
+class AuthAdminController(Controller):
+    @inject
+    def __init__(self, access_token_cache: AccessTokenCache) -> None:
+        super().__init__(
+            prefix="/admin/auth",
+            tags=["Auth Admin"],
+            dependencies=[DependSession, RequireGlobalRole(ViotUserRole.ADMIN)],
+        )
+        self._access_token_cache = access_token_cache
+
+    @get(
+        "/access-token-cache",
+        summary="Get access token cache metrics",
+        status_code=200,
+        responses={200: {"model": dict[str, float | None]}},
+    )
+    async def get_access_token_cache_metrics(
+        self,
+    ) -> MsgspecJSONResponse[AccessTokenCacheMetrics]:
+        """Get the size, hits, misses and hit rate of the access token cache of this process."""
+        return MsgspecJSONResponse(content=self._access_token_cache.metrics(), status_code=200)
@@ -0,0 +1,36 @@
+from typing import Any
+
+from classy_fastapi import get
+from injector import inject
+
+from app.common.controller import Controller
+from app.common.fastapi.serializer import MsgspecJSONResponse
+
+from ..utils.jwt_utils import JwtKeySet
+
+# Consumers pick up a new key within this delay, wait at least as long before signing with it
+JWKS_MAX_AGE_SEC = 5 * 60
+
+
+class JwksController(Controller):
+    @inject
+    def __init__(self, jwt_key_set: JwtKeySet) -> None:
+        super().__init__(prefix="/.well-known", tags=["Auth"])
+        self._jwt_key_set = jwt_key_set
+
+    @get(
+        "/jwks.json",
+        summary="Get the public keys verifying access tokens",
+        status_code=200,
+        responses={200: {"model": dict[str, list[dict[str, str]]]}},
+    )
+    async def get_jwks(self) -> MsgspecJSONResponse[dict[str, list[dict[str, Any]]]]:
+        """
+        Get the JSON Web Key Set of the token signing keys, for other services to verify
+        tokens without calling the API. Empty when tokens are signed with HS256.
+        """
+        return MsgspecJSONResponse(
+            content=self._jwt_key_set.jwks(),
+            status_code=200,
+            headers={"Cache-Control": f"public, max-age={JWKS_MAX_AGE_SEC}"},
+        )
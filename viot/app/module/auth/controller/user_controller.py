@@ -11,8 +11,7 @@ from app.module.team.dto.team_dto import TeamWithRoleAndPermissionsDto
 from app.module.team.service.team_service import TeamService
 
 from ..dependency import DependCurrentUser
-from ..dto.user_dto import ChangePasswordDto, UserDto, UserUpdateDto, UserWithTeamsDto
-from ..model.user import User
+from ..dto.user_dto import ChangePasswordDto, CurrentUser, UserDto, UserUpdateDto, UserWithTeamsDto
 from ..service.user_service import UserService
 
 
@@ -30,12 +29,13 @@ class UserController(Controller):
         responses={200: {"model": UserWithTeamsDto}},
     )
     async def get_user(
-        self, *, current_user: Annotated[User, DependCurrentUser]
+        self, *, current_user: Annotated[CurrentUser, DependCurrentUser]
     ) -> JSONResponse[UserWithTeamsDto]:
         """Get current user"""
+        user = await self._user_service.get_user_by_id(user_id=current_user.id)
         teams = await self._team_service.get_teams_with_role_by_user_id(user_id=current_user.id)
         return JSONResponse(
-            content=UserWithTeamsDto(**current_user.to_dict(), teams=teams), status_code=200
+            content=UserWithTeamsDto(**user.model_dump(), teams=teams), status_code=200
         )
 
     @get(
@@ -46,7 +46,7 @@ class UserController(Controller):
         deprecated=True,
     )
     async def get_teams(
-        self, *, current_user: Annotated[User, DependCurrentUser]
+        self, *, current_user: Annotated[CurrentUser, DependCurrentUser]
     ) -> JSONResponse[list[TeamWithRoleAndPermissionsDto]]:
         """Get current user's teams"""
         return JSONResponse(
@@ -60,7 +60,7 @@ class UserController(Controller):
     async def update_user(
         self,
         *,
-        current_user: Annotated[User, DependCurrentUser],
+        current_user: Annotated[CurrentUser, DependCurrentUser],
         user_update_dto: Annotated[UserUpdateDto, Body(...)],
     ) -> JSONResponse[UserDto]:
         """Update current user"""
@@ -79,7 +79,7 @@ class UserController(Controller):
     async def change_password(
         self,
         *,
-        current_user: Annotated[User, DependCurrentUser],
+        current_user: Annotated[CurrentUser, DependCurrentUser],
         change_password_dto: Annotated[ChangePasswordDto, Body(...)],
     ) -> JSONResponse[None]:
         """Change current user's password"""
@@ -94,7 +94,7 @@ class UserController(Controller):
         status_code=204,
     )
     async def delete_current_user(
-        self, *, current_user: Annotated[User, DependCurrentUser]
+        self, *, current_user: Annotated[CurrentUser, DependCurrentUser]
     ) -> JSONResponse[None]:
         """Delete current user"""
         await self._user_service.delete_user_by_id(user_id=current_user.id)
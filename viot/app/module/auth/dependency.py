@@ -9,17 +9,19 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app import injector
 from app.module.auth.permission import Permission
 
+from .cache.access_token_cache import AccessTokenCache
+from .cache.current_user_cache import CurrentUserCache
 from .constants import ViotUserRole
+from .dto.user_dto import CurrentUser
 from .exception.auth_exception import (
     UnauthorizedException,
     UserDisabledException,
     UserNotVerifiedException,
     ViotRoleException,
 )
-from .model.user import User
 from .repository.user_repository import UserRepository
 from .service.permission_service import PermissionService
-from .utils.token_utils import AccessToken, parse_access_token
+from .utils.token_utils import AccessToken
 
 _http_bearer = HTTPBearer(auto_error=False)
 
@@ -29,33 +31,50 @@ def get_user_repository() -> UserRepository:
     return injector.get(UserRepository)
 
 
+@lru_cache
+def get_access_token_cache() -> AccessTokenCache:
+    return injector.get(AccessTokenCache)
+
+
+@lru_cache
+def get_current_user_cache() -> CurrentUserCache:
+    return injector.get(CurrentUserCache)
+
+
 async def get_access_token(
     *,
     header: Annotated[HTTPAuthorizationCredentials | None, Depends(_http_bearer)],
+    access_token_cache: Annotated[AccessTokenCache, Depends(get_access_token_cache)],
 ) -> AccessToken:
-    """Get access token dependency"""
+    """Get access token dependency, decoded once per token and process"""
     if header is None:
         raise UnauthorizedException
-    return parse_access_token(header.credentials)
+    return access_token_cache.parse(header.credentials)
 
 
 async def get_current_user(
     *,
     access_token: Annotated[AccessToken, Depends(get_access_token)],
     user_repository: Annotated[UserRepository, Depends(get_user_repository)],
-) -> User:
-    """Get current user dependency"""
-    user = await user_repository.find(id=access_token.user_id)
+    current_user_cache: Annotated[CurrentUserCache, Depends(get_current_user_cache)],
+) -> CurrentUser:
+    """Get current user dependency, a cached snapshot of the user"""
+    generation, user = await current_user_cache.get(access_token.user_id)
     if user is None:
-        raise UnauthorizedException
-    if user.email_verified_at is None:
+        model = await user_repository.find(id=access_token.user_id)
+        if model is None:
+            raise UnauthorizedException
+        user = CurrentUser.from_model(model)
+        await current_user_cache.set(generation, user)
+
+    if not user.verified:
         raise UserNotVerifiedException
     if user.disabled:
         raise UserDisabledException
     return user
 
 
-def RequireGlobalRole(role: ViotUserRole) -> Callable[[User], User]:
+def RequireGlobalRole(role: ViotUserRole) -> Callable[[CurrentUser], CurrentUser]:
     """
     Create a dependency that requires a specific Viot user role.
 
@@ -75,7 +94,9 @@ def RequireGlobalRole(role: ViotUserRole) -> Callable[[User], User]:
     ```
     """
 
-    async def require_viot_role(user: Annotated[User, Depends(get_current_user)]) -> User:
+    async def require_viot_role(
+        user: Annotated[CurrentUser, Depends(get_current_user)],
+    ) -> CurrentUser:
         if user.role != role:
             raise ViotRoleException(role)
         return user
@@ -114,7 +135,7 @@ def RequireTeamPermission(permission: Permission) -> Any:
     """
 
     async def require_team_permission(
-        user: Annotated[User, Depends(get_current_user)],
+        user: Annotated[CurrentUser, Depends(get_current_user)],
         team_id: Annotated[UUID, Path(...)],
         permission_service: Annotated[PermissionService, Depends(get_permission_service)],
     ) -> None:
@@ -2,12 +2,17 @@ from datetime import datetime
 from typing import Self
 from uuid import UUID
 
+import msgspec
 from pydantic import Field, field_validator, model_validator
 
 from app.common.dto import BaseInDto, BaseOutDto, NameStr, PagingDto
 from app.module.team.dto.team_dto import TeamWithRoleAndPermissionsDto
 
-from ..constants import PASSWORD_REGEX_PATTERN, PASSWORD_REGEX_VALIDATION_ERROR_MSG
+from ..constants import (
+    PASSWORD_REGEX_PATTERN,
+    PASSWORD_REGEX_VALIDATION_ERROR_MSG,
+    ViotUserRole,
+)
 from ..model.user import User
 
 
@@ -48,6 +53,28 @@ class UserDto(BaseOutDto):
         return cls.model_validate(user)
 
 
+class CurrentUser(msgspec.Struct, frozen=True, array_like=True):
+    """Compact snapshot of the authenticated user, cached between requests"""
+
+    id: UUID
+    email: str
+    first_name: str
+    role: ViotUserRole
+    verified: bool
+    disabled: bool
+
+    @classmethod
+    def from_model(cls, user: User) -> "CurrentUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            role=user.role,
+            verified=user.email_verified_at is not None,
+            disabled=user.disabled,
+        )
+
+
 class UserWithTeamsDto(UserDto):
     teams: list[TeamWithRoleAndPermissionsDto]
 
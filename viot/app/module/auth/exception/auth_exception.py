@@ -1,6 +1,7 @@
 from app.common.exception import (
     BadRequestException,
     PermissionDeniedException,
+    TooManyRequestsException,
     UnauthorizedException,
 )
 
@@ -25,6 +26,11 @@ class UserDisabledException(UnauthorizedException):
         super().__init__(message="Your account has been disabled")
 
 
+class PasswordHashingBusyException(TooManyRequestsException):
+    def __init__(self) -> None:
+        super().__init__(message="Too many password checks in progress, please retry shortly")
+
+
 # Global role
 class ViotRoleException(PermissionDeniedException):
     def __init__(self, role: str) -> None:
@@ -2,7 +2,7 @@ from datetime import UTC, datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import DateTime, ForeignKey, PrimaryKeyConstraint, select
+from sqlalchemy import DDL, TEXT, DateTime, ForeignKey, PrimaryKeyConstraint, event, select
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy_utils import create_view  # type: ignore
 from sqlalchemy_utils.view import CreateView, DropView  # type: ignore
@@ -44,3 +44,198 @@ class UserTeamPermissionScopeView(Base):
     @classmethod
     def drop(cls, op: Any) -> None:
         op.execute(DropView(cls.__tablename__))
+
+
+class UserTeamPermission(Base):
+    """
+    Materialized `vw_user_team_permission_scope`, so a permission check is a single
+    probe of the primary key index. Kept in sync by the triggers below, on every
+    write to users_teams_roles, roles_permissions and permissions.scope.
+    """
+
+    __tablename__ = "users_teams_permissions"
+
+    user_id: Mapped[UUID] = mapped_column()
+    team_id: Mapped[UUID] = mapped_column()
+    permission_scope: Mapped[str] = mapped_column(TEXT)
+    __table_args__ = (PrimaryKeyConstraint("user_id", "team_id", "permission_scope"),)
+
+    # Statement-level triggers collect the (user, team) pairs whose roles changed,
+    # and recompute all their scopes from the view's join.
+    #
+    # At READ COMMITTED a trigger doesn't see the uncommitted writes of concurrent
+    # transactions, e.g. a role losing a permission while a member gets the role, and
+    # both would recompute from stale rows. So every trigger first takes transaction
+    # advisory locks on the affected roles, then on the teams of the affected pairs,
+    # each in ascending order, and recomputes once the concurrent writers committed.
+    ddl = [
+        """
+        CREATE OR REPLACE FUNCTION users_teams_permissions_lock(
+            role_ids INTEGER[], team_ids UUID[]
+        ) RETURNS void AS $$
+        DECLARE
+            lock_key INTEGER;
+        BEGIN
+            FOR lock_key IN
+                SELECT DISTINCT role_id FROM unnest(role_ids) AS role_id ORDER BY 1
+            LOOP
+                PERFORM pg_advisory_xact_lock('roles'::regclass::oid::integer, lock_key);
+            END LOOP;
+            FOR lock_key IN
+                SELECT DISTINCT hashtext(team_id::text) FROM unnest(team_ids) AS team_id
+                ORDER BY 1
+            LOOP
+                PERFORM pg_advisory_xact_lock('teams'::regclass::oid::integer, lock_key);
+            END LOOP;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION users_teams_permissions_refresh(
+            user_ids UUID[], team_ids UUID[]
+        ) RETURNS void AS $$
+        BEGIN
+            DELETE FROM users_teams_permissions utp
+            USING unnest(user_ids, team_ids) AS pair(user_id, team_id)
+            WHERE utp.user_id = pair.user_id AND utp.team_id = pair.team_id;
+
+            INSERT INTO users_teams_permissions (user_id, team_id, permission_scope)
+            SELECT DISTINCT utr.user_id, utr.team_id, p.scope
+            FROM unnest(user_ids, team_ids) AS pair(user_id, team_id)
+            JOIN users_teams_roles utr
+                ON utr.user_id = pair.user_id AND utr.team_id = pair.team_id
+            JOIN roles_permissions rp ON rp.role_id = utr.role_id
+            JOIN permissions p ON p.id = rp.permission_id
+            ON CONFLICT DO NOTHING;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION users_teams_roles_refresh_permissions() RETURNS trigger AS $$
+        DECLARE
+            user_ids UUID[];
+            team_ids UUID[];
+            role_ids INTEGER[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(user_id), array_agg(team_id), array_agg(role_id)
+                INTO user_ids, team_ids, role_ids
+                FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(user_id), array_agg(team_id), array_agg(role_id)
+                INTO user_ids, team_ids, role_ids
+                FROM old_rows;
+            ELSE
+                SELECT array_agg(user_id), array_agg(team_id), array_agg(role_id)
+                INTO user_ids, team_ids, role_ids
+                FROM (
+                    SELECT user_id, team_id, role_id FROM old_rows
+                    UNION SELECT user_id, team_id, role_id FROM new_rows
+                ) AS pairs;
+            END IF;
+            PERFORM users_teams_permissions_lock(role_ids, team_ids);
+            PERFORM users_teams_permissions_refresh(user_ids, team_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION roles_permissions_refresh_permissions() RETURNS trigger AS $$
+        DECLARE
+            role_ids INTEGER[];
+            user_ids UUID[];
+            team_ids UUID[];
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                SELECT array_agg(role_id) INTO role_ids FROM new_rows;
+            ELSIF TG_OP = 'DELETE' THEN
+                SELECT array_agg(role_id) INTO role_ids FROM old_rows;
+            ELSE
+                SELECT array_agg(role_id) INTO role_ids
+                FROM (SELECT role_id FROM old_rows UNION SELECT role_id FROM new_rows) AS roles;
+            END IF;
+            PERFORM users_teams_permissions_lock(role_ids, NULL);
+            SELECT array_agg(user_id), array_agg(team_id) INTO user_ids, team_ids
+            FROM users_teams_roles WHERE role_id = ANY(role_ids);
+            PERFORM users_teams_permissions_lock(NULL, team_ids);
+            PERFORM users_teams_permissions_refresh(user_ids, team_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        """
+        CREATE OR REPLACE FUNCTION permissions_refresh_permissions() RETURNS trigger AS $$
+        DECLARE
+            role_ids INTEGER[];
+            user_ids UUID[];
+            team_ids UUID[];
+        BEGIN
+            -- Inserts into roles_permissions of these permissions wait for this update,
+            -- as their foreign key check locks the permission row of the unique scope
+            SELECT array_agg(role_id) INTO role_ids
+            FROM roles_permissions WHERE permission_id IN (SELECT id FROM new_rows);
+            PERFORM users_teams_permissions_lock(role_ids, NULL);
+            SELECT array_agg(user_id), array_agg(team_id) INTO user_ids, team_ids
+            FROM users_teams_roles WHERE role_id = ANY(role_ids);
+            PERFORM users_teams_permissions_lock(NULL, team_ids);
+            PERFORM users_teams_permissions_refresh(user_ids, team_ids);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """,
+        *(
+            f"""
+            CREATE OR REPLACE TRIGGER {table}_{op.lower()}_refresh_permissions
+            AFTER {op} ON {table}
+            REFERENCING {transition}
+            FOR EACH STATEMENT EXECUTE FUNCTION {table}_refresh_permissions();
+            """
+            for table in ("users_teams_roles", "roles_permissions")
+            for op, transition in (
+                ("INSERT", "NEW TABLE AS new_rows"),
+                ("UPDATE", "OLD TABLE AS old_rows NEW TABLE AS new_rows"),
+                ("DELETE", "OLD TABLE AS old_rows"),
+            )
+        ),
+        """
+        CREATE OR REPLACE TRIGGER permissions_update_refresh_permissions
+        AFTER UPDATE ON permissions
+        REFERENCING NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION permissions_refresh_permissions();
+        """,
+    ]
+
+    @classmethod
+    def create(cls, op: Any) -> None:
+        """Create the triggers and materialize the current permissions"""
+        for statement in cls.ddl:
+            op.execute(statement)
+        op.execute(
+            """
+            INSERT INTO users_teams_permissions (user_id, team_id, permission_scope)
+            SELECT DISTINCT user_id, team_id, permission_scope FROM vw_user_team_permission_scope
+            ON CONFLICT DO NOTHING;
+            """
+        )
+
+    @classmethod
+    def drop(cls, op: Any) -> None:
+        for table in ("users_teams_roles", "roles_permissions"):
+            for trigger_op in ("insert", "update", "delete"):
+                op.execute(
+                    f"DROP TRIGGER IF EXISTS {table}_{trigger_op}_refresh_permissions ON {table};"
+                )
+        op.execute("DROP TRIGGER IF EXISTS permissions_update_refresh_permissions ON permissions;")
+        for function in (
+            "permissions_refresh_permissions()",
+            "roles_permissions_refresh_permissions()",
+            "users_teams_roles_refresh_permissions()",
+            "users_teams_permissions_refresh(UUID[], UUID[])",
+            "users_teams_permissions_lock(INTEGER[], UUID[])",
+        ):
+            op.execute(f"DROP FUNCTION IF EXISTS {function};")
+
+
+# Schemas created from the metadata, such as in tests, get the triggers too
+for _statement in UserTeamPermission.ddl:
+    event.listen(Base.metadata, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
@@ -1,6 +1,11 @@
 from injector import Binder, Module, SingletonScope
 
+from .cache.access_token_cache import AccessTokenCache
+from .cache.current_user_cache import CurrentUserCache
+from .cache.team_permission_cache import TeamPermissionCache
+from .controller.auth_admin_controller import AuthAdminController
 from .controller.auth_controller import AuthController
+from .controller.jwks_controller import JwksController
 from .controller.permission_controller import PermissionController
 from .controller.team_role_controller import TeamRoleController
 from .controller.user_controller import UserController
@@ -11,9 +16,12 @@ from .repository.role_repository import RoleRepository
 from .repository.user_repository import UserRepository
 from .repository.user_team_role_repository import UserTeamRoleRepository
 from .service.auth_service import AuthService
+from .service.password_service import PasswordService
 from .service.permission_service import PermissionService
 from .service.team_role_service import TeamRoleService
 from .service.user_service import UserService
+from .store.token_store import PasswordResetTokenStore, RefreshTokenStore
+from .utils.jwt_utils import JwtKeySet, get_jwt_key_set
 
 
 class AuthModule(Module):
@@ -25,12 +33,25 @@ class AuthModule(Module):
         binder.bind(RoleRepository, RoleRepository, SingletonScope)
         binder.bind(RolePermissionRepository, RolePermissionRepository, SingletonScope)
 
+        binder.bind(RefreshTokenStore, RefreshTokenStore, SingletonScope)
+        binder.bind(PasswordResetTokenStore, PasswordResetTokenStore, SingletonScope)
+
+        binder.bind(TeamPermissionCache, TeamPermissionCache, SingletonScope)
+        binder.bind(CurrentUserCache, CurrentUserCache, SingletonScope)
+        binder.bind(AccessTokenCache, AccessTokenCache, SingletonScope)
+
+        # Keys are loaded here, a missing or invalid key fails the startup
+        binder.bind(JwtKeySet, to=get_jwt_key_set(), scope=SingletonScope)
+
+        binder.bind(PasswordService, PasswordService, SingletonScope)
         binder.bind(AuthService, AuthService, SingletonScope)
         binder.bind(UserService, UserService, SingletonScope)
         binder.bind(PermissionService, PermissionService, SingletonScope)
         binder.bind(TeamRoleService, TeamRoleService, SingletonScope)
 
         binder.bind(AuthController, AuthController, SingletonScope)
+        binder.bind(JwksController, JwksController, SingletonScope)
         binder.bind(UserController, UserController, SingletonScope)
         binder.bind(TeamRoleController, TeamRoleController, SingletonScope)
         binder.bind(PermissionController, PermissionController, SingletonScope)
+        binder.bind(AuthAdminController, AuthAdminController, SingletonScope)
@@ -99,6 +99,9 @@ class TeamDeviceDataPermission:
     READ = Permission(
         f"{_PREFIX}:read", "Read device data", "Permission to read the data of a device."
     )
+    WRITE = Permission(
+        f"{_PREFIX}:write", "Write device data", "Permission to write the data of a device."
+    )
 
 
 class TeamDeviceConnectLogPermission:
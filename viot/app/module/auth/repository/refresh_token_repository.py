@@ -1,7 +1,4 @@
-from datetime import datetime
-from uuid import UUID
-
-from sqlalchemy import select, update
+from sqlalchemy import delete, select
 
 from app.database.repository.crud import CrudRepository
 from app.module.auth.model.refresh_token import RefreshToken
@@ -12,14 +9,6 @@ class RefreshTokenRepository(CrudRepository[RefreshToken, int]):
         stmt = select(RefreshToken).where(RefreshToken.token == token)
         return (await self.session.execute(stmt)).scalar_one_or_none()
 
-    async def update_token_expires_at(self, token: str, expires_at: datetime) -> None:
-        stmt = update(RefreshToken).where(RefreshToken.token == token).values(expires_at=expires_at)
-        await self.session.execute(stmt)
-
-    async def update_all_tokens_expires_at(self, user_id: UUID, expires_at: datetime) -> None:
-        stmt = (
-            update(RefreshToken)
-            .where(RefreshToken.user_id == user_id)
-            .values(expires_at=expires_at)
-        )
+    async def delete_by_token(self, token: str) -> None:
+        stmt = delete(RefreshToken).where(RefreshToken.token == token)
         await self.session.execute(stmt)
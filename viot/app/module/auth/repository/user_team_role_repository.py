@@ -1,31 +1,34 @@
 from uuid import UUID
 
-from sqlalchemy import select, text, update
+from sqlalchemy import select, update
 
 from app.database.repository import AsyncSqlalchemyRepository
 
-from ..model.user_team_role import UserTeamPermissionScopeView, UserTeamRole
+from ..model.user_team_role import UserTeamPermission, UserTeamRole
 
 
 class UserTeamRoleRepository(AsyncSqlalchemyRepository):
     async def is_user_has_permission_in_team(
         self, *, user_id: UUID, team_id: UUID, permission_scope: str
     ) -> bool:
+        """A single probe of the primary key index of users_teams_permissions"""
         stmt = select(
-            select(UserTeamPermissionScopeView)
+            select(UserTeamPermission.user_id)
             .where(
-                text(
-                    "user_id = :user_id "
-                    "AND team_id = :team_id "
-                    "AND permission_scope = :permission_scope"
-                )
+                UserTeamPermission.user_id == user_id,
+                UserTeamPermission.team_id == team_id,
+                UserTeamPermission.permission_scope == permission_scope,
             )
             .exists()
         )
-        result = await self.session.execute(
-            stmt, {"user_id": user_id, "team_id": team_id, "permission_scope": permission_scope}
+        return bool((await self.session.execute(stmt)).scalar())
+
+    async def find_permission_scopes_in_team(self, *, user_id: UUID, team_id: UUID) -> set[str]:
+        """A range scan of the primary key index of users_teams_permissions"""
+        stmt = select(UserTeamPermission.permission_scope).where(
+            UserTeamPermission.user_id == user_id, UserTeamPermission.team_id == team_id
         )
-        return bool(result.scalar())
+        return set((await self.session.execute(stmt)).scalars().all())
 
     async def save(self, obj: UserTeamRole) -> UserTeamRole:
         self.session.add(obj)
@@ -1,30 +1,38 @@
 import logging
 import uuid
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from uuid import UUID
 
 from injector import inject
 
 from app.config import app_settings
+from app.database.context import after_commit
 from app.module.email.service import IEmailService
 
-from ..constants import EMAIL_VERIFICATION_DURATION_SEC, REFRESH_TOKEN_DURATION_SEC, ViotUserRole
+from ..cache.current_user_cache import CurrentUserCache
+from ..config import auth_settings
+from ..constants import EMAIL_VERIFICATION_DURATION_SEC, ViotUserRole
 from ..dto.auth_dto import (
     LoginDto,
     RegisterDto,
     TokenDto,
 )
 from ..dto.user_dto import UserDto
-from ..exception.auth_exception import InvalidCredentialsException, InvalidVerifyEmailTokenException
+from ..exception.auth_exception import (
+    InvalidCredentialsException,
+    InvalidVerifyEmailTokenException,
+    PasswordHashingBusyException,
+)
 from ..exception.user_exception import UserEmailAlreadyExistsException
-from ..model.refresh_token import RefreshToken
 from ..model.user import User
 from ..repository.password_reset_repository import PasswordResetRepository
 from ..repository.refresh_token_repository import RefreshTokenRepository
 from ..repository.user_repository import UserRepository
+from ..store.token_store import RefreshTokenStore
 from ..utils.jwt_utils import create_jwt_token, parse_jwt_token
-from ..utils.password_utils import hash_password, verify_password
 from ..utils.token_utils import AccessToken, create_access_token
+from .password_service import PasswordService
 
 logger = logging.getLogger(__name__)
 
@@ -37,26 +45,28 @@ class AuthService:
         refresh_token_repository: RefreshTokenRepository,
         password_reset_repository: PasswordResetRepository,
         email_service: IEmailService,
+        current_user_cache: CurrentUserCache,
+        password_service: PasswordService,
+        refresh_token_store: RefreshTokenStore,
     ) -> None:
         self._user_repository = user_repository
         self._refresh_token_repository = refresh_token_repository
         self._password_reset_repository = password_reset_repository
         self._email_service = email_service
+        self._current_user_cache = current_user_cache
+        self._password_service = password_service
+        self._refresh_token_store = refresh_token_store
 
     async def login(self, *, login_dto: LoginDto) -> TokenDto:
         user = await self._user_repository.find_by_email(email=login_dto.email)
-        if not user or not verify_password(login_dto.password, user.password):
+        if not user or not await self._password_service.verify(login_dto.password, user.password):
             raise InvalidCredentialsException
 
-        rf_token = (
-            await self._refresh_token_repository.save(
-                obj=RefreshToken(
-                    user_id=user.id,
-                    token=uuid.uuid4().hex,
-                    expires_at=datetime.now(UTC) + timedelta(seconds=REFRESH_TOKEN_DURATION_SEC),
-                )
-            )
-        ).token
+        if self._password_service.needs_rehash(user.password):
+            await self._rehash_password(user.id, login_dto.password)
+
+        rf_token = uuid.uuid4().hex
+        await self._refresh_token_store.save(rf_token, str(user.id))
         ac_token, ac_expire = create_access_token(access_token=AccessToken(user_id=user.id))
 
         return TokenDto(
@@ -70,7 +80,7 @@ class AuthService:
         user = await self._user_repository.save(
             User(
                 email=register_dto.email,
-                password=hash_password(register_dto.password),
+                password=await self._password_service.hash(register_dto.password),
                 first_name=register_dto.first_name,
                 last_name=register_dto.last_name,
                 role=ViotUserRole.USER,
@@ -92,9 +102,9 @@ class AuthService:
 
     async def logout(self, *, refresh_token: str) -> None:
         try:
-            await self._refresh_token_repository.update_token_expires_at(
-                token=refresh_token, expires_at=datetime.now(UTC)
-            )
+            deleted = await self._refresh_token_store.delete(refresh_token)
+            if not deleted and auth_settings.LEGACY_DB_TOKENS_ENABLED:
+                await self._refresh_token_repository.delete_by_token(refresh_token)
         except Exception as e:
             logger.warning(f"Failed to logout: {e}")
             raise InvalidCredentialsException
@@ -106,6 +116,15 @@ class AuthService:
             await self._user_repository.update_email_verified_at(
                 user_id=user_id, email_verified_at=datetime.now(UTC)
             )
+            after_commit(partial(self._current_user_cache.invalidate, user_id))
         except Exception as e:
             logger.warning(f"Failed to verify email: {e}")
             raise InvalidVerifyEmailTokenException
+
+    async def _rehash_password(self, user_id: UUID, password: str) -> None:
+        """Upgrades a hash made with a previous cost, retried on the next login if busy"""
+        try:
+            hashed_password = await self._password_service.hash(password)
+        except PasswordHashingBusyException:
+            return
+        await self._user_repository.update_password(user_id, hashed_password)
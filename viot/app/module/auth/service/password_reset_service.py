@@ -6,6 +6,7 @@ from injector import inject
 from app.config import app_settings
 from app.module.email.service import IEmailService
 
+from ..config import auth_settings
 from ..constants import FORGOT_PASSWORD_DURATION_SEC
 from ..dto.reset_password_dto import ResetPasswordDto
 from ..exception.auth_exception import (
@@ -16,7 +17,8 @@ from ..exception.auth_exception import (
 from ..model.password_reset import PasswordReset
 from ..repository.password_reset_repository import PasswordResetRepository
 from ..repository.user_repository import UserRepository
-from ..utils.password_utils import hash_password, verify_password
+from ..store.token_store import PasswordResetTokenStore
+from .password_service import PasswordService
 
 
 class PasswordResetService:
@@ -26,28 +28,59 @@ class PasswordResetService:
         user_repository: UserRepository,
         password_reset_repository: PasswordResetRepository,
         email_service: IEmailService,
+        password_service: PasswordService,
+        password_reset_token_store: PasswordResetTokenStore,
     ):
         self._user_repository = user_repository
         self._password_reset_repository = password_reset_repository
         self._email_service = email_service
+        self._password_service = password_service
+        self._password_reset_token_store = password_reset_token_store
 
     async def forgot_password(self, *, email: str) -> None:
         user = await self._user_repository.find_by_email(email=email)
         if not user:
             return
 
-        password_reset = PasswordReset(email=user.email, token=uuid.uuid4().hex)
-        password_reset = await self._password_reset_repository.save(password_reset)
+        token = uuid.uuid4().hex
+        await self._password_reset_token_store.save(token, user.email)
 
-        reset_url = f"{app_settings.UI_URL}/auth/reset-password?token={password_reset.token}"
+        reset_url = f"{app_settings.UI_URL}/auth/reset-password?token={token}"
         self._email_service.send_reset_password_email(
             email=user.email, name=user.first_name, link=reset_url
         )
 
     async def reset_password(self, *, reset_password_dto: ResetPasswordDto) -> None:
-        password_reset = await self._password_reset_repository.find_by_token(
-            token=reset_password_dto.token
+        legacy_password_reset: PasswordReset | None = None
+        email = await self._password_reset_token_store.get(reset_password_dto.token)
+        if email is None:
+            legacy_password_reset = await self._find_legacy_password_reset(reset_password_dto.token)
+            email = legacy_password_reset.email
+
+        user = await self._user_repository.find_by_email(email=email)
+        if not user:
+            raise InvalidResetPasswordTokenException
+
+        if await self._password_service.verify(reset_password_dto.password, user.password):
+            raise DuplicatePasswordException
+
+        await self._user_repository.update_password(
+            user_id=user.id,
+            hashed_password=await self._password_service.hash(reset_password_dto.password),
         )
+
+        if legacy_password_reset is not None:
+            await self._password_reset_repository.delete(legacy_password_reset)
+        # The token is consumed last, a concurrent reset with the same token rolls back
+        elif not await self._password_reset_token_store.delete(reset_password_dto.token):
+            raise InvalidResetPasswordTokenException
+
+    async def _find_legacy_password_reset(self, token: str) -> PasswordReset:
+        """Password reset requested before tokens moved to Redis"""
+        if not auth_settings.LEGACY_DB_TOKENS_ENABLED:
+            raise InvalidResetPasswordTokenException
+
+        password_reset = await self._password_reset_repository.find_by_token(token=token)
         if not password_reset:
             raise InvalidResetPasswordTokenException
 
@@ -57,15 +90,4 @@ class PasswordResetService:
         ) < datetime.now(UTC):
             raise ResetPasswordTokenExpiredException
 
-        user = await self._user_repository.find_by_email(email=password_reset.email)
-        if not user:
-            raise InvalidResetPasswordTokenException
-
-        if verify_password(reset_password_dto.password, user.password):
-            raise DuplicatePasswordException
-
-        await self._user_repository.update_password(
-            user_id=user.id, hashed_password=hash_password(reset_password_dto.password)
-        )
-
-        await self._password_reset_repository.delete(password_reset)
+        return password_reset
@@ -0,0 +1,67 @@
+import asyncio
+import logging
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypeVar
+
+from injector import inject
+
+from ..config import auth_settings
+from ..exception.auth_exception import PasswordHashingBusyException
+from ..utils.password_utils import hash_password, verify_password
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class PasswordService:
+    """
+    Hashes and verifies passwords with bcrypt in a dedicated thread pool, so a login
+    never blocks the event loop. bcrypt releases the GIL, the workers hash in parallel.
+
+    At most `PASSWORD_HASH_MAX_PENDING` calls run or wait for a worker, callers beyond
+    that get `PasswordHashingBusyException` instead of an ever growing queue.
+    """
+
+    @inject
+    def __init__(self) -> None:
+        self._salt_rounds = auth_settings.BCRYPT_SALT_ROUNDS
+        self._max_pending = auth_settings.PASSWORD_HASH_MAX_PENDING
+        self._pending = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=auth_settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt"
+        )
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    async def hash(self, password: str) -> bytes:
+        return await self._run(hash_password, password, self._salt_rounds)
+
+    async def verify(self, password: str, hashed_password: bytes) -> bool:
+        return await self._run(verify_password, password, hashed_password)
+
+    def needs_rehash(self, hashed_password: bytes) -> bool:
+        """Whether the hash was made with another cost than `BCRYPT_SALT_ROUNDS`"""
+        # $2b$<cost>$<salt and checksum>
+        try:
+            return int(hashed_password.split(b"$")[2]) != self._salt_rounds
+        except (IndexError, ValueError):
+            return True
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    async def _run(self, fn: Callable[..., T], *args: object) -> T:
+        # Only touched from the event loop, no lock needed
+        if self._pending >= self._max_pending:
+            logger.warning(f"Rejected password hashing, {self._pending} calls pending")
+            raise PasswordHashingBusyException
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
@@ -2,6 +2,7 @@ from uuid import UUID
 
 from injector import inject
 
+from ..cache.team_permission_cache import TeamPermissionCache
 from ..dto.permission_dto import PermissionDto
 from ..exception.permission_exception import ResourceAccessDeniedException
 from ..repository.permission_repository import PermissionRepository
@@ -14,18 +15,34 @@ class PermissionService:
         self,
         permission_repository: PermissionRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        team_permission_cache: TeamPermissionCache,
     ) -> None:
         self._permission_repository = permission_repository
         self._user_team_role_repository = user_team_role_repository
+        self._team_permission_cache = team_permission_cache
 
     async def get_all_permissions(self) -> list[PermissionDto]:
         permissions = await self._permission_repository.find_all()
         return [PermissionDto.from_model(permission) for permission in permissions]
 
+    async def get_user_permission_scopes_in_team(
+        self, *, user_id: UUID, team_id: UUID
+    ) -> frozenset[str]:
+        generation, scopes = await self._team_permission_cache.get(user_id, team_id)
+        if scopes is not None:
+            return scopes
+
+        scopes = frozenset(
+            await self._user_team_role_repository.find_permission_scopes_in_team(
+                user_id=user_id, team_id=team_id
+            )
+        )
+        await self._team_permission_cache.set(user_id, team_id, generation, scopes)
+        return scopes
+
     async def validate_user_access_team_resource(
         self, *, user_id: UUID, team_id: UUID, permission_scope: str
     ) -> None:
-        if not await self._user_team_role_repository.is_user_has_permission_in_team(
-            user_id=user_id, team_id=team_id, permission_scope=permission_scope
-        ):
+        scopes = await self.get_user_permission_scopes_in_team(user_id=user_id, team_id=team_id)
+        if permission_scope not in scopes:
             raise ResourceAccessDeniedException
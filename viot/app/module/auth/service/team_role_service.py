@@ -1,12 +1,15 @@
 import logging
+from functools import partial
 from typing import cast
 from uuid import UUID
 
 from injector import inject
 
+from app.database.context import after_commit
 from app.module.team.exception.team_exception import TeamNotFoundException
 from app.module.team.repository.team_repository import TeamRepository
 
+from ..cache.team_permission_cache import TeamPermissionCache
 from ..constants import MAX_ROLES_PER_TEAM, SENSITIVE_SCOPES, TEAM_ROLE_OWNER
 from ..dto.role_dto import RoleCreateDto, RoleDto, RoleUpdateDto
 from ..exception.permission_exception import (
@@ -36,11 +39,13 @@ class TeamRoleService:
         team_repository: TeamRepository,
         permission_repository: PermissionRepository,
         role_permission_repository: RolePermissionRepository,
+        team_permission_cache: TeamPermissionCache,
     ) -> None:
         self._role_repository = role_repository
         self._team_repository = team_repository
         self._permission_repository = permission_repository
         self._role_permission_repository = role_permission_repository
+        self._team_permission_cache = team_permission_cache
 
     async def get_roles_by_team_id(self, *, team_id: UUID) -> list[RoleDto]:
         if not await self._team_repository.exists_by_id(team_id):
@@ -123,9 +128,11 @@ class TeamRoleService:
             await self._role_permission_repository.bulk_save_on_conflict_do_nothing(
                 [{"role_id": role.id, "permission_id": permission.id} for permission in permissions]
             )
+            after_commit(partial(self._team_permission_cache.invalidate_team, team_id))
 
         return RoleDto.from_model(role, role_update_dto.scopes)
 
     async def delete_role(self, *, role_id: int, team_id: UUID) -> None:
         await self.validate_not_modify_owner_role(role_id=role_id)
         await self._role_repository.delete_by_id_and_team_id(role_id=role_id, team_id=team_id)
+        after_commit(partial(self._team_permission_cache.invalidate_team, team_id))
@@ -2,17 +2,20 @@ import logging
 import uuid
 from datetime import UTC, datetime
 from typing import Any
+from uuid import UUID
 
 from injector import inject
 
 from app.config import app_settings
 
+from ..config import auth_settings
 from ..constants import REFRESH_TOKEN_DURATION_SEC, REFRESH_TOKEN_SAMESITE, REFRESH_TOKEN_SECURE
 from ..dto.auth_dto import TokenDto
 from ..exception.auth_exception import InvalidCredentialsException
 from ..exception.token_exception import InvalidRefreshTokenException
 from ..repository.refresh_token_repository import RefreshTokenRepository
 from ..repository.user_repository import UserRepository
+from ..store.token_store import RefreshTokenStore
 from ..utils.token_utils import AccessToken, create_access_token
 
 logger = logging.getLogger(__name__)
@@ -21,35 +24,53 @@ logger = logging.getLogger(__name__)
 class TokenService:
     @inject
     def __init__(
-        self, user_repository: UserRepository, refresh_token_repository: RefreshTokenRepository
+        self,
+        user_repository: UserRepository,
+        refresh_token_repository: RefreshTokenRepository,
+        refresh_token_store: RefreshTokenStore,
     ) -> None:
         self._user_repository = user_repository
         self._refresh_token_repository = refresh_token_repository
+        self._refresh_token_store = refresh_token_store
 
     async def renew_token(self, *, refresh_token: str) -> TokenDto:
-        rf_token_model = await self._refresh_token_repository.find_by_token(refresh_token)
-        if not rf_token_model:
-            raise InvalidCredentialsException
+        new_refresh_token = uuid.uuid4().hex
+        user_id = await self._refresh_token_store.rotate(refresh_token, new_refresh_token)
+        if user_id is None:
+            user_id = await self._move_legacy_token(refresh_token, new_refresh_token)
 
-        # Check if token is expired
-        if rf_token_model.expires_at < datetime.now(UTC):
-            raise InvalidRefreshTokenException
-
-        user = await self._user_repository.find(rf_token_model.user_id)
+        user = await self._user_repository.find(UUID(user_id))
         if not user:
             raise InvalidRefreshTokenException
 
-        rf_token_model.token = uuid.uuid4().hex
-
-        refresh_token = (await self._refresh_token_repository.save(rf_token_model)).token
         ac_token, ac_expire_at = create_access_token(access_token=AccessToken(user_id=user.id))
 
         return TokenDto(
             access_token=ac_token,
-            refresh_token=refresh_token,
+            refresh_token=new_refresh_token,
             access_token_expires_at=ac_expire_at,
         )
 
+    async def _move_legacy_token(self, refresh_token: str, new_refresh_token: str) -> str:
+        """Rotates a token issued before refresh tokens moved to Redis, returns the user id"""
+        if not auth_settings.LEGACY_DB_TOKENS_ENABLED:
+            raise InvalidCredentialsException
+
+        rf_token_model = await self._refresh_token_repository.find_by_token(refresh_token)
+        if not rf_token_model:
+            raise InvalidCredentialsException
+
+        # Check if token is expired
+        ttl_sec = int((rf_token_model.expires_at - datetime.now(UTC)).total_seconds())
+        if ttl_sec <= 0:
+            raise InvalidRefreshTokenException
+
+        await self._refresh_token_repository.delete(rf_token_model)
+        await self._refresh_token_store.save(
+            new_refresh_token, str(rf_token_model.user_id), ttl_sec=ttl_sec
+        )
+        return str(rf_token_model.user_id)
+
     def get_refresh_token_settings(
         self, refresh_token: str, expired: bool = False
     ) -> dict[str, Any]:
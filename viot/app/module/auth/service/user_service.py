@@ -1,20 +1,37 @@
 import logging
+from functools import partial
 from uuid import UUID
 
 from injector import inject
 
+from app.database.context import after_commit
+
+from ..cache.current_user_cache import CurrentUserCache
 from ..dto.user_dto import ChangePasswordDto, UserDto, UserUpdateDto
 from ..exception.user_exception import PasswordNotMatchException, UserNotFoundException
 from ..repository.user_repository import UserRepository
-from ..utils.password_utils import hash_password, verify_password
+from .password_service import PasswordService
 
 logger = logging.getLogger(__name__)
 
 
 class UserService:
     @inject
-    def __init__(self, user_repository: UserRepository):
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        current_user_cache: CurrentUserCache,
+        password_service: PasswordService,
+    ):
         self._user_repository = user_repository
+        self._current_user_cache = current_user_cache
+        self._password_service = password_service
+
+    async def get_user_by_id(self, *, user_id: UUID) -> UserDto:
+        user = await self._user_repository.find(user_id)
+        if not user:
+            raise UserNotFoundException
+        return UserDto.from_model(user)
 
     async def change_password(
         self, *, user_id: UUID, change_password_dto: ChangePasswordDto
@@ -22,11 +39,11 @@ class UserService:
         user = await self._user_repository.find(id=user_id)
         if not user:
             raise UserNotFoundException
-        if not verify_password(change_password_dto.old_password, user.password):
+        if not await self._password_service.verify(change_password_dto.old_password, user.password):
             raise PasswordNotMatchException
 
         await self._user_repository.update_password(
-            user_id, hash_password(change_password_dto.new_password)
+            user_id, await self._password_service.hash(change_password_dto.new_password)
         )
 
     async def update_user(self, *, user_id: UUID, user_update_dto: UserUpdateDto) -> UserDto:
@@ -38,7 +55,9 @@ class UserService:
             setattr(user, k, v)
 
         user = await self._user_repository.save(user)
+        after_commit(partial(self._current_user_cache.invalidate, user_id))
         return UserDto.model_validate(user)
 
     async def delete_user_by_id(self, *, user_id: UUID) -> None:
         await self._user_repository.delete_by_id(user_id)
+        after_commit(partial(self._current_user_cache.invalidate, user_id))
@@ -0,0 +1,129 @@
+import hashlib
+from abc import ABC, abstractmethod
+
+from injector import inject
+
+from app.extension.redis.client import RedisClient
+
+from ..constants import FORGOT_PASSWORD_DURATION_SEC, REFRESH_TOKEN_DURATION_SEC
+
+# KEYS[1]: token key, KEYS[2]: subject key, only when a subject holds a single token
+# ARGV[1]: subject, ARGV[2]: ttl in seconds
+_SAVE_SCRIPT = """
+if KEYS[2] then
+    local previous = redis.call('GET', KEYS[2])
+    if previous then
+        redis.call('DEL', previous)
+    end
+    redis.call('SET', KEYS[2], KEYS[1], 'EX', ARGV[2])
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# KEYS[1]: token key, KEYS[2]: new token key
+# ARGV[1]: ttl in milliseconds, used when the token has none
+# The new token expires with the old one, rotation doesn't extend the session.
+_ROTATE_SCRIPT = """
+local ttl = redis.call('PTTL', KEYS[1])
+local subject = redis.call('GETDEL', KEYS[1])
+if not subject then
+    return false
+end
+if ttl <= 0 then
+    ttl = ARGV[1]
+end
+redis.call('SET', KEYS[2], subject, 'PX', ttl)
+return subject
+"""
+
+
+class ITokenStore(ABC):
+    """Opaque tokens of a subject, such as a user id or an email, that expire on their own"""
+
+    @abstractmethod
+    async def save(self, token: str, subject: str, ttl_sec: int | None = None) -> None:
+        """Store a new token of the subject, expiring after the store's TTL unless given"""
+
+    @abstractmethod
+    async def get(self, token: str) -> str | None:
+        """Returns the subject of the token, None if it doesn't exist or expired"""
+
+    @abstractmethod
+    async def rotate(self, token: str, new_token: str) -> str | None:
+        """
+        Replace the token by `new_token` with the same subject and expiration,
+        returns the subject, None if the token doesn't exist or expired.
+        """
+
+    @abstractmethod
+    async def delete(self, token: str) -> bool:
+        """Returns whether the token existed"""
+
+
+class RedisTokenStore(ITokenStore):
+    """
+    A Redis key per token, holding its subject and expiring with it. Keys are a digest
+    of the token, a Redis dump doesn't leak usable tokens.
+
+    When `single_per_subject`, saving a token deletes the previous token of the subject.
+    """
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        *,
+        namespace: str,
+        ttl_sec: int,
+        single_per_subject: bool = False,
+    ) -> None:
+        self._redis_client = redis_client
+        self._save = redis_client.register_script(_SAVE_SCRIPT)
+        self._rotate = redis_client.register_script(_ROTATE_SCRIPT)
+        self._namespace = namespace
+        self._ttl_sec = ttl_sec
+        self._single_per_subject = single_per_subject
+
+    async def save(self, token: str, subject: str, ttl_sec: int | None = None) -> None:
+        keys = [self._token_key(token)]
+        if self._single_per_subject:
+            keys.append(f"viot:{self._namespace}_subject:{subject}")
+        await self._save(keys=keys, args=[subject, ttl_sec or self._ttl_sec])
+
+    async def get(self, token: str) -> str | None:
+        return await self._redis_client.get(self._token_key(token))  # type: ignore
+
+    async def rotate(self, token: str, new_token: str) -> str | None:
+        return await self._rotate(  # type: ignore
+            keys=[self._token_key(token), self._token_key(new_token)],
+            args=[self._ttl_sec * 1000],
+        )
+
+    async def delete(self, token: str) -> bool:
+        return bool(await self._redis_client.delete(self._token_key(token)))
+
+    def _token_key(self, token: str) -> str:
+        return f"viot:{self._namespace}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+class RefreshTokenStore(RedisTokenStore):
+    """Refresh tokens, subject: user id"""
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        super().__init__(
+            redis_client, namespace="refresh_token", ttl_sec=REFRESH_TOKEN_DURATION_SEC
+        )
+
+
+class PasswordResetTokenStore(RedisTokenStore):
+    """Password reset tokens, subject: email, only the last requested token is valid"""
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        super().__init__(
+            redis_client,
+            namespace="password_reset",
+            ttl_sec=FORGOT_PASSWORD_DURATION_SEC,
+            single_per_subject=True,
+        )
@@ -1,13 +1,96 @@
 from datetime import datetime, timedelta
-from typing import Any
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, NamedTuple
 
 import jwt
 
 from ..config import auth_settings
-from ..constants import JWT_ALG
 from ..exception.token_exception import InvalidTokenException, TokenExpiredException
 
 
+class JwtKey(NamedTuple):
+    algorithm: str
+    verifying_key: Any
+    # None for a public key, it verifies tokens without signing
+    signing_key: Any | None
+
+
+class JwtKeySet:
+    """
+    Keys to sign and verify JWTs, loaded and prepared once.
+
+    Asymmetric tokens carry the id of their signing key in the `kid` header and are
+    verified with the matching public key. Tokens without `kid` are HS256 tokens,
+    verified with the secret when there is one.
+    """
+
+    def __init__(
+        self,
+        *,
+        algorithm: str,
+        secret: str = "",
+        keys_dir: str | None = None,
+        signing_key_id: str | None = None,
+    ) -> None:
+        self._keys: dict[str | None, JwtKey] = {}
+        self._jwks: list[dict[str, Any]] = []
+        if secret:
+            self._keys[None] = JwtKey("HS256", secret, secret)
+
+        if algorithm == "HS256":
+            if not secret:
+                raise ValueError("A secret is required to sign HS256 tokens")
+            self._signing_key_id: str | None = None
+            self._signing_key: Any = secret
+            return
+
+        if keys_dir is None or signing_key_id is None:
+            raise ValueError(f"A keys directory and a signing key id are required for {algorithm}")
+        jwt_algorithm = jwt.get_algorithm_by_name(algorithm)
+        for path in sorted(Path(keys_dir).glob("*.pem")):
+            key = jwt_algorithm.prepare_key(path.read_bytes())
+            # Private keys derive their public key, public keys don't
+            if hasattr(key, "public_key"):
+                self._keys[path.stem] = JwtKey(algorithm, key.public_key(), key)
+            else:
+                self._keys[path.stem] = JwtKey(algorithm, key, None)
+            jwk = jwt_algorithm.to_jwk(self._keys[path.stem].verifying_key, as_dict=True)
+            self._jwks.append({**jwk, "kid": path.stem, "alg": algorithm, "use": "sig"})
+
+        signing_key = self._keys.get(signing_key_id)
+        if signing_key is None or signing_key.signing_key is None:
+            raise ValueError(f"No private key {signing_key_id}.pem in {keys_dir}")
+        self._signing_key_id = signing_key_id
+        self._signing_key = signing_key.signing_key
+
+    def encode(self, payload: dict[str, Any]) -> str:
+        algorithm = self._keys[self._signing_key_id].algorithm
+        headers = None if self._signing_key_id is None else {"kid": self._signing_key_id}
+        return jwt.encode(payload, self._signing_key, algorithm=algorithm, headers=headers)
+
+    def decode(self, token: str) -> dict[str, Any]:
+        key_id = jwt.get_unverified_header(token).get("kid")
+        key = self._keys.get(key_id)
+        if key is None:
+            raise jwt.InvalidKeyError(f"Unknown key id {key_id}")
+        return jwt.decode(token, key.verifying_key, algorithms=[key.algorithm])
+
+    def jwks(self) -> dict[str, list[dict[str, Any]]]:
+        """Public keys as a JSON Web Key Set, empty for HS256, the secret isn't published"""
+        return {"keys": self._jwks}
+
+
+@lru_cache
+def get_jwt_key_set() -> JwtKeySet:
+    return JwtKeySet(
+        algorithm=auth_settings.JWT_ALGORITHM,
+        secret=auth_settings.JWT_SECRET,
+        keys_dir=auth_settings.JWT_KEYS_DIR,
+        signing_key_id=auth_settings.JWT_SIGNING_KEY_ID,
+    )
+
+
 def create_jwt_token(
     *, payload: dict[str, Any] | None = None, expire_duration: timedelta
 ) -> tuple[str, int]:
@@ -18,13 +101,13 @@ def create_jwt_token(
     expire_at = issue_at + int(expire_duration.total_seconds())
     payload["exp"] = expire_at
     payload["iat"] = issue_at
-    return jwt.encode(payload, auth_settings.JWT_SECRET, algorithm=JWT_ALG), expire_at
+    return get_jwt_key_set().encode(payload), expire_at
 
 
 def parse_jwt_token(token: str) -> dict[str, Any]:
     """Parse a JWT token and return the payload."""
     try:
-        payload = jwt.decode(token, auth_settings.JWT_SECRET, algorithms=[JWT_ALG])
+        payload = get_jwt_key_set().decode(token)
         return payload
     except jwt.ExpiredSignatureError:
         raise TokenExpiredException
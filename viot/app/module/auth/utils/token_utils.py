@@ -20,8 +20,13 @@ def create_access_token(access_token: AccessToken) -> tuple[str, int]:
 
 
 def parse_access_token(token: str) -> AccessToken:
+    return decode_access_token(token)[0]
+
+
+def decode_access_token(token: str) -> tuple[AccessToken, int]:
+    """Returns the access token and its expiration timestamp"""
     payload = parse_jwt_token(token)
     try:
-        return AccessToken(user_id=payload["sub"])
+        return AccessToken(user_id=UUID(payload["sub"])), int(payload["exp"])
     except Exception:
         raise InvalidTokenException
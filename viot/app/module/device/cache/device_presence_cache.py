@@ -0,0 +1,194 @@
+import logging
+from collections.abc import Collection
+from datetime import UTC, datetime, timedelta
+from typing import NamedTuple
+from uuid import UUID
+
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.extension.redis.client import RedisClient
+
+from ..constants import DeviceStatus
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+_PRESENCE_KEY = "viot:device_presence"
+_DIRTY_KEY = "viot:device_presence_dirty"
+_TEAM_ONLINE_KEY_PREFIX = "viot:device_online:"
+
+# KEYS[1]: presence hash, KEYS[2]: dirty set
+# ARGV[1]: device id, ARGV[2]: status, ARGV[3]: timestamp in microseconds,
+# ARGV[4]: team id, "" to keep the known one, ARGV[5]: prefix of the team sorted sets
+# Events older than the current state are ignored, EMQX may deliver the disconnect
+# of a previous session after the connect of the next one.
+_SET_STATUS_SCRIPT = """
+local team, last_connection = ARGV[4], ''
+local current = redis.call('HGET', KEYS[1], ARGV[1])
+if current then
+    local _, ts, current_last_connection, current_team =
+        string.match(current, '^(%d+):(%d+):(%d*):(.*)$')
+    if tonumber(ts) > tonumber(ARGV[3]) then
+        return 0
+    end
+    last_connection = current_last_connection
+    if team == '' then
+        team = current_team
+    end
+end
+if ARGV[2] == '1' then
+    last_connection = ARGV[3]
+end
+local presence = ARGV[2] .. ':' .. ARGV[3] .. ':' .. last_connection .. ':' .. team
+redis.call('HSET', KEYS[1], ARGV[1], presence)
+redis.call('SADD', KEYS[2], ARGV[1])
+if team ~= '' then
+    if ARGV[2] == '1' then
+        redis.call('ZADD', ARGV[5] .. team, ARGV[3], ARGV[1])
+    else
+        redis.call('ZREM', ARGV[5] .. team, ARGV[1])
+    end
+end
+return 1
+"""
+
+# KEYS[1]: dirty set, KEYS[2]: presence hash
+# ARGV[1]: maximum number of devices to pop
+# Returns device id, presence pairs
+_POP_DIRTY_SCRIPT = """
+local ids = redis.call('SPOP', KEYS[1], ARGV[1])
+local result = {}
+if #ids == 0 then
+    return result
+end
+local values = redis.call('HMGET', KEYS[2], unpack(ids))
+for i = 1, #ids do
+    if values[i] then
+        result[#result + 1] = ids[i]
+        result[#result + 1] = values[i]
+    end
+end
+return result
+"""
+
+
+class PresenceChange(NamedTuple):
+    device_id: UUID
+    status: DeviceStatus
+    last_seen: datetime
+    last_connection: datetime | None
+
+
+def device_online_cache_key(team_id: UUID) -> str:
+    """Redis sorted set of a team, member: online device id, score: connected at in microseconds"""
+    return f"{_TEAM_ONLINE_KEY_PREFIX}{team_id}"
+
+
+class DevicePresenceCache:
+    """
+    Source of truth of the device presence, the devices table is updated from it
+    in batches by `DevicePresenceFlusher`.
+
+    The presence of every device is kept in a single Redis hash, field: device id,
+    value: "status:last seen:last connection:team id" with timestamps in microseconds.
+    Changed devices are added to a dirty set, and the online devices of each team
+    are kept in a sorted set so they can be listed without touching the database.
+    Redis errors are logged, a lost update is corrected by the next event of the device.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._set_status = redis_client.register_script(_SET_STATUS_SCRIPT)
+        self._pop_dirty = redis_client.register_script(_POP_DIRTY_SCRIPT)
+
+    async def set_online(self, device_id: UUID, team_id: UUID, ts: datetime) -> None:
+        await self._execute_set_status(device_id, DeviceStatus.ONLINE, ts, str(team_id))
+
+    async def set_offline(self, device_id: UUID, ts: datetime) -> None:
+        await self._execute_set_status(device_id, DeviceStatus.OFFLINE, ts, "")
+
+    async def get_online(self, team_id: UUID) -> list[tuple[UUID, datetime]]:
+        """Returns the online devices of the team with the time they connected, newest first"""
+        try:
+            members = await self._redis_client.zrevrange(
+                device_online_cache_key(team_id), 0, -1, withscores=True
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to read online devices of team {team_id}: {e}")
+            return []
+
+        return [(UUID(member), _from_microseconds(int(score))) for member, score in members]
+
+    async def remove(self, device_id: UUID, team_id: UUID) -> None:
+        """Forget a deleted device"""
+        try:
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                pipe.hdel(_PRESENCE_KEY, str(device_id))
+                pipe.srem(_DIRTY_KEY, str(device_id))
+                pipe.zrem(device_online_cache_key(team_id), str(device_id))
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to remove presence of device {device_id}: {e}")
+
+    async def pop_changes(self, count: int) -> list[PresenceChange]:
+        """Pop up to `count` changed devices, the caller must `mark_changed` them on failure"""
+        try:
+            result = await self._pop_dirty(keys=[_DIRTY_KEY, _PRESENCE_KEY], args=[count])
+        except RedisError as e:
+            logger.warning(f"Failed to read device presence changes: {e}")
+            return []
+
+        changes: list[PresenceChange] = []
+        for device_id, value in zip(result[::2], result[1::2], strict=True):
+            status, last_seen, last_connection, _ = value.split(":", 3)
+            changes.append(
+                PresenceChange(
+                    device_id=UUID(device_id),
+                    status=DeviceStatus(int(status)),
+                    last_seen=_from_microseconds(int(last_seen)),
+                    last_connection=(
+                        _from_microseconds(int(last_connection)) if last_connection else None
+                    ),
+                )
+            )
+        return changes
+
+    async def mark_changed(self, device_ids: Collection[UUID]) -> None:
+        if not device_ids:
+            return
+        try:
+            await self._redis_client.sadd(  # type: ignore
+                _DIRTY_KEY, *(str(device_id) for device_id in device_ids)
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to mark presence of {len(device_ids)} devices as changed: {e}")
+
+    async def _execute_set_status(
+        self, device_id: UUID, status: DeviceStatus, ts: datetime, team_id: str
+    ) -> None:
+        try:
+            await self._set_status(
+                keys=[_PRESENCE_KEY, _DIRTY_KEY],
+                args=[
+                    str(device_id),
+                    int(status),
+                    _to_microseconds(ts),
+                    team_id,
+                    _TEAM_ONLINE_KEY_PREFIX,
+                ],
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to set presence of device {device_id}: {e}")
+
+
+def _to_microseconds(value: datetime) -> int:
+    value = value if value.tzinfo else value.replace(tzinfo=UTC)
+    return (value - _EPOCH) // _ONE_MICROSECOND
+
+
+def _from_microseconds(value: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=value)
@@ -0,0 +1,22 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeviceSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_DEVICE_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    # Presence changes kept in Redis are written to the devices table at this interval
+    PRESENCE_FLUSH_INTERVAL_MS: int = 1000
+    # Devices updated by a single statement of a flush
+    PRESENCE_FLUSH_BATCH_SIZE: int = 1000
+
+
+@lru_cache
+def get_device_settings() -> DeviceSettings:
+    return DeviceSettings()
+
+
+device_settings = get_device_settings()
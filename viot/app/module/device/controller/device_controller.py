@@ -15,7 +15,7 @@ from app.module.auth.permission import TeamDevicePermission
 from app.module.device.service.device_service import DeviceService
 
 from ..constants import DeviceType
-from ..dto.device_dto import DeviceCreateDto, DeviceDto, PagingDeviceDto
+from ..dto.device_dto import DeviceCreateDto, DeviceDto, OnlineDeviceDto, PagingDeviceDto
 
 
 class DeviceController(Controller):
@@ -53,6 +53,22 @@ class DeviceController(Controller):
             status_code=200,
         )
 
+    @get(
+        "/online",
+        summary="Get online devices belong to team",
+        status_code=200,
+        responses={200: {"model": list[OnlineDeviceDto]}},
+        dependencies=[RequireTeamPermission(TeamDevicePermission.READ)],
+    )
+    async def get_online_team_devices(
+        self, *, team_id: Annotated[UUID, Path(...)]
+    ) -> JSONResponse[list[OnlineDeviceDto]]:
+        """Get the devices of the team that are currently connected, newest connection first"""
+        return JSONResponse(
+            content=await self._device_service.get_online_devices_belong_to_team(team_id=team_id),
+            status_code=200,
+        )
+
     @get(
         "/{device_id}",
         summary="Get device by id",
@@ -35,6 +35,11 @@ class DeviceDto(BaseOutDto):
         return cls.model_validate(device)
 
 
+class OnlineDeviceDto(BaseOutDto):
+    id: UUID
+    last_seen: datetime
+
+
 class PagingDeviceDto(PagingDto[DeviceDto]):
     @classmethod
     def from_page(cls, page: Page[Device]) -> "PagingDeviceDto":
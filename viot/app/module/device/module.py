@@ -1,12 +1,20 @@
 from injector import Binder, Module, SingletonScope
 
+from .cache.device_presence_cache import DevicePresenceCache
 from .controller.device_controller import DeviceController
+from .presence_flusher import DevicePresenceFlusher
 from .repository.device_repository import DeviceRepository
+from .repository.device_status_batch_repository import DeviceStatusBatchRepository
 from .service.device_service import DeviceService
 
 
 class DeviceModule(Module):
     def configure(self, binder: Binder) -> None:
         binder.bind(DeviceRepository, to=DeviceRepository, scope=SingletonScope)
+        binder.bind(
+            DeviceStatusBatchRepository, to=DeviceStatusBatchRepository, scope=SingletonScope
+        )
+        binder.bind(DevicePresenceCache, to=DevicePresenceCache, scope=SingletonScope)
+        binder.bind(DevicePresenceFlusher, to=DevicePresenceFlusher, scope=SingletonScope)
         binder.bind(DeviceService, to=DeviceService, scope=SingletonScope)
         binder.bind(DeviceController, to=DeviceController, scope=SingletonScope)
@@ -0,0 +1,75 @@
+import asyncio
+import logging
+
+from injector import inject
+
+from .cache.device_presence_cache import DevicePresenceCache
+from .config import device_settings
+from .repository.device_status_batch_repository import DeviceStatusBatchRepository
+
+logger = logging.getLogger(__name__)
+
+
+class DevicePresenceFlusher:
+    """
+    Periodically writes the devices whose presence changed in Redis to the devices
+    table, in batches of `PRESENCE_FLUSH_BATCH_SIZE`. A device that changes many times
+    between two flushes is written once, with its latest state.
+
+    Every instance of the app can run a flusher, changed devices are popped atomically.
+    `stop` must be called on shutdown, it runs a last flush.
+    """
+
+    @inject
+    def __init__(
+        self,
+        device_presence_cache: DevicePresenceCache,
+        device_status_batch_repository: DeviceStatusBatchRepository,
+    ) -> None:
+        self._device_presence_cache = device_presence_cache
+        self._device_status_batch_repository = device_status_batch_repository
+        self._interval_sec = device_settings.PRESENCE_FLUSH_INTERVAL_MS / 1000
+        self._batch_size = device_settings.PRESENCE_FLUSH_BATCH_SIZE
+        self._stopping = asyncio.Event()
+        self._worker: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._stopping.clear()
+            self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._worker is None or self._worker.done():
+            return
+        self._stopping.set()
+        await self._worker
+
+    async def flush(self) -> int:
+        """Write all changed devices, returns how many were written"""
+        written = 0
+        while True:
+            changes = await self._device_presence_cache.pop_changes(self._batch_size)
+            if not changes:
+                return written
+
+            try:
+                await self._device_status_batch_repository.update_many(changes)
+            except Exception as e:
+                logger.error(f"Failed to write presence of {len(changes)} devices: {e}")
+                # Retried by the next flush
+                await self._device_presence_cache.mark_changed([c.device_id for c in changes])
+                return written
+
+            written += len(changes)
+            if len(changes) < self._batch_size:
+                return written
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self._interval_sec)
+                stopping = True
+            except TimeoutError:
+                pass
+            await self.flush()
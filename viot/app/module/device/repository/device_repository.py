@@ -1,9 +1,9 @@
+from collections.abc import Collection, Sequence
 from uuid import UUID
 
-from sqlalchemy import delete, exists, select, update
+from sqlalchemy import delete, exists, select
 
 from app.database.repository import PageableRepository
-from app.module.device.constants import DeviceStatus
 
 from ..model.device import Device
 
@@ -21,6 +21,9 @@ class DeviceRepository(PageableRepository[Device, UUID]):
         stmt = select(exists().where(Device.id == device_id, Device.team_id == team_id))
         return (await self.session.execute(stmt)).scalar() or False
 
-    async def update_device_status(self, status: DeviceStatus) -> None:
-        stmt = update(Device).values(status=status)
-        await self.session.execute(stmt)
+    async def find_ids_by_ids_and_team_id(
+        self, device_ids: Collection[UUID], team_id: UUID
+    ) -> Sequence[UUID]:
+        """Returns the ids of the given devices that belong to the team"""
+        stmt = select(Device.id).where(Device.id.in_(device_ids), Device.team_id == team_id)
+        return (await self.session.execute(stmt)).scalars().all()
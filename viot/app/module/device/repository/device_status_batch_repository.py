@@ -0,0 +1,48 @@
+from collections.abc import Sequence
+
+from injector import inject
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..cache.device_presence_cache import PresenceChange
+
+# Rows whose status and last connection are already up to date aren't rewritten
+UPDATE_DEVICE_STATUS_QUERY = """
+UPDATE devices AS d
+SET
+    status = v.status,
+    last_connection = COALESCE(v.last_connection, d.last_connection)
+FROM unnest(
+    CAST(:device_ids AS UUID[]),
+    CAST(:statuses AS SMALLINT[]),
+    CAST(:last_connections AS TIMESTAMPTZ[])
+) AS v(id, status, last_connection)
+WHERE d.id = v.id
+    AND (
+        d.status <> v.status
+        OR d.last_connection IS DISTINCT FROM COALESCE(v.last_connection, d.last_connection)
+    )
+"""
+
+
+class DeviceStatusBatchRepository:
+    """
+    Writes presence changes of many devices, so it uses its own connection and
+    transaction instead of the request-scoped session.
+    """
+
+    @inject
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def update_many(self, changes: Sequence[PresenceChange]) -> None:
+        """Update the status and last connection of the changed devices in one statement"""
+        async with self._engine.begin() as conn:
+            await conn.execute(
+                text(UPDATE_DEVICE_STATUS_QUERY),
+                {
+                    "device_ids": [change.device_id for change in changes],
+                    "statuses": [int(change.status) for change in changes],
+                    "last_connections": [change.last_connection for change in changes],
+                },
+            )
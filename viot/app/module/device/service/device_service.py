@@ -6,8 +6,9 @@ from app.database.repository import Filter, Pageable
 from app.module.team.exception.team_exception import TeamNotFoundException
 from app.module.team.repository.team_repository import TeamRepository
 
+from ..cache.device_presence_cache import DevicePresenceCache
 from ..constants import DeviceType
-from ..dto.device_dto import DeviceCreateDto, DeviceDto, PagingDeviceDto
+from ..dto.device_dto import DeviceCreateDto, DeviceDto, OnlineDeviceDto, PagingDeviceDto
 from ..exception.device_exception import DeviceNotFoundException
 from ..model.device import Device
 from ..repository.device_repository import DeviceRepository
@@ -19,9 +20,11 @@ class DeviceService:
         self,
         device_repository: DeviceRepository,
         team_repository: TeamRepository,
+        device_presence_cache: DevicePresenceCache,
     ) -> None:
         self._device_repository = device_repository
         self._team_repository = team_repository
+        self._device_presence_cache = device_presence_cache
 
     async def get_device_by_id_and_team_id(self, *, device_id: UUID, team_id: UUID) -> DeviceDto:
         device = await self._device_repository.find_by_device_id_and_team_id(device_id, team_id)
@@ -39,6 +42,13 @@ class DeviceService:
         device_page = await self._device_repository.find_all_with_paging(pageable)
         return PagingDeviceDto.from_page(device_page)
 
+    async def get_online_devices_belong_to_team(self, *, team_id: UUID) -> list[OnlineDeviceDto]:
+        """Read from the presence cache, the status in the database lags behind by a flush"""
+        online = await self._device_presence_cache.get_online(team_id)
+        return [
+            OnlineDeviceDto(id=device_id, last_seen=last_seen) for device_id, last_seen in online
+        ]
+
     async def create_device(
         self, *, team_id: UUID, device_create_dto: DeviceCreateDto
     ) -> DeviceDto:
@@ -56,3 +66,4 @@ class DeviceService:
 
     async def delete_device_by_id_and_team_id(self, *, device_id: UUID, team_id: UUID) -> None:
         await self._device_repository.delete_by_device_id_and_team_id(device_id, team_id)
+        await self._device_presence_cache.remove(device_id, team_id)
@@ -0,0 +1,220 @@
+import logging
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.extension.redis.client import RedisClient
+
+from ..config import device_data_settings
+from ..constants import AggregationType, Timezone
+from ..dto.device_data_dto import AggregatedData
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_ONE_MICROSECOND = timedelta(microseconds=1)
+
+# A series is the aggregation of a key, (key, aggregation type)
+Series = tuple[str, AggregationType]
+
+# Value of a closed bucket without data
+_EMPTY_BUCKET = ""
+
+# KEYS[1]: series hash, KEYS[2]: device index, KEYS[3]: device generation
+# ARGV[1]: generation read before the buckets were queried, ARGV[2]: ttl in seconds,
+# ARGV[3]: bucket width in microseconds, ARGV[4..]: bucket start, value pairs
+# Buckets computed before an invalidation are dropped, they may miss late data.
+# The series TTL is only set on creation, it bounds how long any bucket stays cached.
+_SET_BUCKETS_SCRIPT = """
+if (redis.call('GET', KEYS[3]) or '0') ~= ARGV[1] then
+    return 0
+end
+for i = 4, #ARGV, 2 do
+    redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2], 'NX')
+redis.call('HSET', KEYS[2], KEYS[1], ARGV[3])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+return 1
+"""
+
+# KEYS[1]: device index, KEYS[2]: device generation
+# ARGV[1]: drop the buckets ending after this timestamp in microseconds, "" to drop all
+_INVALIDATE_SCRIPT = """
+redis.call('INCR', KEYS[2])
+local index = redis.call('HGETALL', KEYS[1])
+for i = 1, #index, 2 do
+    if ARGV[1] == '' then
+        redis.call('DEL', index[i])
+    else
+        local width = tonumber(index[i + 1])
+        local since = tonumber(ARGV[1])
+        for _, field in ipairs(redis.call('HKEYS', index[i])) do
+            if tonumber(field) + width > since then
+                redis.call('HDEL', index[i], field)
+            end
+        end
+    end
+end
+if ARGV[1] == '' then
+    redis.call('DEL', KEYS[1])
+end
+return 1
+"""
+
+
+def device_data_aggregation_cache_key(
+    device_id: UUID,
+    key: str,
+    aggregation_type: AggregationType,
+    bucket_width: timedelta,
+    timezone: Timezone,
+) -> str:
+    """Redis hash of a series, field: bucket start in microseconds, value: JSON value"""
+    width = bucket_width // _ONE_MICROSECOND
+    return f"viot:device_data_agg:{device_id}:{key}:{aggregation_type}:{width}:{timezone}"
+
+
+def device_data_aggregation_index_key(device_id: UUID) -> str:
+    """Redis hash of a device, field: series hash key, value: bucket width in microseconds"""
+    return f"viot:device_data_agg_index:{device_id}"
+
+
+def device_data_aggregation_generation_key(device_id: UUID) -> str:
+    """Redis counter of a device, incremented by every invalidation"""
+    return f"viot:device_data_agg_generation:{device_id}"
+
+
+class DeviceDataAggregationCache:
+    """
+    Cache of closed aggregation buckets, buckets that end before the ingestion lag.
+    Closed buckets without data are cached as empty, so sparse series are covered too.
+
+    Writers of data older than the ingestion lag should call `invalidate`. Writers that
+    don't (e.g. viot-background) are covered by the TTL, counted from the first bucket
+    cached in a series, which bounds how long their late data is missing.
+    Redis errors are logged and treated as cache misses.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._set_buckets = redis_client.register_script(_SET_BUCKETS_SCRIPT)
+        self._invalidate = redis_client.register_script(_INVALIDATE_SCRIPT)
+        self._ttl_sec = device_data_settings.AGGREGATION_CACHE_TTL_SEC
+        self._encoder = msgspec.json.Encoder(decimal_format="number")
+
+    async def get_many(
+        self,
+        device_id: UUID,
+        series: Sequence[Series],
+        bucket_width: timedelta,
+        timezone: Timezone,
+        bucket_starts: Sequence[datetime],
+    ) -> tuple[str, dict[Series, list[AggregatedData | None]]]:
+        """
+        Returns the generation to pass to `set_many`, and the leading cached buckets of
+        each series, up to the first bucket that isn't cached. Empty buckets are None.
+        """
+        fields = [_bucket_field(start) for start in bucket_starts]
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                pipe.get(device_data_aggregation_generation_key(device_id))
+                for key, aggregation_type in series:
+                    pipe.hmget(
+                        device_data_aggregation_cache_key(
+                            device_id, key, aggregation_type, bucket_width, timezone
+                        ),
+                        fields,
+                    )
+                generation, *results = await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to read aggregations of device {device_id} from cache: {e}")
+            return "", {}
+
+        data: dict[Series, list[AggregatedData | None]] = {}
+        for s, values in zip(series, results, strict=True):
+            buckets: list[AggregatedData | None] = []
+            for start, value in zip(bucket_starts, values, strict=True):
+                if value is None:
+                    break
+                buckets.append(
+                    None
+                    if value == _EMPTY_BUCKET
+                    else AggregatedData(start + bucket_width / 2, msgspec.json.decode(value))
+                )
+            data[s] = buckets
+
+        return generation or "0", data
+
+    async def set_many(
+        self,
+        device_id: UUID,
+        generation: str,
+        bucket_width: timedelta,
+        timezone: Timezone,
+        data: Mapping[Series, Mapping[datetime, AggregatedData | None]],
+    ) -> None:
+        """
+        Cache closed buckets by their start, None for an empty bucket. Skipped if the
+        device was invalidated since.
+        """
+        if not generation:
+            return
+
+        try:
+            async with self._redis_client.pipeline(transaction=False) as pipe:
+                for (key, aggregation_type), buckets in data.items():
+                    if not buckets:
+                        continue
+                    args: list[str | int] = [
+                        generation,
+                        self._ttl_sec,
+                        bucket_width // _ONE_MICROSECOND,
+                    ]
+                    for start, bucket in buckets.items():
+                        value = (
+                            _EMPTY_BUCKET
+                            if bucket is None
+                            else self._encoder.encode(bucket.value).decode()
+                        )
+                        args.extend((_bucket_field(start), value))
+                    await self._set_buckets(
+                        keys=[
+                            device_data_aggregation_cache_key(
+                                device_id, key, aggregation_type, bucket_width, timezone
+                            ),
+                            device_data_aggregation_index_key(device_id),
+                            device_data_aggregation_generation_key(device_id),
+                        ],
+                        args=args,
+                        client=pipe,
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Failed to cache aggregations of device {device_id}: {e}")
+
+    async def invalidate(self, device_id: UUID, since: datetime | None = None) -> None:
+        """
+        Hook for writers of late data: drops the cached buckets of the device that end
+        after `since`, or all of them.
+        """
+        try:
+            await self._invalidate(
+                keys=[
+                    device_data_aggregation_index_key(device_id),
+                    device_data_aggregation_generation_key(device_id),
+                ],
+                args=["" if since is None else _bucket_field(since)],
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate aggregation cache of device {device_id}: {e}")
+
+
+def _bucket_field(value: datetime) -> str:
+    value = value if value.tzinfo else value.replace(tzinfo=UTC)
+    return str((value - _EPOCH) // _ONE_MICROSECOND)
@@ -0,0 +1,164 @@
+import logging
+from collections.abc import Collection, Mapping
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from redis.exceptions import RedisError
+
+from app.extension.redis.client import RedisClient
+
+from ..config import device_data_settings
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+# Marks a hash that holds every key of the device, not a valid telemetry key
+_COMPLETE_FIELD = "\x00"
+
+# KEYS[1]: device hash
+# ARGV[1]: "1" to only update an existing hash, ARGV[2]: ttl in seconds or "0",
+# ARGV[3]: "1" to mark the hash as complete, ARGV[4..]: field, value pairs
+# A field is only replaced by a value with a newer timestamp, so a slow read-through
+# never overwrites a value written through by the ingestion pipeline.
+# The TTL is only set on creation, it bounds how long any field stays cached.
+_SET_NEWER_SCRIPT = """
+if ARGV[1] == '1' and redis.call('EXISTS', KEYS[1]) == 0 then
+    return 0
+end
+for i = 4, #ARGV, 2 do
+    local current = redis.call('HGET', KEYS[1], ARGV[i])
+    if not current
+        or tonumber(string.match(current, '^%[(%d+),'))
+            < tonumber(string.match(ARGV[i + 1], '^%[(%d+),')) then
+        redis.call('HSET', KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+end
+if ARGV[3] == '1' then
+    redis.call('HSET', KEYS[1], '\\0', '1')
+end
+if ARGV[2] ~= '0' then
+    redis.call('EXPIRE', KEYS[1], ARGV[2], 'NX')
+end
+return 1
+"""
+
+
+class LatestDataPoint(NamedTuple):
+    ts: datetime
+    value: Any
+
+
+def device_data_latest_cache_key(device_id: UUID) -> str:
+    """Redis hash of a device, field: telemetry key, value: JSON [ts in microseconds, value]"""
+    return f"viot:device_data_latest:{device_id}"
+
+
+class DeviceDataLatestCache:
+    """
+    Read-through cache of device_data_latest, one Redis hash per device.
+
+    Writers that bypass this class must call `invalidate` (or delete the hash),
+    otherwise readers may see stale values for up to `LATEST_CACHE_TTL_SEC`, counted
+    from the read that created the hash.
+    Redis errors are logged and treated as cache misses.
+    """
+
+    @inject
+    def __init__(self, redis_client: RedisClient) -> None:
+        self._redis_client = redis_client
+        self._set_newer = redis_client.register_script(_SET_NEWER_SCRIPT)
+        self._ttl_sec = device_data_settings.LATEST_CACHE_TTL_SEC
+
+    async def get_many(
+        self, device_id: UUID, keys: Collection[str]
+    ) -> tuple[dict[str, LatestDataPoint], bool]:
+        """
+        Returns the cached data points of the keys, and whether the hash is complete,
+        meaning that keys missing from the result don't exist at all.
+        """
+        fields = list(keys)
+        try:
+            values = await self._redis_client.hmget(  # type: ignore
+                device_data_latest_cache_key(device_id), [*fields, _COMPLETE_FIELD]
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to read latest data of device {device_id} from cache: {e}")
+            return {}, False
+
+        data = {
+            field: _decode(value)
+            for field, value in zip(fields, values, strict=False)
+            if value is not None
+        }
+        return data, values[-1] is not None
+
+    async def get_all(self, device_id: UUID) -> dict[str, LatestDataPoint] | None:
+        """Returns all cached data points of the device, None unless the hash is complete"""
+        try:
+            values = await self._redis_client.hgetall(  # type: ignore
+                device_data_latest_cache_key(device_id)
+            )
+        except RedisError as e:
+            logger.warning(f"Failed to read latest data of device {device_id} from cache: {e}")
+            return None
+
+        if values.pop(_COMPLETE_FIELD, None) is None:
+            return None
+        return {field: _decode(value) for field, value in values.items()}
+
+    async def set_many(
+        self, device_id: UUID, data: Mapping[str, LatestDataPoint], *, complete: bool = False
+    ) -> None:
+        """Read-through population, `complete` when data holds every key of the device"""
+        await self._execute_set_newer(device_id, data, only_existing=False, complete=complete)
+
+    async def write_through(self, device_id: UUID, data: Mapping[str, LatestDataPoint]) -> None:
+        """
+        Hook for the ingestion pipeline: updates the cached keys with newer data points.
+        Devices that aren't cached are left alone, they are populated on the next read.
+        """
+        await self._execute_set_newer(device_id, data, only_existing=True, complete=False)
+
+    async def invalidate(self, device_id: UUID) -> None:
+        try:
+            await self._redis_client.delete(device_data_latest_cache_key(device_id))
+        except RedisError as e:
+            logger.warning(f"Failed to invalidate latest data cache of device {device_id}: {e}")
+
+    async def _execute_set_newer(
+        self,
+        device_id: UUID,
+        data: Mapping[str, LatestDataPoint],
+        *,
+        only_existing: bool,
+        complete: bool,
+    ) -> None:
+        if not data and not complete:
+            return
+
+        args: list[str | int] = [
+            int(only_existing),
+            0 if only_existing else self._ttl_sec,
+            int(complete),
+        ]
+        for key, point in data.items():
+            args.extend((key, _encode(point)))
+
+        try:
+            await self._set_newer(keys=[device_data_latest_cache_key(device_id)], args=args)
+        except RedisError as e:
+            logger.warning(f"Failed to cache latest data of device {device_id}: {e}")
+
+
+def _encode(point: LatestDataPoint) -> str:
+    ts = point.ts if point.ts.tzinfo else point.ts.replace(tzinfo=UTC)
+    return msgspec.json.encode([(ts - _EPOCH) // timedelta(microseconds=1), point.value]).decode()
+
+
+def _decode(value: str) -> LatestDataPoint:
+    ts, data = msgspec.json.decode(value, type=tuple[int, Any])
+    return LatestDataPoint(ts=_EPOCH + timedelta(microseconds=ts), value=data)
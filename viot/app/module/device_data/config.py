@@ -0,0 +1,49 @@
+from functools import lru_cache
+
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class DeviceDataSettings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_prefix="VIOT_DEVICE_DATA_", env_file=".env", env_file_encoding="utf-8", extra="ignore"
+    )
+
+    # Bounds how long data written without the cache hook (e.g. by viot-background) can be stale
+    LATEST_CACHE_TTL_SEC: int = 5
+
+    # Aggregation buckets ending before now minus this lag are closed and cached
+    AGGREGATION_CACHE_LAG_SEC: int = 60
+    # Bounds how long late data written without the invalidation hook (e.g. by
+    # viot-background) is missing from cached buckets
+    AGGREGATION_CACHE_TTL_SEC: int = 10 * 60
+    # Queries with more closed buckets than this bypass the cache
+    AGGREGATION_CACHE_MAX_BUCKETS: int = 5000
+
+    # maxPoints downsampling splits the range into this many buckets per point, each one
+    # reduced in SQL to its first, last, min and max rows before LTTB. Bounds the rows read
+    # per key to 4 times this many per point, whatever the range.
+    DOWNSAMPLE_BUCKETS_PER_POINT: int = 4
+
+    # Counting connect logs stops here, deeper counts are reported as capped
+    CONNECT_LOG_COUNT_CAP: int = 10_000
+
+    # Connect logs waiting to be written, logs enqueued while the queue is full are dropped
+    CONNECT_LOG_QUEUE_SIZE: int = 10_000
+    # Connect logs are written once this many are queued, or after the flush interval
+    CONNECT_LOG_FLUSH_SIZE: int = 500
+    CONNECT_LOG_FLUSH_INTERVAL_MS: int = 1000
+
+    # Concurrent ingestion requests within this window are written in one COPY, 0 disables
+    INGEST_BATCH_WINDOW_MS: int = 20
+    # A batch is written right away once it holds this many data points
+    INGEST_BATCH_MAX_ROWS: int = 50_000
+    # Data points accepted by a single ingestion request
+    INGEST_MAX_DATA_POINTS: int = 100_000
+
+
+@lru_cache
+def get_device_data_settings() -> DeviceDataSettings:
+    return DeviceDataSettings()
+
+
+device_data_settings = get_device_data_settings()
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any
+from uuid import UUID
+
+import msgspec
+from injector import inject
+from sqlalchemy.exc import IntegrityError
+
+from .config import device_data_settings
+from .constants import ConnectStatus
+from .repository.connect_log_batch_repository import ConnectLogBatchRepository
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectLogWriterMetrics(msgspec.Struct, rename="camel"):
+    queue_depth: int
+    queue_capacity: int
+    written: int
+    dropped: int
+    failed: int
+    flushes: int
+    last_flush_latency_ms: float | None
+    max_flush_latency_ms: float | None
+
+
+class ConnectLogWriter:
+    """
+    Writes connect logs in the background, off the EMQX hot path.
+
+    Logs are queued in a bounded queue and written by a single worker with one
+    multi-row insert, once `CONNECT_LOG_FLUSH_SIZE` logs are queued or after
+    `CONNECT_LOG_FLUSH_INTERVAL_MS`. When the queue is full, new logs are dropped
+    rather than slowing down device authentication. `drain` must be called on shutdown.
+    """
+
+    @inject
+    def __init__(self, connect_log_batch_repository: ConnectLogBatchRepository) -> None:
+        self._connect_log_batch_repository = connect_log_batch_repository
+        self._queue: asyncio.Queue[dict[str, Any] | None] = asyncio.Queue(
+            maxsize=device_data_settings.CONNECT_LOG_QUEUE_SIZE
+        )
+        self._flush_size = device_data_settings.CONNECT_LOG_FLUSH_SIZE
+        self._flush_interval_sec = device_data_settings.CONNECT_LOG_FLUSH_INTERVAL_MS / 1000
+        self._worker: asyncio.Task[None] | None = None
+
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._flushes = 0
+        self._last_flush_latency_ms: float | None = None
+        self._max_flush_latency_ms: float | None = None
+
+    def enqueue(
+        self, *, device_id: UUID, ts: datetime, connect_status: ConnectStatus, ip: str
+    ) -> bool:
+        """Queue a connect log, returns False when it was dropped because the queue is full"""
+        try:
+            self._queue.put_nowait(
+                {"device_id": device_id, "ts": ts, "connect_status": connect_status, "ip": ip}
+            )
+        except asyncio.QueueFull:
+            self._dropped += 1
+            logger.warning(f"Connect log queue is full, dropped connect log of device {device_id}")
+            return False
+
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run())
+        return True
+
+    async def drain(self) -> None:
+        """Write all queued connect logs and stop the worker"""
+        if self._worker is None or self._worker.done():
+            return
+        # None tells the worker to write what it holds and stop
+        await self._queue.put(None)
+        await self._worker
+
+    def metrics(self) -> ConnectLogWriterMetrics:
+        return ConnectLogWriterMetrics(
+            queue_depth=self._queue.qsize(),
+            queue_capacity=self._queue.maxsize,
+            written=self._written,
+            dropped=self._dropped,
+            failed=self._failed,
+            flushes=self._flushes,
+            last_flush_latency_ms=self._last_flush_latency_ms,
+            max_flush_latency_ms=self._max_flush_latency_ms,
+        )
+
+    async def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            row = await self._queue.get()
+            if row is None:
+                return
+
+            batch = [row]
+            deadline = time.monotonic() + self._flush_interval_sec
+            while len(batch) < self._flush_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row = await asyncio.wait_for(self._queue.get(), timeout)
+                except TimeoutError:
+                    break
+                if row is None:
+                    stopping = True
+                    break
+                batch.append(row)
+
+            await self._flush(batch)
+
+    async def _flush(self, batch: list[dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        try:
+            await self._insert(batch)
+        finally:
+            latency_ms = (time.perf_counter() - started) * 1000
+            self._flushes += 1
+            self._last_flush_latency_ms = latency_ms
+            self._max_flush_latency_ms = max(self._max_flush_latency_ms or 0.0, latency_ms)
+
+    async def _insert(self, batch: list[dict[str, Any]]) -> None:
+        """
+        Insert the batch, split in halves on an integrity error (e.g. a log of a device
+        deleted while queued), so only the rows that fail on their own are dropped.
+        """
+        try:
+            await self._connect_log_batch_repository.insert_many(batch)
+        except IntegrityError as e:
+            if len(batch) > 1:
+                middle = len(batch) // 2
+                await self._insert(batch[:middle])
+                await self._insert(batch[middle:])
+                return
+            self._failed += 1
+            logger.error(f"Failed to write connect log of device {batch[0]['device_id']}: {e}")
+            return
+        except Exception as e:
+            self._failed += len(batch)
+            logger.error(f"Failed to write {len(batch)} connect logs: {e}")
+            return
+
+        self._written += len(batch)
@@ -1,3 +1,4 @@
+from datetime import timedelta
 from enum import IntEnum, StrEnum
 
 
@@ -72,3 +73,67 @@ class Timezone(StrEnum):
     VIETNAM = "Asia/Ho_Chi_Minh"
     SINGAPORE = "Asia/Singapore"
     NEW_YORK = "America/New_York"
+
+
+class FillType(StrEnum):
+    """Fill of aggregation buckets without data
+
+    NULL = null, the bucket value is null
+    PREVIOUS = previous, the value of the previous bucket (LOCF)
+    LINEAR = linear, linear interpolation between the surrounding buckets
+    """
+
+    NULL = "null"
+    PREVIOUS = "previous"
+    LINEAR = "linear"
+
+
+class TimeseriesFormat(StrEnum):
+    """Timeseries response format
+
+    ROWS = rows, {"key": [{"ts": ..., "value": ...}]}
+    COLUMNAR = columnar, {"key": {"ts": [...], "values": [...]}}
+    """
+
+    ROWS = "rows"
+    COLUMNAR = "columnar"
+
+
+class ExportFormat(StrEnum):
+    """Export format
+
+    NDJSON = ndjson
+    CSV = csv
+    """
+
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class IngestFormat(StrEnum):
+    """Ingestion body format, selected by the Content-Type header
+
+    NDJSON = application/x-ndjson, one record per line
+    MSGPACK = application/msgpack, an array of records
+    """
+
+    NDJSON = "application/x-ndjson"
+    MSGPACK = "application/msgpack"
+
+
+class DeviceDataRollup(StrEnum):
+    """
+    Continuous aggregates of device_data, named by their bucket width.
+    """
+
+    ONE_MINUTE = "device_data_1m"
+    ONE_HOUR = "device_data_1h"
+    ONE_DAY = "device_data_1d"
+
+
+# Ordered from the coarsest to the finest rollup
+ROLLUP_BUCKET_WIDTHS: dict[DeviceDataRollup, timedelta] = {
+    DeviceDataRollup.ONE_DAY: timedelta(days=1),
+    DeviceDataRollup.ONE_HOUR: timedelta(hours=1),
+    DeviceDataRollup.ONE_MINUTE: timedelta(minutes=1),
+}
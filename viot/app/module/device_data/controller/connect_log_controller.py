@@ -7,13 +7,20 @@ from fastapi import Path, Query
 from injector import inject
 
 from app.common.controller import Controller
-from app.common.dto.types import OrderByQuery, PageQuery, PageSizeQuery
+from app.common.dto.types import (
+    CursorQuery,
+    IncludeTotalQuery,
+    LimitQuery,
+    OrderByQuery,
+    PageQuery,
+    PageSizeQuery,
+)
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import RequireTeamPermission
 from app.module.auth.permission import TeamDeviceConnectLogPermission
 
-from ..dto.connect_log_dto import PagingConnectLogDto
+from ..dto.connect_log_dto import CursorPagingConnectLogDto, PagingConnectLogDto
 from ..service.connect_log_service import ConnectLogService
 
 
@@ -59,6 +66,47 @@ class ConnectLogController(Controller):
             status_code=200,
         )
 
+    @get(
+        "/scroll",
+        summary="Scroll connect logs for a device",
+        status_code=200,
+        responses={200: {"model": CursorPagingConnectLogDto}},
+        dependencies=[RequireTeamPermission(TeamDeviceConnectLogPermission.READ)],
+    )
+    async def scroll_connect_logs(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        device_id: Annotated[UUID, Path(...)],
+        limit: LimitQuery = 20,
+        start_date: Annotated[datetime | None, Query(...)] = None,
+        end_date: Annotated[datetime | None, Query(...)] = None,
+        order_by: OrderByQuery = "desc",
+        cursor: CursorQuery = None,
+        include_total: IncludeTotalQuery = False,
+    ) -> JSONResponse[CursorPagingConnectLogDto]:
+        """
+        Get connect logs for a device page by page, newest first unless `orderBy` is asc.
+
+        Pass the `nextCursor` of a page to get the next one, it is null on the last page.
+        Unlike the paged endpoint, every page costs the same no matter how deep it is.
+        With `includeTotal`, the logs of all pages are counted up to a cap, and
+        `totalItemsCapped` tells whether there are more.
+        """
+        return JSONResponse(
+            content=await self._connect_log_service.scroll_connect_logs(
+                team_id=team_id,
+                device_id=device_id,
+                limit=limit,
+                start_date=start_date,
+                end_date=end_date,
+                order_by=order_by,
+                cursor=cursor,
+                include_total=include_total,
+            ),
+            status_code=200,
+        )
+
     @delete(
         "",
         summary="Delete connect logs for a device",
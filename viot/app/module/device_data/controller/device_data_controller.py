@@ -1,25 +1,45 @@
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
-from classy_fastapi import get
-from fastapi import Path, Query
+from classy_fastapi import get, post
+from fastapi import Body, Path, Query, Request
+from fastapi.responses import StreamingResponse
 from injector import inject
 
 from app.common.controller import Controller
-from app.common.fastapi.serializer import JSONResponse
+from app.common.fastapi.serializer import JSONResponse, MsgspecJSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import RequireTeamPermission
 from app.module.auth.permission import TeamDeviceDataPermission
 
-from ..constants import DeviceAttributeScope
-from ..dto.device_attribute_dto import DeviceAttributeDto, ScopeKeysDto
+from ..constants import DeviceAttributeScope, ExportFormat, IngestFormat, TimeseriesFormat
+from ..dto.device_attribute_dto import (
+    MAX_UPSERT_ATTRIBUTES,
+    AttributeKey,
+    AttributesUpsertDto,
+    AttributeUpsertResult,
+    AttributeValue,
+    DeviceAttributeDto,
+    ScopeKeysDto,
+)
 from ..dto.device_data_dto import (
     DataPointDto,
+    DeviceDataStatsDto,
+    FleetLatestColumns,
+    FleetLatestQueryDto,
     KeySetQuery,
     LatestDataPointDto,
     TimeseriesAggregationQueryDto,
+    TimeseriesColumns,
+    TimeseriesExportQueryDto,
+    TimeseriesPageDto,
+    TimeseriesPageQueryDto,
 )
+from ..dto.device_data_ingest_dto import IngestResultDto
+from ..exception.device_data_ingest_exception import UnsupportedIngestFormatException
 from ..service.device_attribute_service import DeviceAttributeService
+from ..service.device_data_export_service import DeviceDataExportService
+from ..service.device_data_ingest_service import DeviceDataIngestService
 from ..service.device_data_service import DeviceDataService
 
 
@@ -29,6 +49,8 @@ class DeviceDataController(Controller):
         self,
         device_data_service: DeviceDataService,
         device_attribute_service: DeviceAttributeService,
+        device_data_export_service: DeviceDataExportService,
+        device_data_ingest_service: DeviceDataIngestService,
     ) -> None:
         super().__init__(
             prefix="/teams/{team_id}/devices",
@@ -37,6 +59,96 @@ class DeviceDataController(Controller):
         )
         self._device_data_service = device_data_service
         self._device_attribute_service = device_attribute_service
+        self._device_data_export_service = device_data_export_service
+        self._device_data_ingest_service = device_data_ingest_service
+
+    @post(
+        "/timeseries/latest",
+        summary="Get latest timeseries data of many devices",
+        status_code=200,
+        responses={200: {"model": dict[str, list[Any]]}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def get_fleet_latest_timeseries_data(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        query_dto: FleetLatestQueryDto,
+    ) -> MsgspecJSONResponse[FleetLatestColumns]:
+        """
+        Returns the latest values of the keys for many devices of the team at once,
+        in a single query. Devices are selected by `deviceIds` and/or `deviceType`,
+        all devices of the team are selected when both are omitted.
+
+        The response is columnar, the n-th entries of the arrays belong together.
+        Devices without a value for a key have no entry.
+
+        ```json
+        {
+          "deviceIds": ["0192...", "0192..."],
+          "keys": ["temperature", "temperature"],
+          "ts": ["2021-08-12T00:00:00Z", "2021-08-12T00:00:05Z"],
+          "values": [21.5, 23.0]
+        }
+        ```
+        """
+        return MsgspecJSONResponse(
+            content=await self._device_data_service.get_fleet_latest_data(
+                team_id=team_id, query_dto=query_dto
+            ),
+            status_code=200,
+        )
+
+    @post(
+        "/timeseries",
+        summary="Ingest timeseries data of many devices",
+        status_code=200,
+        responses={200: {"model": IngestResultDto}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.WRITE)],
+        openapi_extra={
+            "requestBody": {
+                "required": True,
+                "content": {
+                    IngestFormat.NDJSON: {"schema": {"type": "string"}},
+                    IngestFormat.MSGPACK: {"schema": {"type": "string", "format": "binary"}},
+                },
+            }
+        },
+    )
+    async def ingest_timeseries_data(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        request: Request,
+    ) -> JSONResponse[IngestResultDto]:
+        """
+        Writes telemetry records of devices of the team in bulk. Each record holds the
+        data points of a device at a timestamp:
+
+        ```json
+        {"deviceId": "0192...", "ts": "2021-08-12T00:00:00Z", "data": {"temperature": 21.5}}
+        ```
+
+        - `application/x-ndjson`: one record per line
+        - `application/msgpack`: an array of records
+
+        Booleans, integers, floats, strings and JSON values are stored as such, null values
+        are skipped. Data points that already exist are left unchanged.
+        """
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type == "application/x-msgpack":
+            content_type = IngestFormat.MSGPACK
+        if content_type not in set(IngestFormat):
+            raise UnsupportedIngestFormatException(content_type)
+
+        return JSONResponse(
+            content=await self._device_data_ingest_service.ingest(
+                team_id=team_id,
+                body=await request.body(),
+                ingest_format=IngestFormat(content_type),
+            ),
+            status_code=200,
+        )
 
     @get(
         "/{device_id}/attributes/keys",
@@ -120,6 +232,69 @@ class DeviceDataController(Controller):
             status_code=200,
         )
 
+    @post(
+        "/attributes/{scope}",
+        summary="Upsert attributes of many devices",
+        status_code=200,
+        responses={200: {"model": list[dict[str, Any]]}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.WRITE)],
+    )
+    async def upsert_attributes(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        scope: Annotated[
+            DeviceAttributeScope,
+            Path(..., description="0: SERVER_SCOPE, 1: SHARED_SCOPE"),
+        ],
+        attributes_upsert_dto: Annotated[AttributesUpsertDto, Body(...)],
+    ) -> MsgspecJSONResponse[list[AttributeUpsertResult]]:
+        """
+        Inserts or replaces attributes of many devices of the team in a single statement.
+        Only SERVER_SCOPE and SHARED_SCOPE attributes can be written, CLIENT_SCOPE
+        attributes are reported by the device.
+
+        Returns one result per written attribute, `created` is false when an existing
+        attribute was replaced.
+        """
+        return MsgspecJSONResponse(
+            content=await self._device_attribute_service.upsert_attributes(
+                team_id=team_id, scope=scope, attributes_upsert_dto=attributes_upsert_dto
+            ),
+            status_code=200,
+        )
+
+    @post(
+        "/{device_id}/attributes/{scope}",
+        summary="Upsert attributes of a device",
+        status_code=200,
+        responses={200: {"model": list[dict[str, Any]]}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.WRITE)],
+    )
+    async def upsert_device_attributes(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        device_id: Annotated[UUID, Path(...)],
+        scope: Annotated[
+            DeviceAttributeScope,
+            Path(..., description="0: SERVER_SCOPE, 1: SHARED_SCOPE"),
+        ],
+        attributes: Annotated[
+            dict[AttributeKey, AttributeValue], Body(..., max_length=MAX_UPSERT_ATTRIBUTES)
+        ],
+    ) -> MsgspecJSONResponse[list[AttributeUpsertResult]]:
+        """
+        Inserts or replaces attributes of a device, the body maps keys to values.
+        Only SERVER_SCOPE and SHARED_SCOPE attributes can be written.
+        """
+        return MsgspecJSONResponse(
+            content=await self._device_attribute_service.upsert_device_attributes(
+                team_id=team_id, device_id=device_id, scope=scope, attributes=attributes
+            ),
+            status_code=200,
+        )
+
     @get(
         "/{device_id}/timeseries/keys",
         summary="Get all timeseries keys",
@@ -138,6 +313,27 @@ class DeviceDataController(Controller):
             status_code=200,
         )
 
+    @get(
+        "/{device_id}/timeseries/stats",
+        summary="Get timeseries statistics",
+        status_code=200,
+        responses={200: {"model": DeviceDataStatsDto}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def get_timeseries_stats(
+        self,
+        *,
+        device_id: Annotated[UUID, Path(...)],
+    ) -> JSONResponse[DeviceDataStatsDto]:
+        """
+        Get the number of data points, first and last timestamps, and numeric min and max
+        of each timeseries key, read from the daily rollup instead of the raw data
+        """
+        return JSONResponse(
+            content=await self._device_data_service.get_stats(device_id=device_id),
+            status_code=200,
+        )
+
     @get(
         "/{device_id}/timeseries/latest",
         summary="Get latest timeseries data by keys",
@@ -171,7 +367,7 @@ class DeviceDataController(Controller):
         *,
         device_id: Annotated[UUID, Path(...)],
         query_dto: Annotated[TimeseriesAggregationQueryDto, Query(...)],
-    ) -> JSONResponse[dict[str, list[DataPointDto]]]:
+    ) -> JSONResponse[dict[str, list[DataPointDto]] | dict[str, TimeseriesColumns]]:
         """
         Returns a time series range for the device timeseries data.
         By default, the data is not aggregated.
@@ -179,6 +375,10 @@ class DeviceDataController(Controller):
          `intervalType` for the aggregation interval and `interval`.
          Server-side aggregation is typically more
         efficient than retrieving all records without processing.
+        Several aggregation types, e.g. `agg=min,avg,max` for a band chart, are computed
+        in a single scan and returned as one series per `<key>:<agg>`.
+        With `fill`, buckets without data are filled (`null`, `previous` or `linear`),
+        so every series holds every bucket of the range, aligned across keys.
 
         ```json
         {
@@ -194,10 +394,112 @@ class DeviceDataController(Controller):
           ]
         }
         ```
+
+        With `format=columnar`, the data points of each key are returned as two arrays,
+        which is much cheaper to build and encode for large responses:
+
+        ```json
+        {
+          "kwh": {
+            "ts": ["2021-08-12T00:00:00Z", "2021-08-13T00:00:00Z"],
+            "values": [100.0, 200.0]
+          }
+        }
+        ```
+
+        For charts, use `maxPoints` instead of `limit`: the raw data points of each key
+        in the range are downsampled server-side with Largest-Triangle-Three-Buckets,
+        so the payload stays bounded while peaks and dips are kept. The database first
+        reduces the range to the first, last, min and max points of small time buckets.
         """
+        if query_dto.format == TimeseriesFormat.COLUMNAR:
+            return MsgspecJSONResponse(
+                content=await self._device_data_service.get_timeseries_columns_by_keys(
+                    device_id=device_id, query_dto=query_dto
+                ),
+                status_code=200,
+            )
+
         return JSONResponse(
             content=await self._device_data_service.get_timeseries_data_by_keys(
                 device_id=device_id, query_dto=query_dto
             ),
             status_code=200,
         )
+
+    @get(
+        "/{device_id}/timeseries/scroll",
+        summary="Scroll timeseries data by keys",
+        status_code=200,
+        responses={200: {"model": TimeseriesPageDto}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def scroll_timeseries_data_by_keys(
+        self,
+        *,
+        device_id: Annotated[UUID, Path(...)],
+        query_dto: Annotated[TimeseriesPageQueryDto, Query(...)],
+    ) -> JSONResponse[TimeseriesPageDto]:
+        """
+        Returns raw timeseries data page by page, ordered by timestamp and key.
+        Pass the `nextCursor` of a page as `cursor` to fetch the next one,
+        `nextCursor` is null on the last page.
+
+        ```json
+        {
+          "data": {
+            "kwh": [
+              {
+                "ts": "2021-08-12T00:00:00Z",
+                "value": 100.0
+              }
+            ]
+          },
+          "nextCursor": "WyIyMDIxLTA4LTEyVDAwOjAwOjAwWiIsImt3aCJd"
+        }
+        ```
+        """
+        return JSONResponse(
+            content=await self._device_data_service.get_timeseries_page_by_keys(
+                device_id=device_id, query_dto=query_dto
+            ),
+            status_code=200,
+        )
+
+    @get(
+        "/{device_id}/timeseries/export",
+        summary="Export timeseries data by keys",
+        status_code=200,
+        response_class=StreamingResponse,
+        responses={200: {"content": {"application/x-ndjson": {}, "text/csv": {}}}},
+        dependencies=[RequireTeamPermission(TeamDeviceDataPermission.READ)],
+    )
+    async def export_timeseries_data_by_keys(
+        self,
+        *,
+        device_id: Annotated[UUID, Path(...)],
+        query_dto: Annotated[TimeseriesExportQueryDto, Query(...)],
+    ) -> StreamingResponse:
+        """
+        Streams all raw timeseries data of the keys in the date range, ordered by timestamp.
+        Unlike the timeseries endpoint, the number of data points is not limited.
+
+        - ndjson: one `{"ts": ..., "key": ..., "value": ...}` object per line
+        - csv: `ts,key,value` columns with a header row
+        """
+        if query_dto.format == ExportFormat.CSV:
+            media_type = "text/csv"
+        else:
+            media_type = "application/x-ndjson"
+
+        return StreamingResponse(
+            self._device_data_export_service.export_timeseries(
+                device_id=device_id, query_dto=query_dto
+            ),
+            media_type=media_type,
+            headers={
+                "Content-Disposition": (
+                    f'attachment; filename="{device_id}_timeseries.{query_dto.format}"'
+                )
+            },
+        )
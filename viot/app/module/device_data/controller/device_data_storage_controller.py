@@ -0,0 +1,151 @@
+from typing import Annotated
+from uuid import UUID
+
+from classy_fastapi import delete, get, patch, put
+from fastapi import Body, Path
+from injector import inject
+
+from app.common.controller import Controller
+from app.common.fastapi.serializer import JSONResponse, MsgspecJSONResponse
+from app.database.dependency import DependSession
+from app.module.auth.constants import ViotUserRole
+from app.module.auth.dependency import RequireGlobalRole
+
+from ..connect_log_writer import ConnectLogWriter, ConnectLogWriterMetrics
+from ..dto.device_data_storage_dto import (
+    DeviceDataStoragePolicyDto,
+    DeviceDataStoragePolicyUpdateDto,
+    DeviceDataStorageStatsDto,
+    RetentionPolicyDto,
+    RetentionPolicyUpdateDto,
+)
+from ..service.device_data_storage_service import DeviceDataStorageService
+
+
+class DeviceDataStorageController(Controller):
+    @inject
+    def __init__(
+        self,
+        device_data_storage_service: DeviceDataStorageService,
+        connect_log_writer: ConnectLogWriter,
+    ) -> None:
+        super().__init__(
+            prefix="/admin/device-data",
+            tags=["Device Data Storage"],
+            dependencies=[DependSession, RequireGlobalRole(ViotUserRole.ADMIN)],
+        )
+        self._device_data_storage_service = device_data_storage_service
+        self._connect_log_writer = connect_log_writer
+
+    @get(
+        "/policy",
+        summary="Get device data storage policy",
+        status_code=200,
+        responses={200: {"model": DeviceDataStoragePolicyDto}},
+    )
+    async def get_storage_policy(self) -> JSONResponse[DeviceDataStoragePolicyDto]:
+        """Get chunk interval, compression and retention policy of device data."""
+        return JSONResponse(
+            content=await self._device_data_storage_service.get_storage_policy(),
+            status_code=200,
+        )
+
+    @patch(
+        "/policy",
+        summary="Update device data storage policy",
+        status_code=200,
+        responses={200: {"model": DeviceDataStoragePolicyDto}},
+    )
+    async def update_storage_policy(
+        self,
+        *,
+        policy_update_dto: Annotated[DeviceDataStoragePolicyUpdateDto, Body(...)],
+    ) -> JSONResponse[DeviceDataStoragePolicyDto]:
+        """
+        Update chunk interval, compression and retention policy of device data.
+
+        Omitted fields are left unchanged, null disables compression or retention.
+        """
+        return JSONResponse(
+            content=await self._device_data_storage_service.update_storage_policy(
+                policy_update_dto=policy_update_dto
+            ),
+            status_code=200,
+        )
+
+    @get(
+        "/storage",
+        summary="Get device data storage stats",
+        status_code=200,
+        responses={200: {"model": DeviceDataStorageStatsDto}},
+    )
+    async def get_storage_stats(self) -> JSONResponse[DeviceDataStorageStatsDto]:
+        """Get chunk counts and compressed vs uncompressed size of device data."""
+        return JSONResponse(
+            content=await self._device_data_storage_service.get_storage_stats(),
+            status_code=200,
+        )
+
+    @get(
+        "/retention-policies",
+        summary="Get retention policies of teams",
+        status_code=200,
+        responses={200: {"model": list[RetentionPolicyDto]}},
+    )
+    async def get_retention_policies(self) -> JSONResponse[list[RetentionPolicyDto]]:
+        """Get the device data retention policies of all teams."""
+        return JSONResponse(
+            content=await self._device_data_storage_service.get_retention_policies(),
+            status_code=200,
+        )
+
+    @put(
+        "/retention-policies/{team_id}",
+        summary="Set retention policy of a team",
+        status_code=200,
+        responses={200: {"model": RetentionPolicyDto}},
+    )
+    async def set_retention_policy(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+        retention_policy_update_dto: Annotated[RetentionPolicyUpdateDto, Body(...)],
+    ) -> JSONResponse[RetentionPolicyDto]:
+        """
+        Set the device data retention of a team, data older than it is deleted daily.
+        """
+        return JSONResponse(
+            content=await self._device_data_storage_service.set_retention_policy(
+                team_id=team_id, retention_policy_update_dto=retention_policy_update_dto
+            ),
+            status_code=200,
+        )
+
+    @delete(
+        "/retention-policies/{team_id}",
+        summary="Delete retention policy of a team",
+        status_code=204,
+    )
+    async def delete_retention_policy(
+        self,
+        *,
+        team_id: Annotated[UUID, Path(...)],
+    ) -> JSONResponse[None]:
+        """Delete the device data retention policy of a team."""
+        await self._device_data_storage_service.delete_retention_policy(team_id=team_id)
+        return JSONResponse.no_content()
+
+    @get(
+        "/connect-log-writer",
+        summary="Get connect log writer metrics",
+        status_code=200,
+        responses={200: {"model": dict[str, float | None]}},
+    )
+    async def get_connect_log_writer_metrics(
+        self,
+    ) -> MsgspecJSONResponse[ConnectLogWriterMetrics]:
+        """
+        Get the queue depth, written, dropped and failed counts, and flush latencies
+        of the background connect log writer of this process.
+        """
+        return MsgspecJSONResponse(content=self._connect_log_writer.metrics(), status_code=200)
@@ -0,0 +1,52 @@
+import numpy as np
+import numpy.typing as npt
+
+
+def lttb_indices(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], max_points: int
+) -> npt.NDArray[np.intp]:
+    """
+    Largest-Triangle-Three-Buckets downsampling, returns the indices of the kept points.
+
+    The first and last points are always kept, the points in between are split into
+    `max_points - 2` buckets. From each bucket the point forming the largest triangle
+    with the previously kept point and the average of the next bucket is kept.
+    `x` must be sorted ascending.
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+
+    # Relative to the first point, epoch timestamps lose precision in the products
+    x = x - x[0]
+
+    # Bucket i spans [edges[i], edges[i + 1]), every bucket holds at least one point
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1 : n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1 : n - 1], edges[:-1] - 1) / counts
+    # The last bucket looks ahead to the last point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    indices = np.empty(max_points, dtype=np.intp)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        # Twice the triangle area of every candidate in the bucket, at once
+        areas = np.abs(
+            (ax - next_x[i]) * (y[start:end] - ay) - (ax - x[start:end]) * (next_y[i] - ay)
+        )
+        a = start + int(np.argmax(areas))
+        indices[i + 1] = a
+
+    return indices
+
+
+def stride_indices(n: int, max_points: int) -> npt.NDArray[np.intp]:
+    """Evenly spaced indices, for values LTTB can't rank such as strings and JSON"""
+    if max_points >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max_points).round().astype(np.intp))
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from app.common.dto import BaseOutDto, PagingDto
+from app.common.dto import BaseOutDto, CursorPagingDto, PagingDto
 from app.database.repository.pagination import Page
 
 from ..constants import ConnectStatus
@@ -27,3 +27,7 @@ class PagingConnectLogDto(PagingDto[ConnectLogDto]):
             page=page.page,
             page_size=page.page_size,
         )
+
+
+class CursorPagingConnectLogDto(CursorPagingDto[ConnectLogDto]):
+    pass
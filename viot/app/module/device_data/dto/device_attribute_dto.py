@@ -1,9 +1,11 @@
 from datetime import datetime
-from typing import Any
+from typing import Annotated, Any
+from uuid import UUID
 
+import msgspec
 from pydantic import BaseModel, Field
 
-from app.common.dto import BaseOutDto
+from app.common.dto import BaseInDto, BaseOutDto
 
 from ..constants import DeviceAttributeScope
 from ..model.device_attribute import DeviceAttribute
@@ -32,3 +34,29 @@ class ScopeKeysDto(BaseModel):
             SHARED_SCOPE={k.key for k in kws if k.scope == DeviceAttributeScope.SHARED_SCOPE},
             CLIENT_SCOPE={k.key for k in kws if k.scope == DeviceAttributeScope.CLIENT_SCOPE},
         )
+
+
+# Attributes written by a single request
+MAX_UPSERT_ATTRIBUTES = 10_000
+
+AttributeKey = Annotated[str, Field(min_length=1, max_length=255)]
+AttributeValue = bool | int | float | str | dict[str, Any] | list[Any]
+
+
+class AttributeUpsertDto(BaseInDto):
+    device_id: UUID
+    key: AttributeKey
+    value: AttributeValue
+
+
+class AttributesUpsertDto(BaseInDto):
+    attributes: list[AttributeUpsertDto] = Field(
+        ..., min_length=1, max_length=MAX_UPSERT_ATTRIBUTES
+    )
+
+
+class AttributeUpsertResult(msgspec.Struct, rename="camel"):
+    device_id: UUID
+    key: str
+    last_update: datetime
+    created: bool
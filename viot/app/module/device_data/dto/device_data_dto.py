@@ -1,14 +1,25 @@
+from collections.abc import Sequence
 from datetime import datetime, timedelta
 from typing import Annotated, Any, NamedTuple, Self
+from uuid import UUID
 
+import msgspec
 from fastapi import Depends
 from pydantic import Field, computed_field, field_validator, model_validator
 
 from app.common.dto import BaseOutDto
 from app.common.dto.base import BaseInDto
-from app.database.repository.pagination import SortDirection
+from app.database.repository.pagination import SortDirection, decode_cursor
+from app.module.device.constants import DeviceType
 
-from ..constants import AggregationType, IntervalType, Timezone
+from ..constants import (
+    AggregationType,
+    ExportFormat,
+    FillType,
+    IntervalType,
+    TimeseriesFormat,
+    Timezone,
+)
 from ..model.device_data import DeviceData
 from ..model.device_data_latest import DeviceDataLatest
 
@@ -23,7 +34,7 @@ def keys_comma_separated_values(value: str) -> set[str]:
 KeySetQuery = Annotated[set[str], Depends(keys_comma_separated_values)]
 
 
-class TimeseriesAggregationQueryDto(BaseInDto):
+class TimeseriesRangeQueryDto(BaseInDto):
     keys__: str = Field(
         alias="keys",
         description="A string value representing the comma-separated list of telemetry keys.",
@@ -36,6 +47,69 @@ class TimeseriesAggregationQueryDto(BaseInDto):
     end_date: datetime = Field(
         alias="endDate", description="A string value representing the end date in ISO format, UTC."
     )
+
+    @computed_field  # type: ignore
+    @property
+    def keys(self) -> set[str]:
+        return keys_comma_separated_values(self.keys__)
+
+    @field_validator("start_date", mode="before")
+    @classmethod
+    def transform_start_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @field_validator("end_date", mode="before")
+    @classmethod
+    def transform_end_date(cls, value: str) -> datetime:
+        return datetime.fromisoformat(value).replace(tzinfo=None)
+
+    @model_validator(mode="after")
+    def validate_dto(self) -> Self:
+        if self.start_date >= self.end_date:
+            raise ValueError("End date must be greater than start date")
+        return self
+
+
+class TimeseriesExportQueryDto(TimeseriesRangeQueryDto):
+    format: ExportFormat = Field(
+        ExportFormat.NDJSON,
+        description="Export format. ndjson (newline-delimited JSON) or csv.",
+    )
+
+
+class TimeseriesPageQueryDto(TimeseriesRangeQueryDto):
+    limit: int = Field(
+        100,
+        alias="limit",
+        description="An integer value that represents a max number of data points per page.",
+        ge=1,
+        le=1000,
+    )
+    order_by: SortDirection = Field(
+        "asc",
+        alias="orderBy",
+        description="Sort order by timestamp. asc (ascending) or desc (descending).",
+    )
+    cursor: str | None = Field(
+        None,
+        description="The `nextCursor` of the previous page. Omit it to fetch the first page.",
+    )
+
+    @property
+    def after(self) -> tuple[datetime, str] | None:
+        if self.cursor is None:
+            return None
+        return decode_cursor(self.cursor, tuple[datetime, str])
+
+    @field_validator("cursor")
+    @classmethod
+    def validate_cursor(cls, value: str | None) -> str | None:
+        if value is not None:
+            decode_cursor(value, tuple[datetime, str])
+        return value
+
+
+class TimeseriesAggregationQueryDto(TimeseriesRangeQueryDto):
     interval_type: IntervalType | None = Field(
         None, alias="intervalType", description="A string value representing the interval type."
     )
@@ -45,11 +119,13 @@ class TimeseriesAggregationQueryDto(BaseInDto):
         description="An integer value representing the interval.",
         ge=0,
     )
-    agg: AggregationType | None = Field(
+    agg: list[AggregationType] | None = Field(
         None,
         alias="agg",
         description=(
-            "A string value representing the aggregation type."
+            "The aggregation types, repeated or comma-separated, e.g. `agg=min,avg,max`."
+            " All of them are computed in a single scan. With more than one aggregation type,"
+            " each series is named `<key>:<agg>`."
             " If the interval type is not provided, the aggregation is not performed."
         ),
     )
@@ -57,8 +133,8 @@ class TimeseriesAggregationQueryDto(BaseInDto):
         100,
         alias="limit",
         description=(
-            "An integer value that represents a max number of timeseries data points to fetch."
-            " This parameter is used only when the `agg` parameter is not provided."
+            "An integer value that represents a max number of timeseries data points to fetch"
+            " per key. This parameter is used only when the `agg` parameter is not provided."
         ),
         ge=0,
         le=500,
@@ -67,16 +143,68 @@ class TimeseriesAggregationQueryDto(BaseInDto):
         None,
         description="A string value representing the timezone.",
     )
+    fill: FillType | None = Field(
+        None,
+        description=(
+            "Fill aggregation buckets without data, so every series holds every bucket of"
+            " the range aligned across keys. null, previous (last value carried forward)"
+            " or linear (interpolated). If not provided, empty buckets are omitted."
+        ),
+    )
     order_by: SortDirection | None = Field(
         None,
         alias="orderBy",
-        description="Sort order. asc (ascending) or desc (descending).",
+        description=(
+            "Sort order. asc (ascending) or desc (descending)."
+            " Raw data points default to desc, the latest data points of each key."
+        ),
+    )
+    format: TimeseriesFormat = Field(
+        TimeseriesFormat.ROWS,
+        description=(
+            "Response format. rows (a list of data points per key) or columnar"
+            " (a list of timestamps and a list of values per key)."
+        ),
+    )
+    max_points: int | None = Field(
+        None,
+        alias="maxPoints",
+        description=(
+            "Downsample the raw data points of each key in the date range to at most this"
+            " many points with Largest-Triangle-Three-Buckets, keeping the visual shape."
+            " Replaces `limit`, can't be combined with `agg`."
+        ),
+        ge=3,
+        le=10000,
     )
 
-    @computed_field  # type: ignore
-    @property
-    def keys(self) -> set[str]:
-        return keys_comma_separated_values(self.keys__)
+    @field_validator("agg", mode="before")
+    @classmethod
+    def split_agg(cls, value: Any) -> Any:
+        if value is None:
+            return None
+        if isinstance(value, str):
+            value = [value]
+        result = list(
+            dict.fromkeys(
+                item.strip() for items in value for item in items.split(",") if item.strip()
+            )
+        )
+        if not result:
+            raise ValueError("At least one aggregation type is required")
+        return result
+
+    @model_validator(mode="after")
+    def validate_max_points(self) -> Self:
+        if self.max_points is not None and self.is_aggregate_query:
+            raise ValueError("maxPoints can't be combined with an aggregation")
+        return self
+
+    @model_validator(mode="after")
+    def validate_fill(self) -> Self:
+        if self.fill is not None and not self.is_aggregate_query:
+            raise ValueError("fill requires an aggregation")
+        return self
 
     @computed_field  # type: ignore
     @property
@@ -102,23 +230,33 @@ class TimeseriesAggregationQueryDto(BaseInDto):
     @computed_field  # type: ignore
     @property
     def is_aggregate_query(self) -> bool:
-        return self.interval > 0 and self.interval_type is not None and self.agg is not None
+        return self.interval > 0 and self.interval_type is not None and bool(self.agg)
 
-    @field_validator("start_date", mode="before")
-    @classmethod
-    def transform_start_date(cls, value: str) -> datetime:
-        return datetime.fromisoformat(value).replace(tzinfo=None)
 
-    @field_validator("end_date", mode="before")
-    @classmethod
-    def transform_end_date(cls, value: str) -> datetime:
-        return datetime.fromisoformat(value).replace(tzinfo=None)
+class FleetLatestQueryDto(BaseInDto):
+    keys: set[str] = Field(
+        ...,
+        description="Telemetry keys to fetch the latest values of.",
+        min_length=1,
+        max_length=100,
+    )
+    device_ids: set[UUID] | None = Field(
+        None,
+        description="Devices to fetch. If not provided, all devices of the team are fetched.",
+        max_length=1000,
+    )
+    device_type: DeviceType | None = Field(
+        None, description="Only fetch devices of this type. 0: DEVICE, 1: GATEWAY, 2: SUB_DEVICE"
+    )
 
-    @model_validator(mode="after")
-    def validate_dto(self) -> Self:
-        if self.start_date >= self.end_date:
-            raise ValueError("End date must be greater than start date")
-        return self
+
+class FleetLatestColumns(msgspec.Struct, rename="camel"):
+    """Latest values of many devices, one array entry per (device, key)"""
+
+    device_ids: list[UUID] = msgspec.field(default_factory=list)
+    keys: list[str] = msgspec.field(default_factory=list)
+    ts: list[datetime] = msgspec.field(default_factory=list)
+    values: list[Any] = msgspec.field(default_factory=list)
 
 
 class LatestDataPointDto(BaseOutDto):
@@ -133,7 +271,14 @@ class LatestDataPointDto(BaseOutDto):
 
 class AggregatedData(NamedTuple):
     ts: datetime
-    value: int | float | str | bool | dict[str, Any]
+    value: int | float | str | bool | dict[str, Any] | None
+
+
+class TimeseriesColumns(msgspec.Struct):
+    """Columnar timeseries of a key, encoded by msgspec without pydantic models"""
+
+    ts: list[datetime] = msgspec.field(default_factory=list)
+    values: list[Any] = msgspec.field(default_factory=list)
 
 
 class DataPointDto(BaseOutDto):
@@ -143,3 +288,49 @@ class DataPointDto(BaseOutDto):
     @classmethod
     def from_model(cls, model: DeviceData | AggregatedData) -> "DataPointDto":
         return cls(ts=model.ts, value=model.value)
+
+
+class DeviceDataKeyStatsDto(BaseOutDto):
+    key: str
+    count: int
+    first_ts: datetime
+    last_ts: datetime
+    min_value: int | float | None = Field(description="Minimum of the numeric values")
+    max_value: int | float | None = Field(description="Maximum of the numeric values")
+
+    @classmethod
+    def from_row(cls, row: Any) -> "DeviceDataKeyStatsDto":
+        return cls(
+            key=row.key,
+            count=row.count,
+            first_ts=row.first_ts,
+            last_ts=row.last_ts,
+            min_value=min(
+                (v for v in (row.min_long, row.min_double) if v is not None), default=None
+            ),
+            max_value=max(
+                (v for v in (row.max_long, row.max_double) if v is not None), default=None
+            ),
+        )
+
+
+class DeviceDataStatsDto(BaseOutDto):
+    count: int
+    first_ts: datetime | None
+    last_ts: datetime | None
+    keys: list[DeviceDataKeyStatsDto]
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "DeviceDataStatsDto":
+        keys = [DeviceDataKeyStatsDto.from_row(row) for row in rows]
+        return cls(
+            count=sum(k.count for k in keys),
+            first_ts=min((k.first_ts for k in keys), default=None),
+            last_ts=max((k.last_ts for k in keys), default=None),
+            keys=keys,
+        )
+
+
+class TimeseriesPageDto(BaseOutDto):
+    data: dict[str, list[DataPointDto]]
+    next_cursor: str | None
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import Annotated, Any
+from uuid import UUID
+
+import msgspec
+
+from app.common.dto import BaseOutDto
+
+
+class TelemetryRecord(msgspec.Struct, rename="camel", forbid_unknown_fields=True):
+    """Data points of a device at a timestamp, `data` maps keys to values"""
+
+    device_id: UUID
+    ts: Annotated[datetime, msgspec.Meta(tz=True)]
+    data: dict[Annotated[str, msgspec.Meta(min_length=1)], Any]
+
+
+class IngestResultDto(BaseOutDto):
+    records: int
+    data_points: int
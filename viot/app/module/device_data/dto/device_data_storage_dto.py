@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+from pydantic import Field, computed_field
+
+from app.common.dto import BaseInDto, BaseOutDto
+
+from ..model.device_data_retention_policy import DeviceDataRetentionPolicy
+
+_ONE_HOUR = timedelta(hours=1)
+_ONE_DAY = timedelta(days=1)
+
+
+class DeviceDataStoragePolicyDto(BaseOutDto):
+    chunk_time_interval_hours: int
+    compress_after_days: int | None
+    drop_after_days: int | None
+
+    @classmethod
+    def from_row(
+        cls,
+        chunk_time_interval: timedelta,
+        compress_after: timedelta | None,
+        drop_after: timedelta | None,
+    ) -> "DeviceDataStoragePolicyDto":
+        return cls(
+            chunk_time_interval_hours=chunk_time_interval // _ONE_HOUR,
+            compress_after_days=None if compress_after is None else compress_after // _ONE_DAY,
+            drop_after_days=None if drop_after is None else drop_after // _ONE_DAY,
+        )
+
+
+class DeviceDataStoragePolicyUpdateDto(BaseInDto):
+    """Omitted fields are left unchanged, null removes the compression or retention policy"""
+
+    chunk_time_interval_hours: int | None = Field(
+        default=None,
+        ge=1,
+        le=24 * 365,
+        description="Time range of each chunk, only applies to chunks created afterwards",
+    )
+    compress_after_days: int | None = Field(
+        default=None, ge=1, description="Compress chunks older than this, null to disable"
+    )
+    drop_after_days: int | None = Field(
+        default=None,
+        ge=1,
+        description="Drop chunks of all teams older than this, null to disable",
+    )
+
+
+class DeviceDataStorageStatsDto(BaseOutDto):
+    total_chunks: int
+    compressed_chunks: int
+    before_compression_bytes: int
+    after_compression_bytes: int
+    total_bytes: int
+
+    @computed_field  # type: ignore
+    @property
+    def compression_ratio(self) -> float | None:
+        if not self.after_compression_bytes:
+            return None
+        return round(self.before_compression_bytes / self.after_compression_bytes, 2)
+
+    @classmethod
+    def from_row(cls, row: Any) -> "DeviceDataStorageStatsDto":
+        return cls.model_validate(row._asdict())
+
+
+class RetentionPolicyUpdateDto(BaseInDto):
+    retention_days: int = Field(..., ge=1, le=36500)
+
+
+class RetentionPolicyDto(BaseOutDto):
+    team_id: UUID
+    retention_days: int
+    created_at: datetime
+    updated_at: datetime | None
+
+    @classmethod
+    def from_model(cls, policy: DeviceDataRetentionPolicy) -> "RetentionPolicyDto":
+        return cls.model_validate(policy)
@@ -0,0 +1,6 @@
+from app.common.exception import BadRequestException
+
+
+class InvalidConnectLogCursorException(BadRequestException):
+    def __init__(self) -> None:
+        super().__init__(message="Invalid connect log cursor")
@@ -0,0 +1,8 @@
+from app.common.exception import BadRequestException
+
+from ..constants import DeviceAttributeScope
+
+
+class AttributeScopeNotWritableException(BadRequestException):
+    def __init__(self, scope: DeviceAttributeScope) -> None:
+        super().__init__(message=f"Attributes of scope {scope.name} are written by the device")
@@ -0,0 +1,16 @@
+from app.common.exception import BadRequestException
+
+
+class InvalidTelemetryException(BadRequestException):
+    def __init__(self, reason: str) -> None:
+        super().__init__(message=f"Invalid telemetry records: {reason}")
+
+
+class UnsupportedIngestFormatException(BadRequestException):
+    def __init__(self, content_type: str) -> None:
+        super().__init__(message=f"Unsupported ingestion content type {content_type!r}")
+
+
+class TooManyDataPointsException(BadRequestException):
+    def __init__(self, max_data_points: int) -> None:
+        super().__init__(message=f"A request can hold at most {max_data_points} data points")
@@ -0,0 +1,8 @@
+from uuid import UUID
+
+from app.common.exception import NotFoundException
+
+
+class RetentionPolicyNotFoundException(NotFoundException):
+    def __init__(self, team_id: UUID) -> None:
+        super().__init__(message=f"Retention policy of team {team_id} not found")
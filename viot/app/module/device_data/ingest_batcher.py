@@ -0,0 +1,85 @@
+import asyncio
+from collections.abc import Sequence
+
+from injector import inject
+
+from .config import device_data_settings
+from .repository.device_data_ingest_repository import DeviceDataIngestRepository, IngestRow
+
+# Rows of a submitter, and the future resolved with the rows that were inserted
+_Submission = tuple[Sequence[IngestRow], asyncio.Future[list[IngestRow]]]
+
+
+class DeviceDataIngestBatcher:
+    """
+    Coalesces the rows of concurrent ingestion requests into a single COPY.
+
+    The first rows submitted open a batch that is written `INGEST_BATCH_WINDOW_MS` later,
+    or as soon as it holds `INGEST_BATCH_MAX_ROWS` rows. Every submitter waits until its
+    batch is committed. When a batch fails, the rows of each submitter are written on
+    their own, so a submitter only gets the error caused by its own rows.
+    """
+
+    @inject
+    def __init__(self, device_data_ingest_repository: DeviceDataIngestRepository) -> None:
+        self._device_data_ingest_repository = device_data_ingest_repository
+        self._window_sec = device_data_settings.INGEST_BATCH_WINDOW_MS / 1000
+        self._max_rows = device_data_settings.INGEST_BATCH_MAX_ROWS
+        self._submissions: list[_Submission] = []
+        self._row_count = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._writes: set[asyncio.Task[None]] = set()
+
+    async def submit(self, rows: Sequence[IngestRow]) -> list[IngestRow]:
+        """
+        Add the rows to the open batch and wait until the batch is written. Returns the
+        rows that were inserted, rows that already existed are left out.
+        """
+        loop = asyncio.get_running_loop()
+        waiter: asyncio.Future[list[IngestRow]] = loop.create_future()
+        self._submissions.append((rows, waiter))
+        self._row_count += len(rows)
+
+        if self._window_sec <= 0 or self._row_count >= self._max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window_sec, self._flush)
+
+        return await waiter
+
+    async def drain(self) -> None:
+        """Write the open batch and wait for all writes in flight, called on shutdown"""
+        if self._submissions:
+            self._flush()
+        await asyncio.gather(*self._writes, return_exceptions=True)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        submissions = self._submissions
+        self._submissions, self._row_count = [], 0
+
+        task = asyncio.create_task(self._write(submissions))
+        self._writes.add(task)
+        task.add_done_callback(self._writes.discard)
+
+    async def _write(self, submissions: list[_Submission]) -> None:
+        try:
+            inserted = await self._device_data_ingest_repository.insert_rows(
+                [row for rows, _ in submissions for row in rows]
+            )
+        except Exception as e:
+            if len(submissions) > 1:
+                for submission in submissions:
+                    await self._write([submission])
+                return
+            _, waiter = submissions[0]
+            if not waiter.done():
+                waiter.set_exception(e)
+            return
+
+        for rows, waiter in submissions:
+            if not waiter.done():
+                waiter.set_result([row for row in rows if row in inserted])
@@ -1,12 +1,63 @@
-from collections.abc import Sequence
-from typing import Any
+from collections.abc import Callable, Collection, Sequence
+from itertools import groupby
+from operator import attrgetter
+from typing import Any, TypeVar
 
+import msgspec
 from sqlalchemy import Row
 
+from .constants import AggregationType
 from .dto.device_data_dto import AggregatedData
 
+T = TypeVar("T")
+
+# (bool_v, str_v, long_v, double_v, json_v), json_v is JSON text
+TypedColumns = tuple[bool | None, str | None, int | None, float | None, str | None]
+
+_BIGINT_MIN, _BIGINT_MAX = -(2**63), 2**63 - 1
+
+
+class TypedValueMapper:
+    @staticmethod
+    def to_columns(value: Any) -> TypedColumns:
+        """
+        Split a value into the typed value columns, the inverse of `DeviceData.value`.
+        Integers out of the BIGINT range are stored as doubles.
+        """
+        # bool before int, bool is a subclass of int
+        if isinstance(value, bool):
+            return (value, None, None, None, None)
+        if isinstance(value, int):
+            if _BIGINT_MIN <= value <= _BIGINT_MAX:
+                return (None, None, value, None, None)
+            return (None, None, None, float(value), None)
+        if isinstance(value, float):
+            return (None, None, None, value, None)
+        if isinstance(value, str):
+            return (None, value, None, None, None)
+        return (None, None, None, None, msgspec.json.encode(value).decode())
+
 
 class AggregatedDataMapper:
+    @staticmethod
+    def map_rows_by_key(
+        rows: Sequence[Row[Any]],
+        keys: Collection[str],
+        convert_method: Callable[[Sequence[Row[Any]]], T],
+    ) -> dict[str, T]:
+        """
+        Split rows of a multi-key aggregation query per key and convert each group.
+
+        Rows must be ordered by key. Keys without any row are mapped to the conversion
+        of no rows, an empty list.
+        """
+        data: dict[str, T] = {key: convert_method([]) for key in keys}
+
+        for key, key_rows in groupby(rows, key=attrgetter("key")):
+            data[key] = convert_method(list(key_rows))
+
+        return data
+
     @staticmethod
     def map_from_avg_rows(rows: Sequence[Row[Any]]) -> list[AggregatedData]:
         data: list[AggregatedData] = []
@@ -84,3 +135,69 @@ class AggregatedDataMapper:
             data.append(AggregatedData(ts=row.bucket + row.interval / 2, value=total_count))
 
         return data
+
+    @staticmethod
+    def map_from_combined_rows(
+        rows: Sequence[Row[Any]], aggregation_types: Collection[AggregationType]
+    ) -> dict[AggregationType, list[AggregatedData]]:
+        """
+        Map rows of the combined query to one series per aggregation type,
+        with the same values as the single aggregation mappers.
+        """
+        data: dict[AggregationType, list[AggregatedData]] = {
+            aggregation_type: [] for aggregation_type in aggregation_types
+        }
+
+        for row in rows:
+            ts = row.bucket + row.interval / 2
+
+            sum_value: float = 0.0
+            if row.sum_long:
+                sum_value += row.sum_long
+            if row.sum_double:
+                sum_value += row.sum_double
+
+            for aggregation_type, series in data.items():
+                value: int | float
+                if aggregation_type == AggregationType.AVG:
+                    total_count: int = row.count_long_value + row.count_double_value
+                    value = sum_value / total_count if total_count > 0 else 0.0
+                elif aggregation_type == AggregationType.SUM:
+                    value = sum_value
+                elif aggregation_type == AggregationType.MIN:
+                    value = min(row.min_long, row.min_double)
+                elif aggregation_type == AggregationType.MAX:
+                    value = max(row.max_long, row.max_double)
+                elif row.count_bool_value != 0:
+                    value = row.count_bool_value
+                elif row.count_str_value != 0:
+                    value = row.count_str_value
+                elif row.count_json_value != 0:
+                    value = row.count_json_value
+                else:
+                    value = row.count_long_value + row.count_double_value
+
+                series.append(AggregatedData(ts=ts, value=value))
+
+        return data
+
+    @staticmethod
+    def map_from_filled_rows(
+        rows: Sequence[Row[Any]], aggregation_types: Collection[AggregationType]
+    ) -> dict[AggregationType, list[AggregatedData]]:
+        """
+        Map rows of the gap-filled query to one series per aggregation type.
+        The values are final, buckets without data and without fill are None.
+        """
+        data: dict[AggregationType, list[AggregatedData]] = {
+            aggregation_type: [] for aggregation_type in aggregation_types
+        }
+
+        for row in rows:
+            ts = row.bucket + row.interval / 2
+            for aggregation_type, series in data.items():
+                series.append(
+                    AggregatedData(ts=ts, value=getattr(row, f"{aggregation_type}_value"))
+                )
+
+        return data
@@ -0,0 +1,18 @@
+from uuid import UUID
+
+from sqlalchemy import INTEGER, ForeignKey
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.database.base import Base
+from app.database.mixin import DateTimeMixin
+
+
+class DeviceDataRetentionPolicy(Base, DateTimeMixin):
+    """Retention window of the device data of a team, enforced by a TimescaleDB job"""
+
+    __tablename__ = "device_data_retention_policies"
+
+    team_id: Mapped[UUID] = mapped_column(
+        ForeignKey("teams.id", ondelete="CASCADE"), primary_key=True
+    )
+    retention_days: Mapped[int] = mapped_column(INTEGER)
@@ -1,14 +1,29 @@
 from injector import Binder, Module, SingletonScope
 
+from .cache.device_data_aggregation_cache import DeviceDataAggregationCache
+from .cache.device_data_latest_cache import DeviceDataLatestCache
+from .connect_log_writer import ConnectLogWriter
 from .controller.connect_log_controller import ConnectLogController
 from .controller.device_data_controller import DeviceDataController
+from .controller.device_data_storage_controller import DeviceDataStorageController
+from .ingest_batcher import DeviceDataIngestBatcher
+from .repository.connect_log_batch_repository import ConnectLogBatchRepository
 from .repository.device_attribute_repository import DeviceAttributeRepository
 from .repository.device_data_aggregation_repository import DeviceDataAggregationRepository
+from .repository.device_data_export_repository import DeviceDataExportRepository
+from .repository.device_data_ingest_repository import DeviceDataIngestRepository
 from .repository.device_data_latest_repository import DeviceDataLatestRepository
 from .repository.device_data_repository import DeviceDataRepository
+from .repository.device_data_retention_policy_repository import (
+    DeviceDataRetentionPolicyRepository,
+)
+from .repository.device_data_storage_repository import DeviceDataStorageRepository
 from .service.connect_log_service import ConnectLogService
 from .service.device_attribute_service import DeviceAttributeService
+from .service.device_data_export_service import DeviceDataExportService
+from .service.device_data_ingest_service import DeviceDataIngestService
 from .service.device_data_service import DeviceDataService
+from .service.device_data_storage_service import DeviceDataStorageService
 
 
 class DeviceDataModule(Module):
@@ -21,10 +36,32 @@ class DeviceDataModule(Module):
             to=DeviceDataAggregationRepository,
             scope=SingletonScope,
         )
+        binder.bind(DeviceDataExportRepository, to=DeviceDataExportRepository, scope=SingletonScope)
+        binder.bind(DeviceDataIngestRepository, to=DeviceDataIngestRepository, scope=SingletonScope)
+        binder.bind(
+            DeviceDataStorageRepository, to=DeviceDataStorageRepository, scope=SingletonScope
+        )
+        binder.bind(
+            DeviceDataRetentionPolicyRepository,
+            to=DeviceDataRetentionPolicyRepository,
+            scope=SingletonScope,
+        )
+
+        binder.bind(DeviceDataLatestCache, to=DeviceDataLatestCache, scope=SingletonScope)
+        binder.bind(DeviceDataAggregationCache, to=DeviceDataAggregationCache, scope=SingletonScope)
+        binder.bind(DeviceDataIngestBatcher, to=DeviceDataIngestBatcher, scope=SingletonScope)
+        binder.bind(ConnectLogBatchRepository, to=ConnectLogBatchRepository, scope=SingletonScope)
+        binder.bind(ConnectLogWriter, to=ConnectLogWriter, scope=SingletonScope)
 
         binder.bind(DeviceDataService, to=DeviceDataService, scope=SingletonScope)
+        binder.bind(DeviceDataExportService, to=DeviceDataExportService, scope=SingletonScope)
+        binder.bind(DeviceDataIngestService, to=DeviceDataIngestService, scope=SingletonScope)
         binder.bind(DeviceAttributeService, to=DeviceAttributeService, scope=SingletonScope)
         binder.bind(ConnectLogService, to=ConnectLogService, scope=SingletonScope)
+        binder.bind(DeviceDataStorageService, to=DeviceDataStorageService, scope=SingletonScope)
 
         binder.bind(DeviceDataController, to=DeviceDataController, scope=SingletonScope)
         binder.bind(ConnectLogController, to=ConnectLogController, scope=SingletonScope)
+        binder.bind(
+            DeviceDataStorageController, to=DeviceDataStorageController, scope=SingletonScope
+        )
@@ -0,0 +1,25 @@
+from collections.abc import Sequence
+from typing import Any
+
+from injector import inject
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..model.connect_log import ConnectLog
+
+
+class ConnectLogBatchRepository:
+    """
+    Writes batches of connect logs collected from many requests, so it uses its own
+    connection and transaction instead of the request-scoped session.
+    """
+
+    @inject
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def insert_many(self, rows: Sequence[dict[str, Any]]) -> None:
+        """Insert the rows in one statement, rows that already exist are skipped"""
+        stmt = insert(ConnectLog).values(list(rows)).on_conflict_do_nothing()
+        async with self._engine.begin() as conn:
+            await conn.execute(stmt)
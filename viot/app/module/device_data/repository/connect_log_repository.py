@@ -1,14 +1,59 @@
+from collections.abc import Sequence
 from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import and_, delete
+from sqlalchemy import ColumnElement, and_, delete, func, select
 
 from app.database.repository import PageableRepository
+from app.database.repository.pagination import SortDirection
 
 from ..model.connect_log import ConnectLog
 
 
 class ConnectLogRepository(PageableRepository[ConnectLog, tuple[UUID, datetime]]):
+    async def find_page_by_device_id(
+        self,
+        *,
+        device_id: UUID,
+        start_date: datetime | None,
+        end_date: datetime | None,
+        limit: int,
+        order_by: SortDirection = "desc",
+        after: datetime | None = None,
+    ) -> Sequence[ConnectLog]:
+        """
+        Find a page of connect logs ordered by timestamp, starting right after `after`.
+
+        (device_id, ts) is the primary key, so every page is a range scan of its index
+        no matter how deep it is.
+        """
+        conditions = self._device_id_and_date_range_conditions(device_id, start_date, end_date)
+        if after is not None:
+            conditions.append(ConnectLog.ts > after if order_by == "asc" else ConnectLog.ts < after)
+
+        stmt = (
+            select(ConnectLog)
+            .where(and_(*conditions))
+            .order_by(ConnectLog.ts.asc() if order_by == "asc" else ConnectLog.ts.desc())
+            .limit(limit)
+        )
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def count_by_device_id(
+        self,
+        *,
+        device_id: UUID,
+        start_date: datetime | None,
+        end_date: datetime | None,
+        cap: int,
+    ) -> int:
+        """Count the connect logs in the date range, counting stops at `cap` + 1"""
+        conditions = self._device_id_and_date_range_conditions(device_id, start_date, end_date)
+        capped = select(ConnectLog.ts).where(and_(*conditions)).limit(cap + 1).subquery()
+        stmt = select(func.count()).select_from(capped)
+        return (await self.session.execute(stmt)).scalar_one()
+
     async def delete_by_device_id_and_date_range(
         self,
         *,
@@ -16,11 +61,17 @@ class ConnectLogRepository(PageableRepository[ConnectLog, tuple[UUID, datetime]]
         start_date: datetime | None,
         end_date: datetime | None,
     ) -> None:
-        conditions = [ConnectLog.device_id == device_id]
+        conditions = self._device_id_and_date_range_conditions(device_id, start_date, end_date)
+
+        stmt = delete(ConnectLog).where(and_(*conditions))
+        await self.session.execute(stmt)
+
+    def _device_id_and_date_range_conditions(
+        self, device_id: UUID, start_date: datetime | None, end_date: datetime | None
+    ) -> list[ColumnElement[Any]]:
+        conditions: list[ColumnElement[Any]] = [ConnectLog.device_id == device_id]
         if start_date:
             conditions.append(ConnectLog.ts >= start_date)
         if end_date:
             conditions.append(ConnectLog.ts <= end_date)
-
-        stmt = delete(ConnectLog).where(and_(*conditions))
-        await self.session.execute(stmt)
+        return conditions
@@ -1,13 +1,16 @@
 from collections.abc import Sequence
+from datetime import datetime
 from typing import NamedTuple
 from uuid import UUID
 
-from sqlalchemy import delete, select
+from sqlalchemy import delete, select, text
 
 from app.database.repository import AsyncSqlalchemyRepository
 
 from ..constants import DeviceAttributeScope
+from ..mapper import TypedColumns
 from ..model.device_attribute import DeviceAttribute
+from ..sql_queries import UPSERT_ATTRIBUTES_QUERY
 
 
 class KeyWithScope(NamedTuple):
@@ -15,6 +18,19 @@ class KeyWithScope(NamedTuple):
     scope: DeviceAttributeScope
 
 
+class AttributeRow(NamedTuple):
+    device_id: UUID
+    key: str
+    columns: TypedColumns
+
+
+class UpsertedAttribute(NamedTuple):
+    device_id: UUID
+    key: str
+    last_update: datetime
+    created: bool
+
+
 class DeviceAttributeRepository(AsyncSqlalchemyRepository):
     async def find_all_key_with_scope_by_device_id(self, device_id: UUID) -> list[KeyWithScope]:
         stmt = select(DeviceAttribute.key, DeviceAttribute.scope).where(
@@ -51,3 +67,31 @@ class DeviceAttributeRepository(AsyncSqlalchemyRepository):
             .where(DeviceAttribute.key.in_(keys))
         )
         await self.session.execute(stmt)
+
+    async def upsert_many(
+        self, scope: DeviceAttributeScope, rows: Sequence[AttributeRow]
+    ) -> list[UpsertedAttribute]:
+        """
+        Insert or replace the attributes in a single statement, the rows are sent as
+        one array per column. A (device_id, key) pair must not appear twice.
+        """
+        if not rows:
+            return []
+
+        bool_vs, str_vs, long_vs, double_vs, json_vs = zip(
+            *(row.columns for row in rows), strict=True
+        )
+        result = await self.session.execute(
+            text(UPSERT_ATTRIBUTES_QUERY),
+            {
+                "scope": int(scope),
+                "device_ids": [row.device_id for row in rows],
+                "keys": [row.key for row in rows],
+                "bool_vs": list(bool_vs),
+                "str_vs": list(str_vs),
+                "long_vs": list(long_vs),
+                "double_vs": list(double_vs),
+                "json_vs": list(json_vs),
+            },
+        )
+        return [UpsertedAttribute(*row) for row in result]
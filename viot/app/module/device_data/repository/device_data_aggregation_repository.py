@@ -1,24 +1,49 @@
-from collections.abc import Callable, Sequence
-from datetime import datetime, timedelta
-from typing import Any
+from collections.abc import Callable, Collection, Sequence
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any, TypeVar
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
 from sqlalchemy import Row, text
 
 from app.database.repository import AsyncSqlalchemyRepository
 
-from ..constants import AggregationType, Timezone
+from ..constants import AggregationType, DeviceDataRollup, FillType, Timezone
 from ..dto.device_data_dto import AggregatedData
 from ..mapper import AggregatedDataMapper
 from ..sql_queries import (
+    FILL_AVG_VALUE,
+    FILL_COUNT_VALUE,
+    FILL_MAX_VALUE,
+    FILL_MIN_VALUE,
+    FILL_QUERY,
+    FILL_SUM_VALUE,
     FIND_AVG_QUERY,
+    FIND_COMBINED_QUERY,
     FIND_COUNT_QUERY,
     FIND_MAX_QUERY,
     FIND_MIN_QUERY,
+    FIND_STATS_QUERY,
     FIND_SUM_QUERY,
     FROM_WHERE_CLAUSE,
+    ROLLUP_FILL_AVG_VALUE,
+    ROLLUP_FILL_COUNT_VALUE,
+    ROLLUP_FILL_MAX_VALUE,
+    ROLLUP_FILL_MIN_VALUE,
+    ROLLUP_FILL_QUERY,
+    ROLLUP_FILL_SUM_VALUE,
+    ROLLUP_FIND_AVG_QUERY,
+    ROLLUP_FIND_COMBINED_QUERY,
+    ROLLUP_FIND_COUNT_QUERY,
+    ROLLUP_FIND_MAX_QUERY,
+    ROLLUP_FIND_MIN_QUERY,
+    ROLLUP_FIND_SUM_QUERY,
+    ROLLUP_FROM_WHERE_CLAUSE,
 )
 
+T = TypeVar("T")
+
 QUERY_MAP: dict[AggregationType, str] = {
     AggregationType.AVG: FIND_AVG_QUERY,
     AggregationType.MAX: FIND_MAX_QUERY,
@@ -26,6 +51,32 @@ QUERY_MAP: dict[AggregationType, str] = {
     AggregationType.SUM: FIND_SUM_QUERY,
     AggregationType.COUNT: FIND_COUNT_QUERY,
 }
+ROLLUP_QUERY_MAP: dict[AggregationType, str] = {
+    AggregationType.AVG: ROLLUP_FIND_AVG_QUERY,
+    AggregationType.MAX: ROLLUP_FIND_MAX_QUERY,
+    AggregationType.MIN: ROLLUP_FIND_MIN_QUERY,
+    AggregationType.SUM: ROLLUP_FIND_SUM_QUERY,
+    AggregationType.COUNT: ROLLUP_FIND_COUNT_QUERY,
+}
+FILL_VALUE_MAP: dict[AggregationType, str] = {
+    AggregationType.AVG: FILL_AVG_VALUE,
+    AggregationType.MAX: FILL_MAX_VALUE,
+    AggregationType.MIN: FILL_MIN_VALUE,
+    AggregationType.SUM: FILL_SUM_VALUE,
+    AggregationType.COUNT: FILL_COUNT_VALUE,
+}
+ROLLUP_FILL_VALUE_MAP: dict[AggregationType, str] = {
+    AggregationType.AVG: ROLLUP_FILL_AVG_VALUE,
+    AggregationType.MAX: ROLLUP_FILL_MAX_VALUE,
+    AggregationType.MIN: ROLLUP_FILL_MIN_VALUE,
+    AggregationType.SUM: ROLLUP_FILL_SUM_VALUE,
+    AggregationType.COUNT: ROLLUP_FILL_COUNT_VALUE,
+}
+FILL_FUNCTION_MAP: dict[FillType, str] = {
+    FillType.NULL: "{}",
+    FillType.PREVIOUS: "locf({})",
+    FillType.LINEAR: "interpolate({})",
+}
 CONVERT_METHOD_MAP: dict[AggregationType, Callable[[Sequence[Row[Any]]], list[AggregatedData]]] = {
     AggregationType.AVG: AggregatedDataMapper.map_from_avg_rows,
     AggregationType.MAX: AggregatedDataMapper.map_from_max_rows,
@@ -34,6 +85,9 @@ CONVERT_METHOD_MAP: dict[AggregationType, Callable[[Sequence[Row[Any]]], list[Ag
     AggregationType.COUNT: AggregatedDataMapper.map_from_count_rows,
 }
 
+# Default origin of time_bucket_gapfill, in the local time of the timezone
+GAPFILL_ORIGIN = datetime(2000, 1, 3)
+
 
 class DeviceDataAggregationRepository(AsyncSqlalchemyRepository):
     async def find_aggregation(
@@ -46,29 +100,197 @@ class DeviceDataAggregationRepository(AsyncSqlalchemyRepository):
         end_date: datetime,
         bucket_width: timedelta,
         timezone: Timezone,
+        rollup: DeviceDataRollup | None = None,
     ) -> list[AggregatedData]:
-        query = QUERY_MAP[aggregation_type]
+        data = await self.find_aggregation_by_keys(
+            aggregation_type=aggregation_type,
+            device_id=device_id,
+            keys=[key],
+            start_date=start_date,
+            end_date=end_date,
+            bucket_width=bucket_width,
+            timezone=timezone,
+            rollup=rollup,
+        )
+        return data[key]
+
+    async def find_aggregation_by_keys(
+        self,
+        *,
+        aggregation_type: AggregationType,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        bucket_width: timedelta,
+        timezone: Timezone,
+        rollup: DeviceDataRollup | None = None,
+    ) -> dict[str, list[AggregatedData]]:
+        """
+        Aggregate all keys in a single query, rows are grouped by (key, bucket)
+        and split per key. Keys without data are mapped to an empty list.
+
+        When a rollup is given, the continuous aggregate is re-bucketed instead of
+        the raw device_data rows. The caller is responsible for choosing a rollup
+        whose buckets align with the requested ones.
+        """
+        if rollup is None:
+            query = QUERY_MAP[aggregation_type] + FROM_WHERE_CLAUSE
+        else:
+            query = (ROLLUP_QUERY_MAP[aggregation_type] + ROLLUP_FROM_WHERE_CLAUSE).format(
+                rollup=rollup
+            )
         convert_method = CONVERT_METHOD_MAP[aggregation_type]
 
         return await self._execute(
             query,
             {
                 "device_id": device_id,
-                "key": key,
+                "keys": list(keys),
                 "start_date": start_date,
                 "end_date": end_date,
                 "bucket_width": bucket_width,
                 "timezone": timezone,
             },
+            keys,
             convert_method,
         )
 
+    async def find_aggregations_by_keys(
+        self,
+        *,
+        aggregation_types: Collection[AggregationType],
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        bucket_width: timedelta,
+        timezone: Timezone,
+        rollup: DeviceDataRollup | None = None,
+    ) -> dict[str, dict[AggregationType, list[AggregatedData]]]:
+        """
+        Same as `find_aggregation_by_keys`, but computes several aggregation types
+        of all keys in a single scan, one series per (key, aggregation type).
+        """
+        if rollup is None:
+            query = FIND_COMBINED_QUERY + FROM_WHERE_CLAUSE
+        else:
+            query = (ROLLUP_FIND_COMBINED_QUERY + ROLLUP_FROM_WHERE_CLAUSE).format(rollup=rollup)
+
+        return await self._execute(
+            query,
+            {
+                "device_id": device_id,
+                "keys": list(keys),
+                "start_date": start_date,
+                "end_date": end_date,
+                "bucket_width": bucket_width,
+                "timezone": timezone,
+            },
+            keys,
+            partial(
+                AggregatedDataMapper.map_from_combined_rows, aggregation_types=aggregation_types
+            ),
+        )
+
+    async def find_filled_aggregations_by_keys(
+        self,
+        *,
+        aggregation_types: Collection[AggregationType],
+        fill: FillType,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        bucket_width: timedelta,
+        timezone: Timezone,
+        rollup: DeviceDataRollup | None = None,
+    ) -> dict[str, dict[AggregationType, list[AggregatedData]]]:
+        """
+        Same as `find_aggregations_by_keys`, but every series holds every bucket of the
+        range, buckets without data are filled by TimescaleDB gapfill. Keys without
+        any data get series of None on the same buckets, so all series are aligned.
+        """
+        if rollup is None:
+            value_map, template = FILL_VALUE_MAP, FILL_QUERY
+        else:
+            value_map, template = ROLLUP_FILL_VALUE_MAP, ROLLUP_FILL_QUERY
+        values = ",\n        ".join(
+            f"{FILL_FUNCTION_MAP[fill].format(value_map[aggregation_type])}"
+            f" AS {aggregation_type}_value"
+            for aggregation_type in aggregation_types
+        )
+        query = template.format(values=values.format(rollup=rollup), rollup=rollup)
+
+        data = await self._execute(
+            query,
+            {
+                "device_id": device_id,
+                "keys": list(keys),
+                "start_date": start_date,
+                "end_date": end_date,
+                "bucket_width": bucket_width,
+                "bucket_offset": self._gapfill_offset(start_date, bucket_width, timezone),
+                "timezone": timezone,
+            },
+            keys,
+            partial(AggregatedDataMapper.map_from_filled_rows, aggregation_types=aggregation_types),
+        )
+
+        timestamps = next(
+            (
+                [d.ts for d in series]
+                for series_by_agg in data.values()
+                for series in series_by_agg.values()
+                if series
+            ),
+            None,
+        )
+        if timestamps is None:
+            timestamps = self._bucket_timestamps(start_date, end_date, bucket_width)
+        for series_by_agg in data.values():
+            for aggregation_type, series in series_by_agg.items():
+                if not series:
+                    series_by_agg[aggregation_type] = [
+                        AggregatedData(ts=ts, value=None) for ts in timestamps
+                    ]
+
+        return data
+
+    async def find_stats_by_device_id(self, device_id: UUID) -> Sequence[Row[Any]]:
+        """
+        Returns (key, count, first_ts, last_ts, min_long, min_double, max_long, max_double)
+        rows, one per key of the device, read from the daily rollup. History older than the
+        refresh policy windows is materialized by the rollup backfill migration, real-time
+        aggregation covers the data that isn't materialized yet.
+        """
+        stmt = text(FIND_STATS_QUERY.format(rollup=DeviceDataRollup.ONE_DAY))
+        return (await self.session.execute(stmt, {"device_id": device_id})).fetchall()
+
+    @staticmethod
+    def _gapfill_offset(
+        start_date: datetime, bucket_width: timedelta, timezone: Timezone
+    ) -> timedelta:
+        """Shift that aligns the gapfill buckets to `start_date` in the local time"""
+        local_start = start_date.replace(tzinfo=UTC).astimezone(ZoneInfo(timezone))
+        return (local_start.replace(tzinfo=None) - GAPFILL_ORIGIN) % bucket_width
+
+    @staticmethod
+    def _bucket_timestamps(
+        start_date: datetime, end_date: datetime, bucket_width: timedelta
+    ) -> list[datetime]:
+        """Bucket timestamps of a range without any data, same as the mapped rows"""
+        start = start_date.replace(tzinfo=UTC)
+        count = -(-(end_date - start_date) // bucket_width)
+        return [start + bucket_width * i + bucket_width / 2 for i in range(count)]
+
     async def _execute(
         self,
         query: str,
         params: dict[str, Any],
-        convert_method: Callable[[Sequence[Row[Any]]], list[AggregatedData]],
-    ) -> list[AggregatedData]:
-        stmt = text(query + FROM_WHERE_CLAUSE)
+        keys: Collection[str],
+        convert_method: Callable[[Sequence[Row[Any]]], T],
+    ) -> dict[str, T]:
+        stmt = text(query)
         rows = (await self.session.execute(stmt, params)).fetchall()
-        return convert_method(rows)
+        return AggregatedDataMapper.map_rows_by_key(rows, keys, convert_method)
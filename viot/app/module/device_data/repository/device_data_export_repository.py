@@ -0,0 +1,43 @@
+from collections.abc import AsyncIterator, Collection
+from datetime import datetime
+from uuid import UUID
+
+from asyncpg import Connection, Record
+from injector import inject
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..sql_queries import EXPORT_QUERY
+
+
+class DeviceDataExportRepository:
+    """
+    Reads raw device data through an asyncpg server-side cursor.
+
+    The request-scoped session is already closed when a streaming response body is
+    consumed, so the export checks out its own connection for the whole stream.
+    """
+
+    @inject
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def stream_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        batch_size: int,
+    ) -> AsyncIterator[list[Record]]:
+        async with self._engine.connect() as conn:
+            raw_conn = await conn.get_raw_connection()
+            driver_conn: Connection = raw_conn.driver_connection  # type: ignore
+
+            # Server-side cursors only live inside a transaction
+            async with driver_conn.transaction(readonly=True):
+                cursor = await driver_conn.cursor(
+                    EXPORT_QUERY, device_id, list(keys), start_date, end_date
+                )
+                while records := await cursor.fetch(batch_size):
+                    yield records
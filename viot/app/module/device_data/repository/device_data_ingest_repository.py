@@ -0,0 +1,45 @@
+from collections.abc import Sequence
+from datetime import datetime
+from uuid import UUID
+
+from asyncpg import Connection
+from injector import inject
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from ..sql_queries import CREATE_INGEST_TABLE_QUERY, INSERT_FROM_INGEST_TABLE_QUERY
+
+# (device_id, ts, key, bool_v, str_v, long_v, double_v, json_v), json_v is JSON text
+IngestRow = tuple[
+    UUID, datetime, str, bool | None, str | None, int | None, float | None, str | None
+]
+
+INGEST_COLUMNS = ("device_id", "ts", "key", "bool_v", "str_v", "long_v", "double_v", "json_v")
+
+
+class DeviceDataIngestRepository:
+    """
+    Writes device data through asyncpg COPY.
+
+    A batch may hold the rows of many requests, so it is written in its own
+    connection and transaction instead of the request-scoped session.
+    """
+
+    @inject
+    def __init__(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+
+    async def insert_rows(self, rows: Sequence[IngestRow]) -> set[IngestRow]:
+        """Insert the rows, rows that already exist are skipped. Returns the inserted rows."""
+        async with self._engine.connect() as conn:
+            raw_conn = await conn.get_raw_connection()
+            driver_conn: Connection = raw_conn.driver_connection  # type: ignore
+
+            async with driver_conn.transaction():
+                await driver_conn.execute(CREATE_INGEST_TABLE_QUERY)
+                await driver_conn.copy_records_to_table(
+                    "device_data_ingest", records=rows, columns=INGEST_COLUMNS
+                )
+                inserted = await driver_conn.fetch(INSERT_FROM_INGEST_TABLE_QUERY)
+
+        # json_v is returned as the text that was copied, rows compare equal to the given ones
+        return {tuple(row) for row in inserted}  # type: ignore
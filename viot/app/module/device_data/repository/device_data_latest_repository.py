@@ -1,16 +1,20 @@
-from collections.abc import Sequence
+from collections.abc import Collection, Sequence
+from datetime import datetime
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import Row, select
 
 from app.database.repository import AsyncSqlalchemyRepository
+from app.module.device.constants import DeviceType
+from app.module.device.model.device import Device
 
 from ..model.device_data_latest import DeviceDataLatest
 
 
 class DeviceDataLatestRepository(AsyncSqlalchemyRepository):
     async def find_all_by_device_id_and_keys(
-        self, device_id: UUID, keys: set[str]
+        self, device_id: UUID, keys: Collection[str]
     ) -> Sequence[DeviceDataLatest]:
         stmt = (
             select(DeviceDataLatest)
@@ -19,6 +23,45 @@ class DeviceDataLatestRepository(AsyncSqlalchemyRepository):
         )
         return (await self.session.execute(stmt)).scalars().all()
 
+    async def find_all_by_device_id(self, device_id: UUID) -> Sequence[DeviceDataLatest]:
+        stmt = select(DeviceDataLatest).where(DeviceDataLatest.device_id == device_id)
+        return (await self.session.execute(stmt)).scalars().all()
+
     async def find_all_keys_by_device_id(self, device_id: UUID) -> Sequence[str]:
         stmt = select(DeviceDataLatest.key).where(DeviceDataLatest.device_id == device_id)
         return (await self.session.execute(stmt)).scalars().all()
+
+    async def find_all_by_team_id_and_keys(
+        self,
+        *,
+        team_id: UUID,
+        keys: Collection[str],
+        device_ids: Collection[UUID] | None = None,
+        device_type: DeviceType | None = None,
+    ) -> Sequence[Row[tuple[UUID, str, datetime, Any, Any, Any, Any, Any]]]:
+        """
+        Find the latest data of the keys of every matched device in the team as plain
+        (device_id, key, ts, bool_v, str_v, long_v, double_v, json_v) rows,
+        ordered by device and key.
+        """
+        stmt = (
+            select(
+                DeviceDataLatest.device_id,
+                DeviceDataLatest.key,
+                DeviceDataLatest.ts,
+                DeviceDataLatest.bool_v,
+                DeviceDataLatest.str_v,
+                DeviceDataLatest.long_v,
+                DeviceDataLatest.double_v,
+                DeviceDataLatest.json_v,
+            )
+            .join(Device, Device.id == DeviceDataLatest.device_id)
+            .where(Device.team_id == team_id, DeviceDataLatest.key.in_(keys))
+            .order_by(DeviceDataLatest.device_id, DeviceDataLatest.key)
+        )
+        if device_ids is not None:
+            stmt = stmt.where(DeviceDataLatest.device_id.in_(device_ids))
+        if device_type is not None:
+            stmt = stmt.where(Device.device_type == device_type)
+
+        return (await self.session.execute(stmt)).all()
@@ -1,8 +1,27 @@
-from collections.abc import Sequence
-from datetime import datetime
+from collections.abc import Collection, Sequence
+from datetime import datetime, timedelta
+from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+from sqlalchemy import (
+    INTEGER,
+    TEXT,
+    ColumnElement,
+    DateTime,
+    Row,
+    and_,
+    cast,
+    func,
+    literal,
+    or_,
+    select,
+    true,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import Over
+from sqlalchemy.sql.selectable import LateralFromClause, TableValuedAlias
 
 from app.database.repository import AsyncSqlalchemyRepository
 from app.database.repository.pagination import SortDirection
@@ -15,22 +34,220 @@ class DeviceDataRepository(AsyncSqlalchemyRepository):
         self,
         *,
         device_id: UUID,
-        keys: set[str],
+        keys: Collection[str],
         start_date: datetime,
         end_date: datetime,
         limit: int,
         order_by: SortDirection | None = None,
     ) -> Sequence[DeviceData]:
-        stmt = select(DeviceData).filter(
+        """
+        Find data of each key in the date range, `limit` applies per key.
+
+        Each key is read by its own index range scan in a lateral subquery,
+        so a noisy key can't starve the others. Data is ordered by timestamp,
+        newest first unless `order_by` is "asc".
+        """
+        requested_keys, data_per_key = self._select_data_per_key(
+            device_id=device_id,
+            keys=keys,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            order_by=order_by,
+        )
+        stmt = (
+            select(aliased(DeviceData, data_per_key))
+            .select_from(requested_keys)
+            .join(data_per_key, true())
+            .order_by(*self._order_per_key(data_per_key, order_by))
+        )
+
+        return (await self.session.execute(stmt)).scalars().all()
+
+    async def find_rows_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int,
+        order_by: SortDirection | None = None,
+    ) -> Sequence[Row[tuple[str, datetime, Any, Any, Any, Any, Any]]]:
+        """
+        Same as `find_data_by_device_id_and_keys`, but returns plain
+        (key, ts, bool_v, str_v, long_v, double_v, json_v) rows instead of ORM objects.
+        """
+        requested_keys, data_per_key = self._select_data_per_key(
+            device_id=device_id,
+            keys=keys,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit,
+            order_by=order_by,
+        )
+        stmt = (
+            select(
+                data_per_key.c.key,
+                data_per_key.c.ts,
+                data_per_key.c.bool_v,
+                data_per_key.c.str_v,
+                data_per_key.c.long_v,
+                data_per_key.c.double_v,
+                data_per_key.c.json_v,
+            )
+            .select_from(requested_keys)
+            .join(data_per_key, true())
+            .order_by(*self._order_per_key(data_per_key, order_by))
+        )
+
+        return (await self.session.execute(stmt)).all()
+
+    async def find_extreme_rows_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        bucket_width: timedelta,
+    ) -> Sequence[Row[tuple[str, datetime, Any, Any, Any, Any, Any]]]:
+        """
+        Pre-aggregate the data of the keys in the date range for downsampling, as plain
+        (key, ts, bool_v, str_v, long_v, double_v, json_v) rows ordered by key and timestamp.
+
+        The range is split into buckets of `bucket_width` and each bucket keeps its first,
+        last, min and max rows (M4), at most 4 rows per key and bucket whatever the number
+        of raw rows. Strings and JSON have no min or max, only first and last are kept.
+        """
+        value = func.coalesce(
+            cast(DeviceData.bool_v, INTEGER), DeviceData.long_v, DeviceData.double_v
+        )
+        bucket = func.time_bucket(
+            bucket_width, DeviceData.ts, cast(start_date, DateTime(timezone=True))
+        )
+
+        def rank(order_by: ColumnElement[Any]) -> Over[int]:
+            return func.row_number().over(partition_by=(DeviceData.key, bucket), order_by=order_by)
+
+        ranked = (
+            select(
+                DeviceData.key,
+                DeviceData.ts,
+                DeviceData.bool_v,
+                DeviceData.str_v,
+                DeviceData.long_v,
+                DeviceData.double_v,
+                DeviceData.json_v,
+                value.label("value"),
+                rank(DeviceData.ts.asc()).label("first_rank"),
+                rank(DeviceData.ts.desc()).label("last_rank"),
+                rank(value.asc().nulls_last()).label("min_rank"),
+                rank(value.desc().nulls_last()).label("max_rank"),
+            )
+            .where(
+                DeviceData.device_id == device_id,
+                DeviceData.key.in_(keys),
+                DeviceData.ts >= start_date,
+                DeviceData.ts <= end_date,
+            )
+            .subquery("ranked")
+        )
+        stmt = (
+            select(
+                ranked.c.key,
+                ranked.c.ts,
+                ranked.c.bool_v,
+                ranked.c.str_v,
+                ranked.c.long_v,
+                ranked.c.double_v,
+                ranked.c.json_v,
+            )
+            .where(
+                or_(
+                    ranked.c.first_rank == 1,
+                    ranked.c.last_rank == 1,
+                    and_(
+                        ranked.c.value.is_not(None),
+                        or_(ranked.c.min_rank == 1, ranked.c.max_rank == 1),
+                    ),
+                )
+            )
+            .order_by(ranked.c.key, ranked.c.ts)
+        )
+
+        return (await self.session.execute(stmt)).all()
+
+    def _select_data_per_key(
+        self,
+        *,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int,
+        order_by: SortDirection | None,
+    ) -> tuple[TableValuedAlias, LateralFromClause]:
+        requested_keys = (
+            func.unnest(literal(list(keys), ARRAY(TEXT)))
+            .table_valued("key")
+            .render_derived(name="requested_keys")
+        )
+        data_per_key = (
+            select(DeviceData)
+            .where(
+                DeviceData.device_id == device_id,
+                DeviceData.key == requested_keys.c.key,
+                DeviceData.ts >= start_date,
+                DeviceData.ts <= end_date,
+            )
+            .order_by(DeviceData.ts.asc() if order_by == "asc" else DeviceData.ts.desc())
+            .limit(limit)
+            .lateral("data_per_key")
+        )
+        return requested_keys, data_per_key
+
+    @staticmethod
+    def _order_per_key(
+        data_per_key: LateralFromClause, order_by: SortDirection | None
+    ) -> tuple[ColumnElement[Any], ...]:
+        """Rows of the lateral join grouped by key, in the order of each key's scan"""
+        ts = data_per_key.c.ts
+        return (data_per_key.c.key, ts.asc() if order_by == "asc" else ts.desc())
+
+    async def find_page_by_device_id_and_keys(
+        self,
+        *,
+        device_id: UUID,
+        keys: Collection[str],
+        start_date: datetime,
+        end_date: datetime,
+        limit: int,
+        order_by: SortDirection = "asc",
+        after: tuple[datetime, str] | None = None,
+    ) -> Sequence[DeviceData]:
+        """
+        Find a page of data ordered by (ts, key), starting right after the `after` keyset.
+
+        The keyset condition is resolved by the (device_id, ts, key) index, so
+        every page costs the same no matter how deep it is.
+        """
+        stmt = select(DeviceData).where(
             DeviceData.device_id == device_id,
             DeviceData.key.in_(keys),
             DeviceData.ts >= start_date,
             DeviceData.ts <= end_date,
         )
-        if order_by:
-            stmt = stmt.order_by(
-                DeviceData.ts.desc() if order_by == "desc" else DeviceData.ts.asc()
+        if after is not None:
+            keyset = tuple_(DeviceData.ts, DeviceData.key)
+            after_keyset = tuple_(
+                literal(after[0], DateTime(timezone=True)), literal(after[1], TEXT)
             )
-        stmt = stmt.limit(limit)
+            stmt = stmt.where(keyset > after_keyset if order_by == "asc" else keyset < after_keyset)
 
-        return (await self.session.execute(stmt)).scalars().all()
+        if order_by == "asc":
+            stmt = stmt.order_by(DeviceData.ts.asc(), DeviceData.key.asc())
+        else:
+            stmt = stmt.order_by(DeviceData.ts.desc(), DeviceData.key.desc())
+
+        return (await self.session.execute(stmt.limit(limit))).scalars().all()
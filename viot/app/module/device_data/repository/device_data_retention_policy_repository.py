@@ -0,0 +1,9 @@
+from uuid import UUID
+
+from app.database.repository import CrudRepository
+
+from ..model.device_data_retention_policy import DeviceDataRetentionPolicy
+
+
+class DeviceDataRetentionPolicyRepository(CrudRepository[DeviceDataRetentionPolicy, UUID]):
+    pass
@@ -0,0 +1,51 @@
+from datetime import timedelta
+from typing import Any
+
+from sqlalchemy import Row, text
+
+from app.database.repository import AsyncSqlalchemyRepository
+
+from ..sql_queries import (
+    ADD_COMPRESSION_POLICY_QUERY,
+    ADD_RETENTION_POLICY_QUERY,
+    FIND_STORAGE_POLICY_QUERY,
+    FIND_STORAGE_STATS_QUERY,
+    REMOVE_COMPRESSION_POLICY_QUERY,
+    REMOVE_RETENTION_POLICY_QUERY,
+    SET_CHUNK_TIME_INTERVAL_QUERY,
+)
+
+
+class DeviceDataStorageRepository(AsyncSqlalchemyRepository):
+    """Chunk, compression and retention settings of the device_data hypertable"""
+
+    async def find_policy(self) -> Row[Any]:
+        """(chunk_time_interval, compress_after, drop_after), policies not set are None"""
+        return (await self.session.execute(text(FIND_STORAGE_POLICY_QUERY))).one()
+
+    async def find_stats(self) -> Row[Any]:
+        """
+        (total_chunks, compressed_chunks, before_compression_bytes,
+        after_compression_bytes, total_bytes)
+        """
+        return (await self.session.execute(text(FIND_STORAGE_STATS_QUERY))).one()
+
+    async def set_chunk_time_interval(self, chunk_time_interval: timedelta) -> None:
+        """Applies to chunks created from now on, existing chunks keep their interval"""
+        await self.session.execute(
+            text(SET_CHUNK_TIME_INTERVAL_QUERY), {"chunk_time_interval": chunk_time_interval}
+        )
+
+    async def set_compression_policy(self, compress_after: timedelta | None) -> None:
+        """Replace the compression policy, None removes it"""
+        await self.session.execute(text(REMOVE_COMPRESSION_POLICY_QUERY))
+        if compress_after is not None:
+            await self.session.execute(
+                text(ADD_COMPRESSION_POLICY_QUERY), {"compress_after": compress_after}
+            )
+
+    async def set_retention_policy(self, drop_after: timedelta | None) -> None:
+        """Replace the retention policy that drops whole chunks, None removes it"""
+        await self.session.execute(text(REMOVE_RETENTION_POLICY_QUERY))
+        if drop_after is not None:
+            await self.session.execute(text(ADD_RETENTION_POLICY_QUERY), {"drop_after": drop_after})
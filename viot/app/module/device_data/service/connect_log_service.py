@@ -4,11 +4,13 @@ from uuid import UUID
 from injector import inject
 
 from app.database.repository import Filter, Pageable, Sort
-from app.database.repository.pagination import SortDirection
+from app.database.repository.pagination import SortDirection, decode_cursor, encode_cursor
 from app.module.device.exception.device_exception import DeviceNotFoundException
 from app.module.device.repository.device_repository import DeviceRepository
 
-from ..dto.connect_log_dto import PagingConnectLogDto
+from ..config import device_data_settings
+from ..dto.connect_log_dto import ConnectLogDto, CursorPagingConnectLogDto, PagingConnectLogDto
+from ..exception.connect_log_exception import InvalidConnectLogCursorException
 from ..repository.connect_log_repository import ConnectLogRepository
 
 
@@ -19,6 +21,7 @@ class ConnectLogService:
     ) -> None:
         self._connect_log_repository = connect_log_repository
         self._device_repository = device_repository
+        self._count_cap = device_data_settings.CONNECT_LOG_COUNT_CAP
 
     async def get_connect_logs(
         self,
@@ -48,6 +51,54 @@ class ConnectLogService:
         connect_log_page = await self._connect_log_repository.find_all_with_paging(pageable)
         return PagingConnectLogDto.from_page(connect_log_page)
 
+    async def scroll_connect_logs(
+        self,
+        *,
+        team_id: UUID,
+        device_id: UUID,
+        limit: int,
+        start_date: datetime | None,
+        end_date: datetime | None,
+        order_by: SortDirection,
+        cursor: str | None,
+        include_total: bool,
+    ) -> CursorPagingConnectLogDto:
+        """
+        Keyset variant of `get_connect_logs`, pages are resumed after the timestamp of
+        the cursor. The total is only counted when requested, up to a cap.
+        """
+        self._validate_date_range(start_date, end_date)
+        after = self._decode_cursor(cursor)
+        await self._validate_team_and_device(team_id, device_id)
+
+        # Fetch one extra connect log to know whether there is a next page
+        connect_logs = await self._connect_log_repository.find_page_by_device_id(
+            device_id=device_id,
+            start_date=start_date,
+            end_date=end_date,
+            limit=limit + 1,
+            order_by=order_by,
+            after=after,
+        )
+
+        next_cursor: str | None = None
+        if len(connect_logs) > limit:
+            connect_logs = connect_logs[:limit]
+            next_cursor = encode_cursor((connect_logs[-1].ts,))
+
+        total_items: int | None = None
+        if include_total:
+            total_items = await self._connect_log_repository.count_by_device_id(
+                device_id=device_id, start_date=start_date, end_date=end_date, cap=self._count_cap
+            )
+
+        return CursorPagingConnectLogDto(
+            items=[ConnectLogDto.from_model(log) for log in connect_logs],
+            next_cursor=next_cursor,
+            total_items=None if total_items is None else min(total_items, self._count_cap),
+            total_items_capped=total_items is not None and total_items > self._count_cap,
+        )
+
     async def delete_connect_logs(
         self,
         *,
@@ -67,6 +118,15 @@ class ConnectLogService:
         if not await self._device_repository.exists_by_id_and_team_id(device_id, team_id):
             raise DeviceNotFoundException(device_id)
 
+    def _decode_cursor(self, cursor: str | None) -> datetime | None:
+        if cursor is None:
+            return None
+        try:
+            (ts,) = decode_cursor(cursor, tuple[datetime])
+        except ValueError as e:
+            raise InvalidConnectLogCursorException from e
+        return ts
+
     def _validate_date_range(self, start_date: datetime | None, end_date: datetime | None) -> None:
         if start_date and end_date and start_date > end_date:
             raise ValueError("start_date must be less than or equal to end_date")
@@ -1,10 +1,24 @@
+from collections.abc import Iterable
 from uuid import UUID
 
 from injector import inject
 
+from app.module.device.exception.device_exception import DeviceNotFoundException
+from app.module.device.repository.device_repository import DeviceRepository
+
 from ..constants import DeviceAttributeScope
-from ..dto.device_attribute_dto import DeviceAttributeDto, ScopeKeysDto
-from ..repository.device_attribute_repository import DeviceAttributeRepository
+from ..dto.device_attribute_dto import (
+    AttributesUpsertDto,
+    AttributeUpsertResult,
+    AttributeValue,
+    DeviceAttributeDto,
+    ScopeKeysDto,
+)
+from ..exception.device_attribute_exception import AttributeScopeNotWritableException
+from ..mapper import TypedValueMapper
+from ..repository.device_attribute_repository import AttributeRow, DeviceAttributeRepository
+
+WRITABLE_SCOPES = frozenset({DeviceAttributeScope.SERVER_SCOPE, DeviceAttributeScope.SHARED_SCOPE})
 
 
 class DeviceAttributeService:
@@ -12,8 +26,10 @@ class DeviceAttributeService:
     def __init__(
         self,
         device_attribute_repository: DeviceAttributeRepository,
+        device_repository: DeviceRepository,
     ) -> None:
         self._device_attribute_repository = device_attribute_repository
+        self._device_repository = device_repository
 
     async def get_all_keys_by_device_id(self, *, device_id: UUID) -> ScopeKeysDto:
         data = await self._device_attribute_repository.find_all_key_with_scope_by_device_id(
@@ -36,3 +52,67 @@ class DeviceAttributeService:
             device_id=device_id, keys=keys, scope=scope
         )
         return [DeviceAttributeDto.from_model(d) for d in data]
+
+    async def upsert_attributes(
+        self,
+        *,
+        team_id: UUID,
+        scope: DeviceAttributeScope,
+        attributes_upsert_dto: AttributesUpsertDto,
+    ) -> list[AttributeUpsertResult]:
+        """
+        Insert or replace attributes of many devices of the team. When a (device, key)
+        pair is given more than once, the last value wins.
+        """
+        return await self._upsert(
+            team_id=team_id,
+            scope=scope,
+            attributes={(a.device_id, a.key): a.value for a in attributes_upsert_dto.attributes},
+        )
+
+    async def upsert_device_attributes(
+        self,
+        *,
+        team_id: UUID,
+        device_id: UUID,
+        scope: DeviceAttributeScope,
+        attributes: dict[str, AttributeValue],
+    ) -> list[AttributeUpsertResult]:
+        """Insert or replace attributes of a device of the team"""
+        return await self._upsert(
+            team_id=team_id,
+            scope=scope,
+            attributes={(device_id, key): value for key, value in attributes.items()},
+        )
+
+    async def _upsert(
+        self,
+        *,
+        team_id: UUID,
+        scope: DeviceAttributeScope,
+        attributes: dict[tuple[UUID, str], AttributeValue],
+    ) -> list[AttributeUpsertResult]:
+        if scope not in WRITABLE_SCOPES:
+            raise AttributeScopeNotWritableException(scope)
+
+        await self._validate_devices(team_id, {device_id for device_id, _ in attributes})
+
+        upserted = await self._device_attribute_repository.upsert_many(
+            scope,
+            [
+                AttributeRow(device_id, key, TypedValueMapper.to_columns(value))
+                for (device_id, key), value in attributes.items()
+            ],
+        )
+        return [
+            AttributeUpsertResult(
+                device_id=a.device_id, key=a.key, last_update=a.last_update, created=a.created
+            )
+            for a in upserted
+        ]
+
+    async def _validate_devices(self, team_id: UUID, device_ids: Iterable[UUID]) -> None:
+        device_ids = set(device_ids)
+        found_ids = await self._device_repository.find_ids_by_ids_and_team_id(device_ids, team_id)
+        if missing_ids := device_ids.difference(found_ids):
+            raise DeviceNotFoundException(min(missing_ids))
@@ -0,0 +1,73 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Sequence
+from typing import Any
+from uuid import UUID
+
+import msgspec
+from asyncpg import Record
+from injector import inject
+
+from ..constants import ExportFormat
+from ..dto.device_data_dto import TimeseriesExportQueryDto
+from ..repository.device_data_export_repository import DeviceDataExportRepository
+
+EXPORT_BATCH_SIZE = 5000
+CSV_HEADER = ("ts", "key", "value")
+
+
+def _record_value(record: Record) -> Any:
+    # Same precedence as DeviceData.value. json_v is already decoded, SQLAlchemy
+    # registers a json codec on every asyncpg connection, including the raw one.
+    for column in ("bool_v", "str_v", "long_v", "double_v", "json_v"):
+        if record[column] is not None:
+            return record[column]
+    return None
+
+
+class DeviceDataExportService:
+    @inject
+    def __init__(self, device_data_export_repository: DeviceDataExportRepository) -> None:
+        self._device_data_export_repository = device_data_export_repository
+        self._json_encoder = msgspec.json.Encoder()
+
+    async def export_timeseries(
+        self, *, device_id: UUID, query_dto: TimeseriesExportQueryDto
+    ) -> AsyncIterator[bytes]:
+        """
+        Stream raw timeseries data ordered by (ts, key), one encoded chunk per cursor batch.
+        """
+        if query_dto.format == ExportFormat.CSV:
+            yield self._encode_csv_header()
+
+        async for records in self._device_data_export_repository.stream_by_device_id_and_keys(
+            device_id=device_id,
+            keys=query_dto.keys,
+            start_date=query_dto.start_date,
+            end_date=query_dto.end_date,
+            batch_size=EXPORT_BATCH_SIZE,
+        ):
+            if query_dto.format == ExportFormat.CSV:
+                yield self._encode_csv(records)
+            else:
+                yield self._encode_ndjson(records)
+
+    def _encode_ndjson(self, records: Sequence[Record]) -> bytes:
+        return self._json_encoder.encode_lines(
+            [{"ts": r["ts"], "key": r["key"], "value": _record_value(r)} for r in records]
+        )
+
+    def _encode_csv_header(self) -> bytes:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(CSV_HEADER)
+        return buffer.getvalue().encode()
+
+    def _encode_csv(self, records: Sequence[Record]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for r in records:
+            value = _record_value(r)
+            if isinstance(value, dict | list):
+                value = self._json_encoder.encode(value).decode()
+            writer.writerow((r["ts"].isoformat(), r["key"], value))
+        return buffer.getvalue().encode()
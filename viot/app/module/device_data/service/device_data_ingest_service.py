@@ -0,0 +1,116 @@
+import asyncio
+from collections.abc import Mapping, Sequence
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from uuid import UUID
+
+import msgspec
+from injector import inject
+
+from app.module.device.exception.device_exception import DeviceNotFoundException
+from app.module.device.repository.device_repository import DeviceRepository
+
+from ..cache.device_data_aggregation_cache import DeviceDataAggregationCache
+from ..cache.device_data_latest_cache import DeviceDataLatestCache, LatestDataPoint
+from ..config import device_data_settings
+from ..constants import IngestFormat
+from ..dto.device_data_ingest_dto import IngestResultDto, TelemetryRecord
+from ..exception.device_data_ingest_exception import (
+    InvalidTelemetryException,
+    TooManyDataPointsException,
+)
+from ..ingest_batcher import DeviceDataIngestBatcher
+from ..mapper import TypedValueMapper
+from ..repository.device_data_ingest_repository import IngestRow
+
+_NDJSON_DECODER = msgspec.json.Decoder(TelemetryRecord)
+_MSGPACK_DECODER = msgspec.msgpack.Decoder(list[TelemetryRecord])
+
+
+class DeviceDataIngestService:
+    @inject
+    def __init__(
+        self,
+        device_repository: DeviceRepository,
+        device_data_ingest_batcher: DeviceDataIngestBatcher,
+        device_data_latest_cache: DeviceDataLatestCache,
+        device_data_aggregation_cache: DeviceDataAggregationCache,
+    ) -> None:
+        self._device_repository = device_repository
+        self._device_data_ingest_batcher = device_data_ingest_batcher
+        self._device_data_latest_cache = device_data_latest_cache
+        self._device_data_aggregation_cache = device_data_aggregation_cache
+        self._max_data_points = device_data_settings.INGEST_MAX_DATA_POINTS
+        self._aggregation_cache_lag = timedelta(
+            seconds=device_data_settings.AGGREGATION_CACHE_LAG_SEC
+        )
+
+    async def ingest(
+        self, *, team_id: UUID, body: bytes, ingest_format: IngestFormat
+    ) -> IngestResultDto:
+        """
+        Write the telemetry records of devices of the team. Null values are skipped,
+        data points that already exist are left unchanged.
+        """
+        records = self._decode(body, ingest_format)
+
+        device_ids = {record.device_id for record in records}
+        found_ids = await self._device_repository.find_ids_by_ids_and_team_id(device_ids, team_id)
+        if missing_ids := device_ids.difference(found_ids):
+            raise DeviceNotFoundException(min(missing_ids))
+
+        points: list[tuple[IngestRow, Any]] = [
+            ((record.device_id, record.ts, key, *TypedValueMapper.to_columns(value)), value)
+            for record in records
+            for key, value in record.data.items()
+            if value is not None
+        ]
+        if len(points) > self._max_data_points:
+            raise TooManyDataPointsException(self._max_data_points)
+
+        if points:
+            inserted = await self._device_data_ingest_batcher.submit([row for row, _ in points])
+            await self._update_caches(inserted, dict(points))
+
+        return IngestResultDto(records=len(records), data_points=len(points))
+
+    def _decode(self, body: bytes, ingest_format: IngestFormat) -> Sequence[TelemetryRecord]:
+        try:
+            if ingest_format == IngestFormat.MSGPACK:
+                return _MSGPACK_DECODER.decode(body)
+            return _NDJSON_DECODER.decode_lines(body)
+        except msgspec.DecodeError as e:
+            raise InvalidTelemetryException(str(e)) from e
+
+    async def _update_caches(
+        self, inserted: Sequence[IngestRow], values: Mapping[IngestRow, Any]
+    ) -> None:
+        """
+        Write the newest inserted data points through the latest cache, and invalidate
+        the cached aggregation buckets of devices that received data older than the
+        cache lag. Data points that already existed are skipped, the cache keeps
+        agreeing with the stored value.
+        """
+        latest: dict[UUID, dict[str, LatestDataPoint]] = {}
+        oldest: dict[UUID, datetime] = {}
+        for row in inserted:
+            device_id, ts, key = row[:3]
+            points = latest.setdefault(device_id, {})
+            point = points.get(key)
+            if point is None or point.ts < ts:
+                points[key] = LatestDataPoint(ts=ts, value=values[row])
+            if device_id not in oldest or ts < oldest[device_id]:
+                oldest[device_id] = ts
+
+        closed_before = datetime.now(UTC) - self._aggregation_cache_lag
+        await asyncio.gather(
+            *(
+                self._device_data_latest_cache.write_through(device_id, points)
+                for device_id, points in latest.items()
+            ),
+            *(
+                self._device_data_aggregation_cache.invalidate(device_id, since=ts)
+                for device_id, ts in oldest.items()
+                if ts < closed_before
+            ),
+        )
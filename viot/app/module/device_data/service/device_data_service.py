@@ -1,20 +1,73 @@
-import asyncio
 from collections import defaultdict
+from collections.abc import Sequence
+from datetime import UTC, datetime, timedelta
+from itertools import groupby
+from operator import itemgetter
+from typing import Any
 from uuid import UUID
+from zoneinfo import ZoneInfo
 
+import numpy as np
 from injector import inject
+from sqlalchemy import Row
 
-from ..constants import Timezone
+from app.database.repository.pagination import encode_cursor
+
+from ..cache.device_data_aggregation_cache import DeviceDataAggregationCache
+from ..cache.device_data_latest_cache import DeviceDataLatestCache, LatestDataPoint
+from ..config import device_data_settings
+from ..constants import ROLLUP_BUCKET_WIDTHS, AggregationType, DeviceDataRollup, Timezone
+from ..downsampling import lttb_indices, stride_indices
 from ..dto.device_data_dto import (
     AggregatedData,
     DataPointDto,
+    DeviceDataStatsDto,
+    FleetLatestColumns,
+    FleetLatestQueryDto,
     LatestDataPointDto,
     TimeseriesAggregationQueryDto,
+    TimeseriesColumns,
+    TimeseriesPageDto,
+    TimeseriesPageQueryDto,
 )
 from ..repository.device_data_aggregation_repository import DeviceDataAggregationRepository
 from ..repository.device_data_latest_repository import DeviceDataLatestRepository
 from ..repository.device_data_repository import DeviceDataRepository
 
+_EPOCH = datetime(1970, 1, 1)
+
+
+def _utc_offset(value: datetime, timezone: ZoneInfo) -> timedelta:
+    return value.replace(tzinfo=UTC).astimezone(timezone).utcoffset() or timedelta(0)
+
+
+def _downsample(
+    rows: Sequence[Row[tuple[str, datetime, Any, Any, Any, Any, Any]]], max_points: int
+) -> TimeseriesColumns:
+    """
+    Downsample (key, ts, bool_v, str_v, long_v, double_v, json_v) rows of a key,
+    ordered by timestamp. Numeric and boolean series are ranked by LTTB, series holding
+    strings or JSON fall back to evenly spaced points.
+    """
+    n = len(rows)
+    _, ts, bool_v, str_v, long_v, double_v, json_v = zip(*rows, strict=True)
+
+    if str_v.count(None) == n and json_v.count(None) == n:
+        x = np.fromiter(map(datetime.timestamp, ts), dtype=np.float64, count=n)
+        # Same precedence as DeviceData.value, None becomes NaN
+        y = np.array(bool_v, dtype=np.float64)
+        for column in (long_v, double_v):
+            missing = np.isnan(y)
+            y[missing] = np.array(column, dtype=np.float64)[missing]
+        indices = lttb_indices(x, y, max_points)
+    else:
+        indices = stride_indices(n, max_points)
+
+    return TimeseriesColumns(
+        ts=[ts[i] for i in indices],
+        values=[next((v for v in rows[i][2:] if v is not None), None) for i in indices],
+    )
+
 
 class DeviceDataService:
     @inject
@@ -23,31 +76,86 @@ class DeviceDataService:
         device_data_repository: DeviceDataRepository,
         device_data_latest_repository: DeviceDataLatestRepository,
         device_data_aggregation_repository: DeviceDataAggregationRepository,
+        device_data_latest_cache: DeviceDataLatestCache,
+        device_data_aggregation_cache: DeviceDataAggregationCache,
     ) -> None:
         self._device_data_repository = device_data_repository
         self._device_data_latest_repository = device_data_latest_repository
         self._device_data_aggregation_repository = device_data_aggregation_repository
+        self._device_data_latest_cache = device_data_latest_cache
+        self._device_data_aggregation_cache = device_data_aggregation_cache
 
     async def get_all_keys(self, *, device_id: UUID) -> set[str]:
-        keys = await self._device_data_latest_repository.find_all_keys_by_device_id(
-            device_id=device_id
+        cached = await self._device_data_latest_cache.get_all(device_id)
+        if cached is not None:
+            return set(cached)
+
+        data = await self._device_data_latest_repository.find_all_by_device_id(device_id=device_id)
+        await self._device_data_latest_cache.set_many(
+            device_id, {d.key: LatestDataPoint(ts=d.ts, value=d.value) for d in data}, complete=True
         )
-        return set(keys)
+        return {d.key for d in data}
+
+    async def get_stats(self, *, device_id: UUID) -> DeviceDataStatsDto:
+        rows = await self._device_data_aggregation_repository.find_stats_by_device_id(device_id)
+        return DeviceDataStatsDto.from_rows(rows)
 
     async def get_latest_data_by_keys(
         self, *, device_id: UUID, keys: set[str]
     ) -> list[LatestDataPointDto]:
-        data = await self._device_data_latest_repository.find_all_by_device_id_and_keys(
-            device_id=device_id, keys=keys
+        cached, complete = await self._device_data_latest_cache.get_many(device_id, keys)
+        result = [
+            LatestDataPointDto(ts=point.ts, key=key, value=point.value)
+            for key, point in cached.items()
+        ]
+
+        missing_keys = keys - cached.keys()
+        if missing_keys and not complete:
+            data = await self._device_data_latest_repository.find_all_by_device_id_and_keys(
+                device_id=device_id, keys=missing_keys
+            )
+            await self._device_data_latest_cache.set_many(
+                device_id, {d.key: LatestDataPoint(ts=d.ts, value=d.value) for d in data}
+            )
+            result.extend(LatestDataPointDto.from_model(d) for d in data)
+
+        return result
+
+    async def get_fleet_latest_data(
+        self, *, team_id: UUID, query_dto: FleetLatestQueryDto
+    ) -> FleetLatestColumns:
+        rows = await self._device_data_latest_repository.find_all_by_team_id_and_keys(
+            team_id=team_id,
+            keys=query_dto.keys,
+            device_ids=query_dto.device_ids,
+            device_type=query_dto.device_type,
         )
-        return [LatestDataPointDto.from_model(d) for d in data]
+
+        columns = FleetLatestColumns()
+        for device_id, key, ts, *values in rows:
+            columns.device_ids.append(device_id)
+            columns.keys.append(key)
+            columns.ts.append(ts)
+            # Same precedence as DeviceDataLatest.value
+            columns.values.append(next((v for v in values if v is not None), None))
+
+        return columns
 
     async def get_timeseries_data_by_keys(
         self, *, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
     ) -> dict[str, list[DataPointDto]]:
         result_map: defaultdict[str, list[DataPointDto]] = defaultdict(list)
 
-        if not query_dto.is_aggregate_query:
+        if query_dto.max_points is not None:
+            downsampled = await self.get_downsampled_columns_by_keys(
+                device_id=device_id, query_dto=query_dto
+            )
+            for key, columns in downsampled.items():
+                result_map[key] = [
+                    DataPointDto(ts=ts, value=value)
+                    for ts, value in zip(columns.ts, columns.values, strict=True)
+                ]
+        elif not query_dto.is_aggregate_query:
             data = await self._device_data_repository.find_data_by_device_id_and_keys(
                 device_id=device_id,
                 keys=query_dto.keys,
@@ -66,25 +174,267 @@ class DeviceDataService:
 
         return result_map
 
+    async def get_timeseries_columns_by_keys(
+        self, *, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
+    ) -> dict[str, TimeseriesColumns]:
+        """
+        Columnar variant of `get_timeseries_data_by_keys`, the columns are filled
+        straight from DB rows without building a model per data point.
+        """
+        if query_dto.max_points is not None:
+            return await self.get_downsampled_columns_by_keys(
+                device_id=device_id, query_dto=query_dto
+            )
+
+        result_map: defaultdict[str, TimeseriesColumns] = defaultdict(TimeseriesColumns)
+
+        if not query_dto.is_aggregate_query:
+            rows = await self._device_data_repository.find_rows_by_device_id_and_keys(
+                device_id=device_id,
+                keys=query_dto.keys,
+                start_date=query_dto.start_date,
+                end_date=query_dto.end_date,
+                limit=query_dto.limit,
+                order_by=query_dto.order_by,
+            )
+
+            for key, ts, *values in rows:
+                columns = result_map[key]
+                columns.ts.append(ts)
+                # Same precedence as DeviceData.value
+                columns.values.append(next((v for v in values if v is not None), None))
+        else:
+            aggregated_data = await self.find_aggregation_async(device_id, query_dto)
+            for key, data in aggregated_data.items():
+                result_map[key] = TimeseriesColumns(
+                    ts=[d.ts for d in data], values=[d.value for d in data]
+                )
+
+        return result_map
+
+    async def get_downsampled_columns_by_keys(
+        self, *, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
+    ) -> dict[str, TimeseriesColumns]:
+        """
+        Reduce the raw data points of each key in the date range to `max_points`.
+        Points are ordered ascending unless `order_by` is "desc".
+
+        The database pre-aggregates the range into a bounded number of rows per key,
+        keeping the extremes of each bucket, LTTB picks the points among them.
+        """
+        if query_dto.max_points is None:
+            raise ValueError("Max points must be provided")
+
+        bucket_count = query_dto.max_points * device_data_settings.DOWNSAMPLE_BUCKETS_PER_POINT
+        rows = await self._device_data_repository.find_extreme_rows_by_device_id_and_keys(
+            device_id=device_id,
+            keys=query_dto.keys,
+            start_date=query_dto.start_date,
+            end_date=query_dto.end_date,
+            bucket_width=max(
+                (query_dto.end_date - query_dto.start_date) / bucket_count,
+                timedelta(microseconds=1),
+            ),
+        )
+
+        result_map: dict[str, TimeseriesColumns] = {}
+        for key, key_rows in groupby(rows, key=itemgetter(0)):
+            columns = _downsample(list(key_rows), query_dto.max_points)
+            if query_dto.order_by == "desc":
+                columns.ts.reverse()
+                columns.values.reverse()
+            result_map[key] = columns
+
+        return result_map
+
+    async def get_timeseries_page_by_keys(
+        self, *, device_id: UUID, query_dto: TimeseriesPageQueryDto
+    ) -> TimeseriesPageDto:
+        # Fetch one extra data point to know whether there is a next page
+        data = await self._device_data_repository.find_page_by_device_id_and_keys(
+            device_id=device_id,
+            keys=query_dto.keys,
+            start_date=query_dto.start_date,
+            end_date=query_dto.end_date,
+            limit=query_dto.limit + 1,
+            order_by=query_dto.order_by,
+            after=query_dto.after,
+        )
+
+        next_cursor: str | None = None
+        if len(data) > query_dto.limit:
+            data = data[: query_dto.limit]
+            next_cursor = encode_cursor((data[-1].ts, data[-1].key))
+
+        result_map: defaultdict[str, list[DataPointDto]] = defaultdict(list)
+        for i in data:
+            result_map[i.key].append(DataPointDto.from_model(i))
+
+        return TimeseriesPageDto(data=result_map, next_cursor=next_cursor)
+
     async def find_aggregation_async(
         self, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
     ) -> dict[str, list[AggregatedData]]:
-        if not query_dto.is_aggregate_query:
+        """
+        Returns one series per key, or one series per `<key>:<agg>` when more
+        than one aggregation type is requested.
+        """
+        if not query_dto.is_aggregate_query or query_dto.agg is None:
             raise ValueError("Query is not an aggregation query")
 
-        results = await asyncio.gather(
-            *[
-                self._device_data_aggregation_repository.find_aggregation(
-                    aggregation_type=query_dto.agg,  # type: ignore
-                    device_id=device_id,
-                    key=key,
-                    start_date=query_dto.start_date,
-                    end_date=query_dto.end_date,
-                    bucket_width=query_dto.interval_in_timedelta,
-                    timezone=query_dto.timezone or Timezone.UTC,
-                )
-                for key in query_dto.keys
-            ]
+        closed_bucket_count = self._count_closed_buckets(query_dto)
+        if closed_bucket_count > 0:
+            data = await self._find_aggregations_cached(device_id, query_dto, closed_bucket_count)
+        else:
+            data = await self._find_aggregations(device_id, query_dto)
+
+        if len(query_dto.agg) == 1:
+            return {key: series_by_agg[query_dto.agg[0]] for key, series_by_agg in data.items()}
+        return {
+            f"{key}:{aggregation_type}": series
+            for key, series_by_agg in data.items()
+            for aggregation_type, series in series_by_agg.items()
+        }
+
+    async def _find_aggregations(
+        self, device_id: UUID, query_dto: TimeseriesAggregationQueryDto
+    ) -> dict[str, dict[AggregationType, list[AggregatedData]]]:
+        agg: list[AggregationType] = query_dto.agg  # type: ignore
+        params: dict[str, Any] = {
+            "device_id": device_id,
+            "keys": query_dto.keys,
+            "start_date": query_dto.start_date,
+            "end_date": query_dto.end_date,
+            "bucket_width": query_dto.interval_in_timedelta,
+            "timezone": query_dto.timezone or Timezone.UTC,
+            "rollup": self._select_rollup(query_dto),
+        }
+
+        if query_dto.fill is not None:
+            return await self._device_data_aggregation_repository.find_filled_aggregations_by_keys(
+                aggregation_types=agg, fill=query_dto.fill, **params
+            )
+        if len(agg) > 1:
+            return await self._device_data_aggregation_repository.find_aggregations_by_keys(
+                aggregation_types=agg, **params
+            )
+
+        data = await self._device_data_aggregation_repository.find_aggregation_by_keys(
+            aggregation_type=agg[0], **params
+        )
+        return {key: {agg[0]: series} for key, series in data.items()}
+
+    async def _find_aggregations_cached(
+        self, device_id: UUID, query_dto: TimeseriesAggregationQueryDto, closed_bucket_count: int
+    ) -> dict[str, dict[AggregationType, list[AggregatedData]]]:
+        """
+        Read the leading closed buckets of each key from the cache and query the rest
+        live, from the first bucket that isn't cached by every aggregation type of the
+        key. Keys with the same cached buckets share a live query. Buckets start at
+        `start_date`, so the live queries have the same buckets as the full query.
+        """
+        bucket_width = query_dto.interval_in_timedelta
+        timezone = query_dto.timezone or Timezone.UTC
+        agg: list[AggregationType] = query_dto.agg  # type: ignore
+        series = [
+            (key, aggregation_type) for key in sorted(query_dto.keys) for aggregation_type in agg
+        ]
+        start = query_dto.start_date.replace(tzinfo=UTC)
+        bucket_starts = [start + bucket_width * i for i in range(closed_bucket_count)]
+
+        generation, cached = await self._device_data_aggregation_cache.get_many(
+            device_id, series, bucket_width, timezone, bucket_starts
         )
+        keys_by_cached_count: defaultdict[int, list[str]] = defaultdict(list)
+        for key in sorted(query_dto.keys):
+            cached_count = min(
+                len(cached.get((key, aggregation_type), [])) for aggregation_type in agg
+            )
+            keys_by_cached_count[cached_count].append(key)
+
+        data: dict[str, dict[AggregationType, list[AggregatedData]]] = {}
+        to_cache: dict[tuple[str, AggregationType], dict[datetime, AggregatedData | None]] = {}
+        for cached_count, keys in keys_by_cached_count.items():
+            live_dto = query_dto.model_copy(
+                update={
+                    "keys__": ",".join(keys),
+                    "start_date": query_dto.start_date + bucket_width * cached_count,
+                }
+            )
+            live = await self._find_aggregations(device_id, live_dto)
+
+            for key in keys:
+                data[key] = {}
+                for aggregation_type in agg:
+                    live_series = live.get(key, {}).get(aggregation_type, [])
+                    cached_series = cached.get((key, aggregation_type), [])[:cached_count]
+                    data[key][aggregation_type] = [
+                        d for d in cached_series if d is not None
+                    ] + live_series
+
+                    if cached_count < closed_bucket_count:
+                        # Closed buckets missing from the live series are empty
+                        closed: dict[datetime, AggregatedData | None] = dict.fromkeys(
+                            bucket_starts[cached_count:]
+                        )
+                        for d in live_series:
+                            if d.ts - bucket_width / 2 in closed:
+                                closed[d.ts - bucket_width / 2] = d
+                        to_cache[(key, aggregation_type)] = closed
+
+        if to_cache:
+            await self._device_data_aggregation_cache.set_many(
+                device_id, generation, bucket_width, timezone, to_cache
+            )
+
+        return data
+
+    def _count_closed_buckets(self, query_dto: TimeseriesAggregationQueryDto) -> int:
+        """
+        Number of leading buckets that end before both the ingestion lag and `end_date`,
+        0 when the query isn't cacheable. Gap-filled values depend on the surrounding
+        buckets, and buckets of timezones with daylight saving time don't have a fixed
+        width, so both bypass the cache.
+        """
+        if query_dto.fill is not None:
+            return 0
+
+        timezone = ZoneInfo(query_dto.timezone or Timezone.UTC)
+        years = {query_dto.start_date.year, query_dto.end_date.year}
+        if any(
+            _utc_offset(datetime(year, 1, 1), timezone)
+            != _utc_offset(datetime(year, 7, 1), timezone)
+            for year in years
+        ):
+            return 0
+
+        lag = timedelta(seconds=device_data_settings.AGGREGATION_CACHE_LAG_SEC)
+        closed_until = min(datetime.now(UTC).replace(tzinfo=None) - lag, query_dto.end_date)
+        count = max((closed_until - query_dto.start_date) // query_dto.interval_in_timedelta, 0)
+        if count > device_data_settings.AGGREGATION_CACHE_MAX_BUCKETS:
+            return 0
+        return count
+
+    def _select_rollup(self, query_dto: TimeseriesAggregationQueryDto) -> DeviceDataRollup | None:
+        """
+        Pick the coarsest rollup whose buckets fit exactly into the requested buckets.
+
+        Requested buckets start at `start_date` in the requested timezone, while rollup
+        buckets are aligned to UTC. A rollup is usable when the bucket width, both range
+        bounds and the timezone offset are multiples of the rollup width. All aggregation
+        types are derived from the rollup sum/count/min/max columns.
+        """
+        bucket_width = query_dto.interval_in_timedelta
+        timezone = ZoneInfo(query_dto.timezone or Timezone.UTC)
+        bounds = (query_dto.start_date, query_dto.end_date)
+
+        for rollup, rollup_width in ROLLUP_BUCKET_WIDTHS.items():
+            if bucket_width % rollup_width:
+                continue
+            if any((bound - _EPOCH) % rollup_width for bound in bounds):
+                continue
+            if any(_utc_offset(bound, timezone) % rollup_width for bound in bounds):
+                continue
+            return rollup
 
-        return dict(zip(query_dto.keys, results, strict=True))
+        return None
@@ -0,0 +1,92 @@
+from datetime import timedelta
+from uuid import UUID
+
+from injector import inject
+
+from app.module.team.exception.team_exception import TeamNotFoundException
+from app.module.team.repository.team_repository import TeamRepository
+
+from ..dto.device_data_storage_dto import (
+    DeviceDataStoragePolicyDto,
+    DeviceDataStoragePolicyUpdateDto,
+    DeviceDataStorageStatsDto,
+    RetentionPolicyDto,
+    RetentionPolicyUpdateDto,
+)
+from ..exception.device_data_storage_exception import RetentionPolicyNotFoundException
+from ..model.device_data_retention_policy import DeviceDataRetentionPolicy
+from ..repository.device_data_retention_policy_repository import (
+    DeviceDataRetentionPolicyRepository,
+)
+from ..repository.device_data_storage_repository import DeviceDataStorageRepository
+
+
+class DeviceDataStorageService:
+    @inject
+    def __init__(
+        self,
+        device_data_storage_repository: DeviceDataStorageRepository,
+        device_data_retention_policy_repository: DeviceDataRetentionPolicyRepository,
+        team_repository: TeamRepository,
+    ) -> None:
+        self._device_data_storage_repository = device_data_storage_repository
+        self._device_data_retention_policy_repository = device_data_retention_policy_repository
+        self._team_repository = team_repository
+
+    async def get_storage_policy(self) -> DeviceDataStoragePolicyDto:
+        row = await self._device_data_storage_repository.find_policy()
+        return DeviceDataStoragePolicyDto.from_row(*row)
+
+    async def update_storage_policy(
+        self, *, policy_update_dto: DeviceDataStoragePolicyUpdateDto
+    ) -> DeviceDataStoragePolicyDto:
+        changes = policy_update_dto.model_dump(exclude_unset=True)
+
+        if changes.get("chunk_time_interval_hours") is not None:
+            await self._device_data_storage_repository.set_chunk_time_interval(
+                timedelta(hours=changes["chunk_time_interval_hours"])
+            )
+        if "compress_after_days" in changes:
+            await self._device_data_storage_repository.set_compression_policy(
+                _days_or_none(changes["compress_after_days"])
+            )
+        if "drop_after_days" in changes:
+            await self._device_data_storage_repository.set_retention_policy(
+                _days_or_none(changes["drop_after_days"])
+            )
+
+        return await self.get_storage_policy()
+
+    async def get_storage_stats(self) -> DeviceDataStorageStatsDto:
+        row = await self._device_data_storage_repository.find_stats()
+        return DeviceDataStorageStatsDto.from_row(row)
+
+    async def get_retention_policies(self) -> list[RetentionPolicyDto]:
+        policies = await self._device_data_retention_policy_repository.find_all()
+        return [RetentionPolicyDto.from_model(policy) for policy in policies]
+
+    async def set_retention_policy(
+        self, *, team_id: UUID, retention_policy_update_dto: RetentionPolicyUpdateDto
+    ) -> RetentionPolicyDto:
+        policy = await self._device_data_retention_policy_repository.find(team_id)
+        if policy is None:
+            if not await self._team_repository.exists_by_id(team_id):
+                raise TeamNotFoundException
+            policy = DeviceDataRetentionPolicy(
+                team_id=team_id, retention_days=retention_policy_update_dto.retention_days
+            )
+        else:
+            policy.retention_days = retention_policy_update_dto.retention_days
+
+        policy = await self._device_data_retention_policy_repository.save(policy)
+        return RetentionPolicyDto.from_model(policy)
+
+    async def delete_retention_policy(self, *, team_id: UUID) -> None:
+        policy = await self._device_data_retention_policy_repository.find(team_id)
+        if policy is None:
+            raise RetentionPolicyNotFoundException(team_id)
+        await self._device_data_retention_policy_repository.delete(policy)
+
+
+def _days_or_none(days: int | None) -> timedelta | None:
+    return None if days is None else timedelta(days=days)
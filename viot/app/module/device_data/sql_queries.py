@@ -1,7 +1,7 @@
 FROM_WHERE_CLAUSE: str = """
     FROM device_data
     WHERE device_data.device_id = :device_id
-    AND device_data.key = :key
+    AND device_data.key = ANY(:keys)
     AND device_data.ts >= :start_date AND device_data.ts <= :end_date
     GROUP BY device_data.key, bucket
     ORDER BY device_data.key, bucket
@@ -9,6 +9,7 @@ FROM_WHERE_CLAUSE: str = """
 
 FIND_AVG_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(COALESCE(device_data.long_v, 0)) AS long_value,
@@ -20,6 +21,7 @@ FIND_AVG_QUERY: str = """
 
 FIND_MAX_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     MAX(COALESCE(device_data.long_v, -9223372036854775807)) AS long_value,
@@ -29,6 +31,7 @@ FIND_MAX_QUERY: str = """
 
 FIND_MIN_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     MIN(COALESCE(device_data.long_v, 9223372036854775807)) AS long_value,
@@ -38,6 +41,7 @@ FIND_MIN_QUERY: str = """
 
 FIND_SUM_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(COALESCE(device_data.long_v, 0)) AS long_value,
@@ -47,6 +51,7 @@ FIND_SUM_QUERY: str = """
 
 FIND_COUNT_QUERY: str = """
     SELECT
+    device_data.key AS key,
     time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
     :bucket_width AS interval,
     SUM(CASE WHEN device_data.bool_v IS NULL THEN 0 ELSE 1 END) AS count_bool_value,
@@ -56,3 +61,377 @@ FIND_COUNT_QUERY: str = """
     SUM(CASE WHEN device_data.json_v IS NULL THEN 0 ELSE 1 END) AS count_json_value,
     MAX(device_data.ts) AS agg_values_last_ts
 """
+
+# Computes every aggregation type in a single scan, mapped by
+# AggregatedDataMapper.map_from_combined_rows. The columns mirror the single
+# aggregation queries above, including their NULL sentinels.
+FIND_COMBINED_QUERY: str = """
+    SELECT
+    device_data.key AS key,
+    time_bucket(:bucket_width, device_data.ts, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE(device_data.long_v, 0)) AS sum_long,
+    SUM(COALESCE(device_data.double_v, 0.0)) AS sum_double,
+    MIN(COALESCE(device_data.long_v, 9223372036854775807)) AS min_long,
+    MIN(COALESCE(device_data.double_v, 1.79769E+308)) AS min_double,
+    MAX(COALESCE(device_data.long_v, -9223372036854775807)) AS max_long,
+    MAX(COALESCE(device_data.double_v, -1.79769E+308)) AS max_double,
+    SUM(CASE WHEN device_data.bool_v IS NULL THEN 0 ELSE 1 END) AS count_bool_value,
+    SUM(CASE WHEN device_data.str_v IS NULL THEN 0 ELSE 1 END) AS count_str_value,
+    SUM(CASE WHEN device_data.long_v IS NULL THEN 0 ELSE 1 END) AS count_long_value,
+    SUM(CASE WHEN device_data.double_v IS NULL THEN 0 ELSE 1 END) AS count_double_value,
+    SUM(CASE WHEN device_data.json_v IS NULL THEN 0 ELSE 1 END) AS count_json_value,
+    MAX(device_data.ts) AS agg_values_last_ts
+"""
+
+# Rollup queries re-bucket a continuous aggregate (see DeviceDataRollup) into the
+# requested bucket width. They expose the same columns as the raw queries above,
+# so the result rows are mapped by the same AggregatedDataMapper methods. SUM of the
+# bigint counts is numeric, the counts are cast back to BIGINT like the raw counts.
+# The rollup buckets cover [start_date, end_date), the raw rows at end_date are added as
+# one-row buckets, so the range is inclusive like the raw queries.
+ROLLUP_SOURCE: str = """(
+        SELECT
+        {rollup}.key, {rollup}.bucket,
+        {rollup}.sum_long, {rollup}.sum_double,
+        {rollup}.count_bool, {rollup}.count_str, {rollup}.count_long,
+        {rollup}.count_double, {rollup}.count_json,
+        {rollup}.min_long, {rollup}.min_double, {rollup}.max_long, {rollup}.max_double,
+        {rollup}.first_ts, {rollup}.last_ts
+        FROM {rollup}
+        WHERE {rollup}.device_id = :device_id
+        AND {rollup}.key = ANY(:keys)
+        AND {rollup}.bucket >= :start_date AND {rollup}.bucket < :end_date
+        UNION ALL
+        SELECT
+        device_data.key, device_data.ts,
+        device_data.long_v, device_data.double_v,
+        CAST(device_data.bool_v IS NOT NULL AS INT), CAST(device_data.str_v IS NOT NULL AS INT),
+        CAST(device_data.long_v IS NOT NULL AS INT),
+        CAST(device_data.double_v IS NOT NULL AS INT),
+        CAST(device_data.json_v IS NOT NULL AS INT),
+        device_data.long_v, device_data.double_v, device_data.long_v, device_data.double_v,
+        device_data.ts, device_data.ts
+        FROM device_data
+        WHERE device_data.device_id = :device_id
+        AND device_data.key = ANY(:keys)
+        AND device_data.ts = :end_date
+    ) AS {rollup}"""
+
+ROLLUP_FROM_WHERE_CLAUSE: str = (
+    """
+    FROM """
+    + ROLLUP_SOURCE
+    + """
+    GROUP BY 1, 2
+    ORDER BY 1, 2
+"""
+)
+
+ROLLUP_FIND_AVG_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE({rollup}.sum_long, 0)) AS long_value,
+    SUM(COALESCE({rollup}.sum_double, 0)) AS double_value,
+    CAST(SUM({rollup}.count_long) AS BIGINT) AS count_long_value,
+    CAST(SUM({rollup}.count_double) AS BIGINT) AS count_double_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+ROLLUP_FIND_MAX_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    MAX(COALESCE({rollup}.max_long, -9223372036854775807)) AS long_value,
+    MAX(COALESCE({rollup}.max_double, -1.79769E+308)) AS double_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+ROLLUP_FIND_MIN_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    MIN(COALESCE({rollup}.min_long, 9223372036854775807)) AS long_value,
+    MIN(COALESCE({rollup}.min_double, 1.79769E+308)) AS double_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+ROLLUP_FIND_SUM_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE({rollup}.sum_long, 0)) AS long_value,
+    SUM(COALESCE({rollup}.sum_double, 0.0)) AS double_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+ROLLUP_FIND_COUNT_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    CAST(SUM({rollup}.count_bool) AS BIGINT) AS count_bool_value,
+    CAST(SUM({rollup}.count_str) AS BIGINT) AS count_str_value,
+    CAST(SUM({rollup}.count_long) AS BIGINT) AS count_long_value,
+    CAST(SUM({rollup}.count_double) AS BIGINT) AS count_double_value,
+    CAST(SUM({rollup}.count_json) AS BIGINT) AS count_json_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+ROLLUP_FIND_COMBINED_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    time_bucket(:bucket_width, {rollup}.bucket, :timezone, :start_date) AS bucket,
+    :bucket_width AS interval,
+    SUM(COALESCE({rollup}.sum_long, 0)) AS sum_long,
+    SUM(COALESCE({rollup}.sum_double, 0.0)) AS sum_double,
+    MIN(COALESCE({rollup}.min_long, 9223372036854775807)) AS min_long,
+    MIN(COALESCE({rollup}.min_double, 1.79769E+308)) AS min_double,
+    MAX(COALESCE({rollup}.max_long, -9223372036854775807)) AS max_long,
+    MAX(COALESCE({rollup}.max_double, -1.79769E+308)) AS max_double,
+    CAST(SUM({rollup}.count_bool) AS BIGINT) AS count_bool_value,
+    CAST(SUM({rollup}.count_str) AS BIGINT) AS count_str_value,
+    CAST(SUM({rollup}.count_long) AS BIGINT) AS count_long_value,
+    CAST(SUM({rollup}.count_double) AS BIGINT) AS count_double_value,
+    CAST(SUM({rollup}.count_json) AS BIGINT) AS count_json_value,
+    MAX({rollup}.last_ts) AS agg_values_last_ts
+"""
+
+# Gap-filled queries compute the final value of each aggregation type in SQL, so the
+# values can be filled by locf/interpolate. `{values}` is a list of
+# "<fill>(<FILL_*_VALUE>) AS <aggregation type>_value" columns.
+# time_bucket_gapfill has no origin, so the timestamps are shifted by :bucket_offset
+# to align the buckets to :start_date like the time_bucket queries above.
+FILL_QUERY: str = """
+    SELECT
+    filled.*,
+    filled.shifted_bucket + CAST(:bucket_offset AS INTERVAL) AS bucket,
+    :bucket_width AS interval
+    FROM (
+        SELECT
+        device_data.key AS key,
+        time_bucket_gapfill(
+            :bucket_width,
+            device_data.ts - CAST(:bucket_offset AS INTERVAL),
+            :timezone,
+            CAST(:start_date AS TIMESTAMPTZ) - CAST(:bucket_offset AS INTERVAL),
+            CAST(:end_date AS TIMESTAMPTZ) - CAST(:bucket_offset AS INTERVAL)
+        ) AS shifted_bucket,
+        {values}
+        FROM device_data
+        WHERE device_data.device_id = :device_id
+        AND device_data.key = ANY(:keys)
+        AND device_data.ts >= :start_date AND device_data.ts <= :end_date
+        GROUP BY 1, 2
+    ) AS filled
+    ORDER BY filled.key, filled.shifted_bucket
+"""
+
+FILL_AVG_VALUE: str = """COALESCE(
+        (SUM(COALESCE(device_data.long_v, 0)) + SUM(COALESCE(device_data.double_v, 0)))
+        / NULLIF(COUNT(device_data.long_v) + COUNT(device_data.double_v), 0),
+        0.0
+    )"""
+
+FILL_SUM_VALUE: str = """
+    SUM(COALESCE(device_data.long_v, 0)) + SUM(COALESCE(device_data.double_v, 0.0))"""
+
+FILL_MIN_VALUE: str = """LEAST(
+        MIN(COALESCE(device_data.long_v, 9223372036854775807)),
+        MIN(COALESCE(device_data.double_v, 1.79769E+308))
+    )"""
+
+FILL_MAX_VALUE: str = """GREATEST(
+        MAX(COALESCE(device_data.long_v, -9223372036854775807)),
+        MAX(COALESCE(device_data.double_v, -1.79769E+308))
+    )"""
+
+FILL_COUNT_VALUE: str = """CASE
+        WHEN COUNT(device_data.bool_v) <> 0 THEN COUNT(device_data.bool_v)
+        WHEN COUNT(device_data.str_v) <> 0 THEN COUNT(device_data.str_v)
+        WHEN COUNT(device_data.json_v) <> 0 THEN COUNT(device_data.json_v)
+        ELSE COUNT(device_data.long_v) + COUNT(device_data.double_v)
+    END"""
+
+ROLLUP_FILL_QUERY: str = (
+    """
+    SELECT
+    filled.*,
+    filled.shifted_bucket + CAST(:bucket_offset AS INTERVAL) AS bucket,
+    :bucket_width AS interval
+    FROM (
+        SELECT
+        {rollup}.key AS key,
+        time_bucket_gapfill(
+            :bucket_width,
+            {rollup}.bucket - CAST(:bucket_offset AS INTERVAL),
+            :timezone,
+            CAST(:start_date AS TIMESTAMPTZ) - CAST(:bucket_offset AS INTERVAL),
+            CAST(:end_date AS TIMESTAMPTZ) - CAST(:bucket_offset AS INTERVAL)
+        ) AS shifted_bucket,
+        {values}
+        FROM """
+    + ROLLUP_SOURCE
+    + """
+        GROUP BY 1, 2
+    ) AS filled
+    ORDER BY filled.key, filled.shifted_bucket
+"""
+)
+
+ROLLUP_FILL_AVG_VALUE: str = """COALESCE(
+        (SUM(COALESCE({rollup}.sum_long, 0)) + SUM(COALESCE({rollup}.sum_double, 0)))
+        / NULLIF(SUM({rollup}.count_long) + SUM({rollup}.count_double), 0),
+        0.0
+    )"""
+
+ROLLUP_FILL_SUM_VALUE: str = """
+    SUM(COALESCE({rollup}.sum_long, 0)) + SUM(COALESCE({rollup}.sum_double, 0.0))"""
+
+ROLLUP_FILL_MIN_VALUE: str = """LEAST(
+        MIN(COALESCE({rollup}.min_long, 9223372036854775807)),
+        MIN(COALESCE({rollup}.min_double, 1.79769E+308))
+    )"""
+
+ROLLUP_FILL_MAX_VALUE: str = """GREATEST(
+        MAX(COALESCE({rollup}.max_long, -9223372036854775807)),
+        MAX(COALESCE({rollup}.max_double, -1.79769E+308))
+    )"""
+
+# SUM of the bigint counts is numeric, which interpolate doesn't support
+ROLLUP_FILL_COUNT_VALUE: str = """CAST(CASE
+        WHEN SUM({rollup}.count_bool) <> 0 THEN SUM({rollup}.count_bool)
+        WHEN SUM({rollup}.count_str) <> 0 THEN SUM({rollup}.count_str)
+        WHEN SUM({rollup}.count_json) <> 0 THEN SUM({rollup}.count_json)
+        ELSE SUM({rollup}.count_long) + SUM({rollup}.count_double)
+    END AS BIGINT)"""
+
+# Per key summary of a device from the daily rollup, a few rows per key and day
+# instead of a scan of the raw device_data rows
+FIND_STATS_QUERY: str = """
+    SELECT
+    {rollup}.key AS key,
+    CAST(SUM(
+        {rollup}.count_bool + {rollup}.count_str + {rollup}.count_long
+        + {rollup}.count_double + {rollup}.count_json
+    ) AS BIGINT) AS count,
+    MIN({rollup}.first_ts) AS first_ts,
+    MAX({rollup}.last_ts) AS last_ts,
+    MIN({rollup}.min_long) AS min_long,
+    MIN({rollup}.min_double) AS min_double,
+    MAX({rollup}.max_long) AS max_long,
+    MAX({rollup}.max_double) AS max_double
+    FROM {rollup}
+    WHERE {rollup}.device_id = :device_id
+    GROUP BY {rollup}.key
+    ORDER BY {rollup}.key
+"""
+
+# Positional parameters, executed directly on the asyncpg connection
+EXPORT_QUERY: str = """
+    SELECT ts, key, bool_v, str_v, long_v, double_v, json_v
+    FROM device_data
+    WHERE device_id = $1
+    AND key = ANY($2::text[])
+    AND ts >= $3 AND ts <= $4
+    ORDER BY ts, key
+"""
+
+# Storage policies of the device_data hypertable, executed by DeviceDataStorageRepository
+FIND_STORAGE_POLICY_QUERY: str = """
+    SELECT
+    (
+        SELECT time_interval FROM timescaledb_information.dimensions
+        WHERE hypertable_name = 'device_data' AND dimension_number = 1
+    ) AS chunk_time_interval,
+    (
+        SELECT CAST(config ->> 'compress_after' AS INTERVAL) FROM timescaledb_information.jobs
+        WHERE hypertable_name = 'device_data' AND proc_name = 'policy_compression'
+    ) AS compress_after,
+    (
+        SELECT CAST(config ->> 'drop_after' AS INTERVAL) FROM timescaledb_information.jobs
+        WHERE hypertable_name = 'device_data' AND proc_name = 'policy_retention'
+    ) AS drop_after
+"""
+
+FIND_STORAGE_STATS_QUERY: str = """
+    SELECT
+    (SELECT COUNT(*) FROM show_chunks('device_data')) AS total_chunks,
+    COALESCE(stats.number_compressed_chunks, 0) AS compressed_chunks,
+    COALESCE(stats.before_compression_total_bytes, 0) AS before_compression_bytes,
+    COALESCE(stats.after_compression_total_bytes, 0) AS after_compression_bytes,
+    hypertable_size('device_data') AS total_bytes
+    FROM (SELECT 1) AS one
+    LEFT JOIN hypertable_compression_stats('device_data') AS stats ON TRUE
+"""
+
+SET_CHUNK_TIME_INTERVAL_QUERY: str = """
+    SELECT set_chunk_time_interval('device_data', CAST(:chunk_time_interval AS INTERVAL))
+"""
+
+REMOVE_COMPRESSION_POLICY_QUERY: str = """
+    SELECT remove_compression_policy('device_data', if_exists => TRUE)
+"""
+
+ADD_COMPRESSION_POLICY_QUERY: str = """
+    SELECT add_compression_policy(
+        'device_data', compress_after => CAST(:compress_after AS INTERVAL)
+    )
+"""
+
+REMOVE_RETENTION_POLICY_QUERY: str = """
+    SELECT remove_retention_policy('device_data', if_exists => TRUE)
+"""
+
+ADD_RETENTION_POLICY_QUERY: str = """
+    SELECT add_retention_policy('device_data', drop_after => CAST(:drop_after AS INTERVAL))
+"""
+
+# Bulk ingestion, rows are copied into a temporary table and moved into device_data.
+# COPY into device_data directly would abort the whole batch on a duplicate (device_id,
+# ts, key), the insert skips them and fires the device_data_latest trigger per new row.
+CREATE_INGEST_TABLE_QUERY: str = """
+    CREATE TEMP TABLE IF NOT EXISTS device_data_ingest
+    (LIKE device_data INCLUDING DEFAULTS) ON COMMIT DELETE ROWS
+"""
+
+INSERT_FROM_INGEST_TABLE_QUERY: str = """
+    INSERT INTO device_data (device_id, ts, key, bool_v, str_v, long_v, double_v, json_v)
+    SELECT device_id, ts, key, bool_v, str_v, long_v, double_v, json_v
+    FROM device_data_ingest
+    ON CONFLICT DO NOTHING
+    RETURNING device_id, ts, key, bool_v, str_v, long_v, double_v, CAST(json_v AS TEXT)
+"""
+
+# Bulk upsert of device attributes, one row per element of the parallel arrays.
+# Every typed column is replaced, so a value that changes type leaves no stale column.
+# xmax is 0 for rows inserted by the statement and set for updated ones.
+UPSERT_ATTRIBUTES_QUERY: str = """
+    INSERT INTO device_attribute AS da
+        (device_id, key, scope, last_update, bool_v, str_v, long_v, double_v, json_v)
+    SELECT
+        t.device_id, t.key, CAST(:scope AS SMALLINT), now(),
+        t.bool_v, t.str_v, t.long_v, t.double_v, CAST(t.json_v AS JSONB)
+    FROM unnest(
+        CAST(:device_ids AS UUID[]),
+        CAST(:keys AS TEXT[]),
+        CAST(:bool_vs AS BOOLEAN[]),
+        CAST(:str_vs AS TEXT[]),
+        CAST(:long_vs AS BIGINT[]),
+        CAST(:double_vs AS DOUBLE PRECISION[]),
+        CAST(:json_vs AS TEXT[])
+    ) AS t(device_id, key, bool_v, str_v, long_v, double_v, json_v)
+    ON CONFLICT (device_id, key, scope) DO UPDATE SET
+        last_update = EXCLUDED.last_update,
+        bool_v = EXCLUDED.bool_v,
+        str_v = EXCLUDED.str_v,
+        long_v = EXCLUDED.long_v,
+        double_v = EXCLUDED.double_v,
+        json_v = EXCLUDED.json_v
+    RETURNING da.device_id, da.key, da.last_update, (da.xmax = 0) AS created
+"""
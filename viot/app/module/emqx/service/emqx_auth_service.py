@@ -3,13 +3,13 @@ from datetime import UTC, datetime
 
 from injector import inject
 
-from app.module.device.constants import DeviceStatus, DeviceType
+from app.module.device.cache.device_presence_cache import DevicePresenceCache
+from app.module.device.constants import DeviceType
 from app.module.device.exception.device_exception import DeviceNotFoundException
 from app.module.device.model.device import Device
 from app.module.device.repository.device_repository import DeviceRepository
+from app.module.device_data.connect_log_writer import ConnectLogWriter
 from app.module.device_data.constants import ConnectStatus
-from app.module.device_data.model.connect_log import ConnectLog
-from app.module.device_data.repository.connect_log_repository import ConnectLogRepository
 from app.module.rule_action.constants import (
     MQTT_DEVICE_ATTRIBUTES_TOPIC,
     MQTT_DEVICE_DATA_TOPIC,
@@ -29,11 +29,13 @@ class EmqxDeviceAuthService:
     def __init__(
         self,
         device_repository: DeviceRepository,
-        connect_log_repository: ConnectLogRepository,
+        connect_log_writer: ConnectLogWriter,
+        device_presence_cache: DevicePresenceCache,
         mqtt_whitelist_service: MqttWhitelistService,
     ) -> None:
         self._device_repository = device_repository
-        self._connect_log_repository = connect_log_repository
+        self._connect_log_writer = connect_log_writer
+        self._device_presence_cache = device_presence_cache
         self._mqtt_whitelist_service = mqtt_whitelist_service
 
     async def authenticate(self, *, request_dto: EmqxAuthenRequestDto) -> EmqxAuthenResponseDto:
@@ -66,9 +68,8 @@ class EmqxDeviceAuthService:
             if device.disabled:
                 raise DeviceDisabledException(device.id)
 
-            # Update device info
-            device.last_connection = last_connection
-            device.status = DeviceStatus.ONLINE
+            # Written to the devices table by the presence flusher
+            await self._device_presence_cache.set_online(device.id, device.team_id, last_connection)
             connect_status = ConnectStatus.CONNECTED  # Successful connection
             device_acl = self._get_device_acl(device.device_type)
 
@@ -79,17 +80,13 @@ class EmqxDeviceAuthService:
             raise e
 
         finally:
-            # Save connection log (for both success and failure)
-
-            # TODO: Run in background or may be event emitter
+            # Save connection log (for both success and failure), written in the background
             if device:
-                await self._connect_log_repository.save(
-                    ConnectLog(
-                        ts=last_connection,
-                        device_id=request_dto.device_id,
-                        connect_status=connect_status,
-                        ip=request_dto.ip_address,
-                    )
+                self._connect_log_writer.enqueue(
+                    device_id=request_dto.device_id,
+                    ts=last_connection,
+                    connect_status=connect_status,
+                    ip=request_dto.ip_address,
                 )
 
     def _get_device_acl(self, device_type: DeviceType) -> list[dict[str, str]]:
@@ -6,11 +6,9 @@ from httpx import AsyncClient
 from injector import inject
 
 from app.common.exception import InternalServerException
-from app.module.device.constants import DeviceStatus
-from app.module.device.repository.device_repository import DeviceRepository
+from app.module.device.cache.device_presence_cache import DevicePresenceCache
+from app.module.device_data.connect_log_writer import ConnectLogWriter
 from app.module.device_data.constants import ConnectStatus
-from app.module.device_data.model.connect_log import ConnectLog
-from app.module.device_data.repository.connect_log_repository import ConnectLogRepository
 
 from ..config import emqx_settings
 from ..dto.emqx_event_dto import DeviceConnectedEventDto, DeviceDisconnectedEventDto
@@ -33,12 +31,12 @@ class EmqxEventService:
     def __init__(
         self,
         mqtt_whitelist_service: MqttWhitelistService,
-        connect_log_repository: ConnectLogRepository,
-        device_repository: DeviceRepository,
+        connect_log_writer: ConnectLogWriter,
+        device_presence_cache: DevicePresenceCache,
     ) -> None:
         self._mqtt_whitelist_service = mqtt_whitelist_service
-        self._connect_log_repository = connect_log_repository
-        self._device_repository = device_repository
+        self._connect_log_writer = connect_log_writer
+        self._device_presence_cache = device_presence_cache
 
     async def handle_device_connected(self, *, event: DeviceConnectedEventDto) -> None:
         logger.info(f"Device connected with id: {event.device_id}")
@@ -54,14 +52,12 @@ class EmqxEventService:
         if self._mqtt_whitelist_service.is_in_whitelist(event.device_id):
             return
 
-        await self._device_repository.update_device_status(status=DeviceStatus.OFFLINE)
-        await self._connect_log_repository.save(
-            ConnectLog(
-                ts=event.disconnected_at,
-                device_id=event.device_id,
-                connect_status=ConnectStatus.DISCONNECTED,
-                ip=event.ip_address,
-            )
+        await self._device_presence_cache.set_offline(event.device_id, event.disconnected_at)
+        self._connect_log_writer.enqueue(
+            device_id=event.device_id,
+            ts=event.disconnected_at,
+            connect_status=ConnectStatus.DISCONNECTED,
+            ip=event.ip_address,
         )
 
     async def _subscribe_device_topics(self, device_id: UUID) -> None:
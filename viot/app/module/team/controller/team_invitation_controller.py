@@ -10,7 +10,7 @@ from app.common.dto import PageQuery, PageSizeQuery
 from app.common.fastapi.serializer import JSONResponse
 from app.database.dependency import DependSession
 from app.module.auth.dependency import DependCurrentUser, RequireTeamPermission
-from app.module.auth.model.user import User
+from app.module.auth.dto.user_dto import CurrentUser
 from app.module.auth.permission import TeamInvitationPermission
 
 from ..dto.team_invitation_dto import (
@@ -63,7 +63,7 @@ class TeamInvitationController(Controller):
     async def create_team_invitation(
         self,
         *,
-        current_user: Annotated[User, DependCurrentUser],
+        current_user: Annotated[CurrentUser, DependCurrentUser],
         team_invitation_create_dto: Annotated[TeamInvitationCreateDto, Body(...)],
         team_id: Annotated[UUID, Path(...)],
     ) -> JSONResponse[TeamInvitationDto]:
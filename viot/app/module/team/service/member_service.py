@@ -1,9 +1,12 @@
+from functools import partial
 from uuid import UUID
 
 from injector import inject
 
+from app.database.context import after_commit
 from app.database.repository import Pageable, Sort
 from app.database.repository.pagination import SortDirection
+from app.module.auth.cache.team_permission_cache import TeamPermissionCache
 from app.module.auth.constants import TEAM_ROLE_OWNER
 from app.module.auth.exception.role_exception import RoleIdNotFoundException
 from app.module.auth.exception.user_exception import UserNotFoundException
@@ -23,10 +26,12 @@ class MemberService:
         user_repository: UserRepository,
         role_repository: RoleRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        team_permission_cache: TeamPermissionCache,
     ) -> None:
         self._user_repository = user_repository
         self._role_repository = role_repository
         self._user_team_role_repository = user_team_role_repository
+        self._team_permission_cache = team_permission_cache
 
     async def find_paging_members(
         self,
@@ -81,12 +86,14 @@ class MemberService:
         await self._user_team_role_repository.update_role_id(
             user_id=member_id, team_id=team_id, role_id=member_update_dto.role_id
         )
+        after_commit(partial(self._team_permission_cache.invalidate_member, member_id, team_id))
 
         member.role = role_name
         return MemberDto.from_model(member)
 
     async def delete_member(self, *, team_id: UUID, member_id: UUID) -> None:
         await self._user_repository.delete_user_by_id_and_team_id(member_id, team_id)
+        after_commit(partial(self._team_permission_cache.invalidate_member, member_id, team_id))
 
     def validate_sensitive_role(self, *, role_name: str) -> None:
         """Validate sensitive role"""
@@ -1,13 +1,16 @@
 import logging
 from datetime import UTC, datetime, timedelta
+from functools import partial
 from uuid import UUID
 
 from injector import inject
 
 from app.config import app_settings
+from app.database.context import after_commit
 from app.database.repository import Filter, Pageable
+from app.module.auth.cache.team_permission_cache import TeamPermissionCache
+from app.module.auth.dto.user_dto import CurrentUser
 from app.module.auth.exception.user_exception import UserNotFoundException
-from app.module.auth.model.user import User
 from app.module.auth.model.user_team_role import UserTeamRole
 from app.module.auth.repository.role_repository import RoleRepository
 from app.module.auth.repository.user_repository import UserRepository
@@ -43,6 +46,7 @@ class TeamInvitationService:
         team_invitation_repository: TeamInvitationRepository,
         user_team_role_repository: UserTeamRoleRepository,
         role_repository: RoleRepository,
+        team_permission_cache: TeamPermissionCache,
     ) -> None:
         self._email_service = email_service
         self._user_repository = user_repository
@@ -50,6 +54,7 @@ class TeamInvitationService:
         self._team_invitation_repository = team_invitation_repository
         self._user_team_role_repository = user_team_role_repository
         self._role_repository = role_repository
+        self._team_permission_cache = team_permission_cache
 
     async def get_pageable_team_invitations(
         self, team_id: UUID, page: int, page_size: int
@@ -63,7 +68,11 @@ class TeamInvitationService:
         return PagingTeamInvitationDto.from_page(team_invitation_page)
 
     async def create_team_invitation(
-        self, *, team_id: UUID, inviter: User, team_invitation_create_dto: TeamInvitationCreateDto
+        self,
+        *,
+        team_id: UUID,
+        inviter: CurrentUser,
+        team_invitation_create_dto: TeamInvitationCreateDto,
     ) -> TeamInvitationDto:
         invitee = await self._user_repository.find_by_email(team_invitation_create_dto.email)
         if invitee is None:
@@ -116,6 +125,9 @@ class TeamInvitationService:
         await self._user_team_role_repository.save(
             UserTeamRole(user_id=invitee_id, team_id=invitation.team_id, role_id=role_id)
         )
+        after_commit(
+            partial(self._team_permission_cache.invalidate_member, invitee_id, invitation.team_id)
+        )
 
         # Delete invitation
         await self._team_invitation_repository.delete(invitation)
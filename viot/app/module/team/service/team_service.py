@@ -1,9 +1,12 @@
 import logging
+from functools import partial
 from uuid import UUID
 
 from injector import inject
 from slugify import slugify
 
+from app.database.context import after_commit
+from app.module.auth.cache.team_permission_cache import TeamPermissionCache
 from app.module.auth.constants import TEAM_ROLE_OWNER, TEAM_ROLE_OWNER_DESCRIPTION
 from app.module.auth.dto.role_dto import RoleCreateDto
 from app.module.auth.model.user_team_role import UserTeamRole
@@ -28,11 +31,13 @@ class TeamService:
         team_role_service: TeamRoleService,
         permission_repository: PermissionRepository,
         user_team_role_repository: UserTeamRoleRepository,
+        team_permission_cache: TeamPermissionCache,
     ) -> None:
         self._team_repository = team_repository
         self._team_role_service = team_role_service
         self._permission_repository = permission_repository
         self._user_team_role_repository = user_team_role_repository
+        self._team_permission_cache = team_permission_cache
 
     async def get_teams_with_role_by_user_id(
         self, *, user_id: UUID
@@ -107,6 +112,7 @@ class TeamService:
 
     async def delete_team_by_id(self, *, team_id: UUID) -> None:
         await self._team_repository.delete_by_id(team_id)
+        after_commit(partial(self._team_permission_cache.invalidate_team, team_id))
 
     async def delete_all_teams_by_user_id(self, *, user_id: UUID) -> None:
         await self._team_repository.delete_all_by_user_id(user_id)
@@ -0,0 +1,52 @@
+"""
+Measure LTTB downsampling of a single key, from DB rows to the reduced columns.
+
+The path mirrors `DeviceDataService.get_downsampled_columns_by_keys` after the rows
+are fetched, `lttb` times the NumPy bucket ranking alone.
+
+Usage:
+    python -m benchmarks.lttb_downsampling [--points 1000000] [--max-points 1000] [--repeat 5]
+"""
+
+import argparse
+import math
+import timeit
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+import numpy as np
+
+from app.module.device_data.downsampling import lttb_indices
+from app.module.device_data.service.device_data_service import _downsample
+
+
+def _make_rows(points: int) -> list[tuple[str, datetime, Any, Any, Any, Any, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        ("key", start + timedelta(seconds=i), None, None, None, math.sin(i / 500), None)
+        for i in range(points)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=1_000_000)
+    parser.add_argument("--max-points", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = _make_rows(args.points)
+    x = np.arange(args.points, dtype=np.float64)
+    y = np.sin(x / 500)
+
+    benchmarks = (
+        ("lttb", lambda: lttb_indices(x, y, args.max_points)),
+        ("rows", lambda: _downsample(rows, args.max_points)),  # type: ignore
+    )
+    for name, run in benchmarks:
+        best = min(timeit.repeat(run, number=1, repeat=args.repeat))
+        print(f"{name:>5}: {best * 1000:8.2f} ms  {args.points} -> {args.max_points} points")
+
+
+if __name__ == "__main__":
+    main()
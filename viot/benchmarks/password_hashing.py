@@ -0,0 +1,105 @@
+"""
+Measure the latency of an unrelated endpoint while a burst of logins is verified.
+
+A minimal app serves `/login`, which verifies a bcrypt password the way `AuthService.login`
+does, and `/ping`, which does nothing. `/ping` is called in a loop during the burst.
+The inline path calls bcrypt on the event loop as before, the pool path goes through
+`PasswordService`. Logins rejected by the backpressure are counted, not retried.
+
+Usage:
+    python -m benchmarks.password_hashing [--logins 50] [--rounds 12] [--workers 4]
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from app.module.auth.config import auth_settings
+from app.module.auth.exception.auth_exception import PasswordHashingBusyException
+from app.module.auth.service.password_service import PasswordService
+from app.module.auth.utils.password_utils import hash_password, verify_password
+
+PASSWORD = "!abcABC123"
+PING_INTERVAL_SEC = 0.001
+
+
+def _create_app(password_service: PasswordService | None, hashed_password: bytes) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/login")
+    async def login() -> dict[str, bool]:
+        if password_service is None:
+            return {"ok": verify_password(PASSWORD, hashed_password)}
+        try:
+            return {"ok": await password_service.verify(PASSWORD, hashed_password)}
+        except PasswordHashingBusyException:
+            return {"ok": False}
+
+    @app.get("/ping")
+    async def ping() -> dict[str, bool]:
+        return {"ok": True}
+
+    return app
+
+
+async def _run(app: FastAPI, logins: int) -> tuple[list[float], int, float]:
+    latencies: list[float] = []
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        burst_done = asyncio.Event()
+
+        async def ping() -> None:
+            # Timed from when the ping is due, so time spent waiting for a blocked loop counts
+            while not burst_done.is_set():
+                due = time.perf_counter() + PING_INTERVAL_SEC
+                await asyncio.sleep(PING_INTERVAL_SEC)
+                await client.get("/ping")
+                latencies.append(time.perf_counter() - due)
+
+        async def burst() -> int:
+            try:
+                responses = await asyncio.gather(*(client.post("/login") for _ in range(logins)))
+            finally:
+                burst_done.set()
+            return sum(not r.json()["ok"] for r in responses)
+
+        start = time.perf_counter()
+        pinger = asyncio.create_task(ping())
+        rejected = await burst()
+        elapsed = time.perf_counter() - start
+        await pinger
+
+    return latencies, rejected, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--workers", type=int, default=auth_settings.PASSWORD_HASH_WORKERS)
+    parser.add_argument("--max-pending", type=int, default=auth_settings.PASSWORD_HASH_MAX_PENDING)
+    args = parser.parse_args()
+
+    auth_settings.PASSWORD_HASH_WORKERS = args.workers
+    auth_settings.PASSWORD_HASH_MAX_PENDING = args.max_pending
+    hashed_password = hash_password(PASSWORD, salt_rounds=args.rounds)
+    password_service = PasswordService()
+
+    for name, service in (("inline", None), ("pool", password_service)):
+        app = _create_app(service, hashed_password)
+        latencies, rejected, elapsed = asyncio.run(_run(app, args.logins))
+        p50 = statistics.median(latencies) * 1000
+        p99 = statistics.quantiles(latencies, n=100)[98] * 1000 if len(latencies) > 1 else p50
+        print(
+            f"{name:>6}: ping p50 {p50:8.2f} ms  p99 {p99:8.2f} ms  ({len(latencies)} pings)"
+            f"  burst {elapsed * 1000:8.0f} ms  {rejected} rejected"
+        )
+
+    password_service.shutdown()
+
+
+if __name__ == "__main__":
+    main()
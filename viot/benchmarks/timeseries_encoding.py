@@ -0,0 +1,73 @@
+"""
+Compare the rows and columnar encodings of a timeseries response.
+
+The rows path mirrors `DeviceDataService.get_timeseries_data_by_keys` followed by
+`JSONResponse.render`, the columnar path mirrors `get_timeseries_columns_by_keys`
+followed by `MsgspecJSONResponse.render`.
+
+Usage:
+    python -m benchmarks.timeseries_encoding [--points 10000] [--keys 1] [--repeat 20]
+"""
+
+import argparse
+import timeit
+from collections import defaultdict
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from app.common.fastapi.serializer import JSONResponse, MsgspecJSONResponse
+from app.module.device_data.dto.device_data_dto import DataPointDto, TimeseriesColumns
+
+
+class _Row:
+    """Stand-in for a DeviceData ORM object"""
+
+    __slots__ = ("key", "ts", "value")
+
+    def __init__(self, key: str, ts: datetime, value: Any) -> None:
+        self.key = key
+        self.ts = ts
+        self.value = value
+
+
+def _make_rows(points: int, keys: int) -> list[tuple[str, datetime, Any, Any, Any, Any, Any]]:
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        (f"key{i % keys}", start + timedelta(seconds=i), None, None, None, i * 0.5, None)
+        for i in range(points)
+    ]
+
+
+def encode_rows(rows: list[tuple[str, datetime, Any, Any, Any, Any, Any]]) -> bytes:
+    result_map: defaultdict[str, list[DataPointDto]] = defaultdict(list)
+    for key, ts, *values in rows:
+        value = next((v for v in values if v is not None), None)
+        result_map[key].append(DataPointDto.from_model(_Row(key, ts, value)))  # type: ignore
+    return bytes(JSONResponse(content=result_map).body)
+
+
+def encode_columnar(rows: list[tuple[str, datetime, Any, Any, Any, Any, Any]]) -> bytes:
+    result_map: defaultdict[str, TimeseriesColumns] = defaultdict(TimeseriesColumns)
+    for key, ts, *values in rows:
+        columns = result_map[key]
+        columns.ts.append(ts)
+        columns.values.append(next((v for v in values if v is not None), None))
+    return bytes(MsgspecJSONResponse(content=result_map).body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=10_000)
+    parser.add_argument("--keys", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = _make_rows(args.points, args.keys)
+    for name, encode in (("rows", encode_rows), ("columnar", encode_columnar)):
+        best = min(timeit.repeat(lambda: encode(rows), number=1, repeat=args.repeat))  # noqa: B023
+        size = len(encode(rows))
+        print(f"{name:>9}: {best * 1000:8.2f} ms  {size / 1024:8.1f} KiB")
+
+
+if __name__ == "__main__":
+    main()
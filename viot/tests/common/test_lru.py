@@ -0,0 +1,78 @@
+from app.common.lru import TTLCache
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_cache_expires_entries() -> None:
+    # given
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_sec=5, clock=clock)
+    cache.set("a", 1)
+
+    # when
+    clock.now = 4.9
+    before = cache.get("a")
+    clock.now = 5
+    after = cache.get("a")
+
+    # then
+    assert before == 1
+    assert after is None
+    assert len(cache) == 0
+
+
+def test_ttl_cache_expires_entries_with_shorter_ttl() -> None:
+    # given
+    clock = FakeClock()
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl_sec=5, clock=clock)
+    cache.set("short", 1, ttl_sec=2)
+    cache.set("long", 2, ttl_sec=60)
+
+    # when
+    clock.now = 2
+    short = cache.get("short")
+    long_before = cache.get("long")
+    clock.now = 5
+    long_after = cache.get("long")
+
+    # then
+    assert short is None
+    assert long_before == 2
+    assert long_after is None
+
+
+def test_ttl_cache_evicts_least_recently_used() -> None:
+    # given
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl_sec=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+
+    # when
+    cache.set("c", 3)
+
+    # then
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+
+
+def test_ttl_cache_pop_where() -> None:
+    # given
+    cache: TTLCache[tuple[str, str], int] = TTLCache(maxsize=10, ttl_sec=60)
+    cache.set(("user1", "team1"), 1)
+    cache.set(("user2", "team1"), 2)
+    cache.set(("user1", "team2"), 3)
+
+    # when
+    cache.pop_where(lambda key: key[1] == "team1")
+
+    # then
+    assert len(cache) == 1
+    assert cache.get(("user1", "team2")) == 3
@@ -7,6 +7,7 @@ import pytest_asyncio
 import uvloop
 from httpx import ASGITransport, AsyncClient
 from redis.asyncio import Redis
+from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
 from sqlalchemy.pool import NullPool
 
@@ -14,9 +15,10 @@ from tests.utils import load_env  # type: ignore # noqa: F401
 from app import models  # type: ignore # noqa: F401
 from app.config import app_settings
 from app.database.base import Base
-from app.database.context import session_ctx
+from app.database.context import run_after_commit, session_ctx
 from app.database.dependency import get_session
 from app.database.engine import create_async_engine
+from tests.utils import migrations
 from tests.utils.email import MockEmailService
 from tests.utils.testcontainers import DbContainer, FixedAsyncRedisContainer, FixedPostgresContainer
 
@@ -33,6 +35,18 @@ def event_loop_policy() -> uvloop.EventLoopPolicy:
     return uvloop.EventLoopPolicy()
 
 
+@pytest.fixture
+def session_context() -> Generator[AsyncSession, None, None]:
+    """
+    Session of the services under test, without a database. Collects their
+    `after_commit` callbacks, tests commit with `run_after_commit`.
+    """
+    session = AsyncSession()
+    token = session_ctx.set(session)
+    yield session
+    session_ctx.reset(token)
+
+
 # All below fixtures are used for api tests
 
 
@@ -50,6 +64,17 @@ async def redis_client() -> AsyncGenerator[Redis, None]:  # type: ignore
         yield async_redis_client
 
 
+@pytest_asyncio.fixture(autouse=True)  # type: ignore
+async def disconnect_redis_client(request: pytest.FixtureRequest) -> AsyncGenerator[None, None]:
+    """
+    Tests run in their own event loop, and Redis connections are bound to the loop that
+    opened them. The connections of the session client are closed after each test.
+    """
+    yield
+    if "redis_client" in request.fixturenames:
+        await request.getfixturevalue("redis_client").connection_pool.disconnect()
+
+
 @pytest.fixture(scope="session")
 def patch_redis_client(redis_client: Redis) -> Generator[None, None, None]:  # type: ignore
     with patch(
@@ -79,6 +104,23 @@ async def async_session(async_engine: AsyncEngine) -> AsyncGenerator[AsyncSessio
         yield session
 
 
+@pytest_asyncio.fixture(scope="session")  # type: ignore
+async def migrated_engine(async_engine: AsyncEngine) -> AsyncGenerator[AsyncEngine, None]:
+    """
+    Engine of a separate database migrated to head, with the TimescaleDB objects
+    (hypertables, continuous aggregates) that create_all doesn't create.
+    """
+    async with async_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("CREATE DATABASE viot_migrated"))
+
+    engine = create_async_engine(async_engine.url.set(database="viot_migrated"), poolclass=NullPool)
+    async with engine.connect() as conn:
+        await conn.run_sync(migrations.upgrade)
+    yield engine
+    await engine.dispose()
+
+
 @pytest_asyncio.fixture(scope="session")  # type: ignore
 async def client(
     async_engine: AsyncEngine, patch_redis_client: None, patch_email_service: None
@@ -97,6 +139,7 @@ async def client(
             try:
                 async with session.begin():
                     yield
+                await run_after_commit(session)
             finally:
                 session_ctx.reset(token)
 
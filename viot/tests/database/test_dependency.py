@@ -0,0 +1,42 @@
+from unittest.mock import AsyncMock
+
+import pytest
+
+from app.database.context import after_commit, session_ctx
+from app.database.dependency import get_session
+
+
+async def test_after_commit_callbacks_run_once_the_transaction_committed() -> None:
+    # given
+    states: list[bool] = []
+
+    async def callback() -> None:
+        states.append(session_ctx.get().in_transaction())
+
+    session = get_session()
+    await anext(session)
+
+    # when
+    after_commit(callback)
+    after_commit(callback)
+    assert states == []
+    with pytest.raises(StopAsyncIteration):
+        await anext(session)
+
+    # then
+    assert states == [False, False]
+
+
+async def test_after_commit_callbacks_are_dropped_on_rollback() -> None:
+    # given
+    callback = AsyncMock()
+    session = get_session()
+    await anext(session)
+
+    # when
+    after_commit(callback)
+    with pytest.raises(ValueError):
+        await session.athrow(ValueError())
+
+    # then
+    callback.assert_not_awaited()
@@ -1,3 +1,4 @@
+from datetime import UTC, datetime
 from typing import Any
 from unittest.mock import Mock
 
@@ -6,7 +7,14 @@ from sqlalchemy import Select
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.database.base import Base
-from app.database.repository.pagination import Filter, FilterOperator, Pageable, Sort
+from app.database.repository.pagination import (
+    Filter,
+    FilterOperator,
+    Pageable,
+    Sort,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 class ProductTest(Base):
@@ -83,3 +91,16 @@ def test_pageable() -> None:
 
     mock_query.where.assert_called_once()
     assert result is not None
+
+
+def test_cursor_round_trip() -> None:
+    values = (datetime(2024, 1, 1, tzinfo=UTC), "temperature")
+    cursor = encode_cursor(values)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, tuple[datetime, str]) == values
+
+
+@pytest.mark.parametrize("cursor", ["not a cursor", encode_cursor([1, 2, 3])])
+def test_decode_cursor_invalid(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, tuple[datetime, str])
@@ -1,7 +1,10 @@
+from collections.abc import Generator
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.context import run_after_commit
 from app.module.auth.dto.auth_dto import LoginDto, RegisterDto
 from app.module.auth.exception.auth_exception import (
     InvalidCredentialsException,
@@ -9,6 +12,8 @@ from app.module.auth.exception.auth_exception import (
 )
 from app.module.auth.exception.user_exception import UserEmailAlreadyExistsException
 from app.module.auth.service.auth_service import AuthService
+from app.module.auth.service.password_service import PasswordService
+from app.module.auth.utils.password_utils import hash_password
 
 
 @pytest.fixture
@@ -31,32 +36,53 @@ def mock_password_reset_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_current_user_cache() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def password_service() -> Generator[PasswordService, None, None]:
+    service = PasswordService()
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def mock_refresh_token_store() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def auth_service(
     mock_email_service: Mock,
     mock_user_repository: AsyncMock,
     mock_refresh_token_repository: AsyncMock,
     mock_password_reset_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    password_service: PasswordService,
+    mock_refresh_token_store: AsyncMock,
 ) -> AuthService:
     return AuthService(
         email_service=mock_email_service,
         user_repository=mock_user_repository,
         refresh_token_repository=mock_refresh_token_repository,
         password_reset_repository=mock_password_reset_repository,
+        current_user_cache=mock_current_user_cache,
+        password_service=password_service,
+        refresh_token_store=mock_refresh_token_store,
     )
 
 
 async def test_login(
     auth_service: AuthService,
     mock_user_repository: AsyncMock,
-    mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
     mock_user: Mock,
-    mock_refresh_token: Mock,
 ) -> None:
     # given
     login_dto = LoginDto(email=mock_user.email, password=mock_user.raw_password)
     mock_user_repository.find_by_email.return_value = mock_user
-    mock_refresh_token_repository.save.return_value = mock_refresh_token
     # when
     result = await auth_service.login(login_dto=login_dto)
 
@@ -64,6 +90,30 @@ async def test_login(
     assert result.access_token is not None
     assert result.refresh_token is not None
     assert result.access_token_expires_at is not None
+    mock_refresh_token_store.save.assert_awaited_once_with(result.refresh_token, str(mock_user.id))
+    mock_user_repository.update_password.assert_not_called()
+
+
+async def test_login_rehashes_password_of_previous_cost(
+    auth_service: AuthService,
+    mock_user_repository: AsyncMock,
+    password_service: PasswordService,
+    mock_user: Mock,
+) -> None:
+    # given
+    login_dto = LoginDto(email=mock_user.email, password=mock_user.raw_password)
+    mock_user.password = hash_password(mock_user.raw_password, salt_rounds=4)
+    mock_user_repository.find_by_email.return_value = mock_user
+
+    # when
+    await auth_service.login(login_dto=login_dto)
+
+    # then
+    mock_user_repository.update_password.assert_awaited_once()
+    user_id, hashed_password = mock_user_repository.update_password.await_args.args
+    assert user_id == mock_user.id
+    assert not password_service.needs_rehash(hashed_password)
+    assert await password_service.verify(mock_user.raw_password, hashed_password)
 
 
 async def test_login_raises_when_invalid_password(
@@ -153,19 +203,42 @@ async def test_register_raises_when_email_already_exists(
 
 
 async def test_logout(
-    auth_service: AuthService, mock_refresh_token_repository: AsyncMock, mock_user: Mock
+    auth_service: AuthService,
+    mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
 ) -> None:
     # given
+    mock_refresh_token_store.delete.return_value = True
 
     # when
     await auth_service.logout(refresh_token="refresh_token")
 
     # then
-    mock_refresh_token_repository.update_token_expires_at.assert_called_once()
+    mock_refresh_token_store.delete.assert_awaited_once_with("refresh_token")
+    mock_refresh_token_repository.delete_by_token.assert_not_called()
+
+
+async def test_logout_deletes_legacy_refresh_token(
+    auth_service: AuthService,
+    mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
+) -> None:
+    # given
+    mock_refresh_token_store.delete.return_value = False
+
+    # when
+    await auth_service.logout(refresh_token="refresh_token")
+
+    # then
+    mock_refresh_token_repository.delete_by_token.assert_awaited_once_with("refresh_token")
 
 
 async def test_verify_account(
-    auth_service: AuthService, mock_user_repository: AsyncMock, mock_user: Mock
+    auth_service: AuthService,
+    mock_user_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    mock_user: Mock,
+    session_context: AsyncSession,
 ) -> None:
     # given
     mock_user_repository.update_email_verified_at.return_value = None
@@ -179,6 +252,9 @@ async def test_verify_account(
 
     # then
     mock_user_repository.update_email_verified_at.assert_called_once()
+    mock_current_user_cache.invalidate.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_current_user_cache.invalidate.assert_awaited_once_with(mock_user.id)
 
 
 async def test_verify_account_raises_when_invalid_token(
@@ -12,6 +12,7 @@ from app.module.auth.exception.auth_exception import (
     ResetPasswordTokenExpiredException,
 )
 from app.module.auth.service.password_reset_service import PasswordResetService
+from app.module.auth.service.password_service import PasswordService
 
 
 @pytest.fixture(scope="function", autouse=True)
@@ -36,16 +37,34 @@ def mock_password_reset_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def password_service() -> Generator[PasswordService, None, None]:
+    service = PasswordService()
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def mock_password_reset_token_store() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get.return_value = None
+    return mock
+
+
 @pytest.fixture
 def password_reset_service(
     mock_email_service: Mock,
     mock_user_repository: AsyncMock,
     mock_password_reset_repository: AsyncMock,
+    password_service: PasswordService,
+    mock_password_reset_token_store: AsyncMock,
 ) -> PasswordResetService:
     return PasswordResetService(
         email_service=mock_email_service,
         user_repository=mock_user_repository,
         password_reset_repository=mock_password_reset_repository,
+        password_service=password_service,
+        password_reset_token_store=mock_password_reset_token_store,
     )
 
 
@@ -53,6 +72,7 @@ async def test_forgot_password_correctly(
     password_reset_service: PasswordResetService,
     mock_email_service: Mock,
     mock_user_repository: AsyncMock,
+    mock_password_reset_token_store: AsyncMock,
     mock_user: Mock,
 ) -> None:
     # given
@@ -64,7 +84,11 @@ async def test_forgot_password_correctly(
 
     # then
     mock_user_repository.find_by_email.assert_called_once_with(email=mock_user.email)
+    mock_password_reset_token_store.save.assert_awaited_once()
+    token, email = mock_password_reset_token_store.save.await_args.args
+    assert email == mock_user.email
     mock_email_service.send_reset_password_email.assert_called_once()
+    assert mock_email_service.send_reset_password_email.call_args.kwargs["link"].endswith(token)
 
 
 async def test_forgot_password_correctly_when_user_not_found(
@@ -84,6 +108,46 @@ async def test_forgot_password_correctly_when_user_not_found(
 
 
 async def test_reset_password_correctly(
+    password_reset_service: PasswordResetService,
+    mock_user_repository: AsyncMock,
+    mock_password_reset_repository: AsyncMock,
+    mock_password_reset_token_store: AsyncMock,
+    mock_user: Mock,
+) -> None:
+    # given
+    mock_password_reset_token_store.get.return_value = mock_user.email
+    mock_password_reset_token_store.delete.return_value = True
+    mock_user_repository.find_by_email.return_value = mock_user
+
+    # when
+    dto = ResetPasswordDto(token="token", password=mock_user.raw_password + "diff")
+    await password_reset_service.reset_password(reset_password_dto=dto)
+
+    # then
+    mock_user_repository.find_by_email.assert_called_once_with(email=mock_user.email)
+    mock_user_repository.update_password.assert_called_once()
+    mock_password_reset_token_store.delete.assert_awaited_once_with("token")
+    mock_password_reset_repository.find_by_token.assert_not_called()
+
+
+async def test_reset_password_raises_when_token_consumed_concurrently(
+    password_reset_service: PasswordResetService,
+    mock_user_repository: AsyncMock,
+    mock_password_reset_token_store: AsyncMock,
+    mock_user: Mock,
+) -> None:
+    # given
+    mock_password_reset_token_store.get.return_value = mock_user.email
+    mock_password_reset_token_store.delete.return_value = False
+    mock_user_repository.find_by_email.return_value = mock_user
+
+    # when
+    dto = ResetPasswordDto(token="token", password=mock_user.raw_password + "diff")
+    with pytest.raises(InvalidResetPasswordTokenException):
+        await password_reset_service.reset_password(reset_password_dto=dto)
+
+
+async def test_reset_password_correctly_with_legacy_token(
     password_reset_service: PasswordResetService,
     mock_user_repository: AsyncMock,
     mock_password_reset_repository: AsyncMock,
@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import Generator
+
+import pytest
+
+from app.module.auth.config import auth_settings
+from app.module.auth.exception.auth_exception import PasswordHashingBusyException
+from app.module.auth.service.password_service import PasswordService
+from app.module.auth.utils.password_utils import hash_password
+
+
+@pytest.fixture
+def password_service(monkeypatch: pytest.MonkeyPatch) -> Generator[PasswordService, None, None]:
+    monkeypatch.setattr(auth_settings, "BCRYPT_SALT_ROUNDS", 4)
+    monkeypatch.setattr(auth_settings, "PASSWORD_HASH_WORKERS", 1)
+    monkeypatch.setattr(auth_settings, "PASSWORD_HASH_MAX_PENDING", 2)
+    service = PasswordService()
+    yield service
+    service.shutdown()
+
+
+async def test_hash_and_verify(password_service: PasswordService) -> None:
+    # when
+    hashed_password = await password_service.hash("!abcABC123")
+
+    # then
+    assert hashed_password.startswith(b"$2b$04$")
+    assert await password_service.verify("!abcABC123", hashed_password)
+    assert not await password_service.verify("!abcABC124", hashed_password)
+    assert password_service.pending == 0
+
+
+async def test_needs_rehash(password_service: PasswordService) -> None:
+    # then
+    assert not password_service.needs_rehash(hash_password("!abcABC123", salt_rounds=4))
+    assert password_service.needs_rehash(hash_password("!abcABC123", salt_rounds=5))
+    assert password_service.needs_rehash(b"not a bcrypt hash")
+
+
+async def test_rejects_calls_beyond_max_pending(password_service: PasswordService) -> None:
+    # given
+    pending = [asyncio.create_task(password_service.hash("!abcABC123")) for _ in range(2)]
+    await asyncio.sleep(0)
+
+    # when
+    with pytest.raises(PasswordHashingBusyException):
+        await password_service.hash("!abcABC123")
+
+    # then
+    await asyncio.gather(*pending)
+    assert password_service.pending == 0
+    assert await password_service.verify("!abcABC123", pending[0].result())
+
+
+async def test_does_not_block_event_loop(
+    password_service: PasswordService, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # given
+    monkeypatch.setattr(password_service, "_salt_rounds", 10)
+    ticks = 0
+
+    async def tick() -> None:
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    ticker = asyncio.create_task(tick())
+
+    # when
+    await password_service.hash("!abcABC123")
+    ticker.cancel()
+
+    # then
+    assert ticks > 1
@@ -17,11 +17,22 @@ def mock_permission_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_team_permission_cache() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get.return_value = ("1", None)
+    return mock
+
+
 @pytest.fixture
 def permission_service(
-    mock_permission_repository: AsyncMock, mock_user_team_role_repository: AsyncMock
+    mock_permission_repository: AsyncMock,
+    mock_user_team_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
 ) -> PermissionService:
-    return PermissionService(mock_permission_repository, mock_user_team_role_repository)
+    return PermissionService(
+        mock_permission_repository, mock_user_team_role_repository, mock_team_permission_cache
+    )
 
 
 async def test_get_all_permissions(
@@ -44,24 +55,72 @@ async def test_get_all_permissions(
 async def test_validate_user_access_team_resource(
     permission_service: PermissionService,
     mock_user_team_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
 ) -> None:
     # given
-    mock_user_team_role_repository.is_user_has_permission_in_team.return_value = True
+    user_id = uuid4()
+    team_id = uuid4()
+    mock_user_team_role_repository.find_permission_scopes_in_team.return_value = {
+        "team:resource:read"
+    }
 
     # when
     await permission_service.validate_user_access_team_resource(
-        user_id=uuid4(),
-        team_id=uuid4(),
+        user_id=user_id,
+        team_id=team_id,
         permission_scope="team:resource:read",
     )
 
+    # then
+    mock_team_permission_cache.set.assert_awaited_once_with(
+        user_id, team_id, "1", frozenset({"team:resource:read"})
+    )
+
 
 async def test_validate_user_access_team_resource_when_user_does_not_have_permission(
     permission_service: PermissionService,
     mock_user_team_role_repository: AsyncMock,
 ) -> None:
     # given
-    mock_user_team_role_repository.is_user_has_permission_in_team.return_value = False
+    mock_user_team_role_repository.find_permission_scopes_in_team.return_value = {
+        "team:resource:read"
+    }
+
+    # when
+    with pytest.raises(ResourceAccessDeniedException):
+        await permission_service.validate_user_access_team_resource(
+            user_id=uuid4(),
+            team_id=uuid4(),
+            permission_scope="team:resource:write",
+        )
+
+
+async def test_validate_user_access_team_resource_from_cache(
+    permission_service: PermissionService,
+    mock_user_team_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
+) -> None:
+    # given
+    mock_team_permission_cache.get.return_value = ("", frozenset({"team:resource:read"}))
+
+    # when
+    await permission_service.validate_user_access_team_resource(
+        user_id=uuid4(),
+        team_id=uuid4(),
+        permission_scope="team:resource:read",
+    )
+
+    # then
+    mock_user_team_role_repository.find_permission_scopes_in_team.assert_not_called()
+    mock_team_permission_cache.set.assert_not_called()
+
+
+async def test_validate_user_access_team_resource_when_user_is_not_member_from_cache(
+    permission_service: PermissionService,
+    mock_team_permission_cache: AsyncMock,
+) -> None:
+    # given
+    mock_team_permission_cache.get.return_value = ("", frozenset())
 
     # when
     with pytest.raises(ResourceAccessDeniedException):
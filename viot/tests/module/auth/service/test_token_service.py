@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from app.module.auth.constants import REFRESH_TOKEN_DURATION_SEC
 from app.module.auth.exception.auth_exception import InvalidCredentialsException
 from app.module.auth.exception.token_exception import InvalidRefreshTokenException
 from app.module.auth.service.token_service import TokenService
@@ -18,19 +19,53 @@ def mock_refresh_token_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_refresh_token_store() -> AsyncMock:
+    mock = AsyncMock()
+    mock.rotate.return_value = None
+    return mock
+
+
 @pytest.fixture
 def token_service(
-    mock_user_repository: AsyncMock, mock_refresh_token_repository: AsyncMock
+    mock_user_repository: AsyncMock,
+    mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
 ) -> TokenService:
     return TokenService(
         user_repository=mock_user_repository,
         refresh_token_repository=mock_refresh_token_repository,
+        refresh_token_store=mock_refresh_token_store,
     )
 
 
 async def test_renew_token(
     token_service: TokenService,
     mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
+    mock_user_repository: AsyncMock,
+    mock_user: Mock,
+) -> None:
+    # given
+    mock_refresh_token_store.rotate.return_value = str(mock_user.id)
+    mock_user_repository.find.return_value = mock_user
+
+    # when
+    result = await token_service.renew_token(refresh_token="refresh_token")
+
+    # then
+    assert result.access_token is not None
+    assert result.refresh_token not in (None, "refresh_token")
+    assert result.access_token_expires_at is not None
+    mock_refresh_token_store.rotate.assert_awaited_once_with("refresh_token", result.refresh_token)
+    mock_user_repository.find.assert_awaited_once_with(mock_user.id)
+    mock_refresh_token_repository.find_by_token.assert_not_called()
+
+
+async def test_renew_token_moves_legacy_refresh_token_to_store(
+    token_service: TokenService,
+    mock_refresh_token_repository: AsyncMock,
+    mock_refresh_token_store: AsyncMock,
     mock_user_repository: AsyncMock,
     mock_user: Mock,
     mock_refresh_token: Mock,
@@ -38,15 +73,21 @@ async def test_renew_token(
     # given
     mock_refresh_token_repository.find_by_token.return_value = mock_refresh_token
     mock_user_repository.find.return_value = mock_user
-    mock_refresh_token_repository.save.return_value = mock_refresh_token
 
     # when
     result = await token_service.renew_token(refresh_token=mock_refresh_token.token)
 
     # then
-    assert result.access_token is not None
-    assert result.refresh_token is not None
-    assert result.access_token_expires_at is not None
+    mock_refresh_token_repository.delete.assert_awaited_once_with(mock_refresh_token)
+    mock_refresh_token_store.save.assert_awaited_once()
+    token, user_id = mock_refresh_token_store.save.await_args.args
+    assert token == result.refresh_token
+    assert user_id == str(mock_user.id)
+    assert (
+        0
+        < mock_refresh_token_store.save.await_args.kwargs["ttl_sec"]
+        <= (REFRESH_TOKEN_DURATION_SEC)
+    )
 
 
 async def test_renew_token_raises_when_refresh_token_not_found(
@@ -73,3 +114,4 @@ async def test_renew_token_raises_when_refresh_token_is_expired(
     # when
     with pytest.raises(InvalidRefreshTokenException):
         await token_service.renew_token(refresh_token=mock_refresh_token.token)
+    mock_refresh_token_repository.delete.assert_not_called()
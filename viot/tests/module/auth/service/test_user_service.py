@@ -1,13 +1,17 @@
+from collections.abc import Generator
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.context import run_after_commit
 from app.module.auth.dto.user_dto import ChangePasswordDto, UserUpdateDto
 from app.module.auth.exception.user_exception import (
     PasswordNotMatchException,
     UserNotFoundException,
 )
+from app.module.auth.service.password_service import PasswordService
 from app.module.auth.service.user_service import UserService
 
 
@@ -17,8 +21,28 @@ def mock_user_repository() -> AsyncMock:
 
 
 @pytest.fixture
-def user_service(mock_user_repository: AsyncMock) -> UserService:
-    return UserService(user_repository=mock_user_repository)
+def mock_current_user_cache() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def password_service() -> Generator[PasswordService, None, None]:
+    service = PasswordService()
+    yield service
+    service.shutdown()
+
+
+@pytest.fixture
+def user_service(
+    mock_user_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    password_service: PasswordService,
+) -> UserService:
+    return UserService(
+        user_repository=mock_user_repository,
+        current_user_cache=mock_current_user_cache,
+        password_service=password_service,
+    )
 
 
 async def test_change_password_correctly(
@@ -67,7 +91,11 @@ async def test_change_password_raises_when_password_not_match(
 
 
 async def test_update_user_correctly(
-    user_service: UserService, mock_user_repository: AsyncMock, mock_user: Mock
+    user_service: UserService,
+    mock_user_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    mock_user: Mock,
+    session_context: AsyncSession,
 ) -> None:
     mock_user_repository.find.return_value = mock_user
     dto = UserUpdateDto(first_name="New Name", last_name="New Last Name")
@@ -79,6 +107,9 @@ async def test_update_user_correctly(
     await user_service.update_user(user_id=mock_user.id, user_update_dto=dto)
 
     mock_user_repository.save.assert_called_once_with(mock_user)
+    mock_current_user_cache.invalidate.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_current_user_cache.invalidate.assert_awaited_once_with(mock_user.id)
 
 
 async def test_update_user_raises_when_user_not_found(
@@ -94,10 +125,42 @@ async def test_update_user_raises_when_user_not_found(
 
 
 async def test_delete_user_correctly(
-    user_service: UserService, mock_user_repository: AsyncMock, mock_user: Mock
+    user_service: UserService,
+    mock_user_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    mock_user: Mock,
+    session_context: AsyncSession,
 ) -> None:
     # when
     await user_service.delete_user_by_id(user_id=mock_user.id)
 
     # then
     mock_user_repository.delete_by_id.assert_called_once_with(mock_user.id)
+    mock_current_user_cache.invalidate.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_current_user_cache.invalidate.assert_awaited_once_with(mock_user.id)
+
+
+async def test_get_user_by_id(
+    user_service: UserService, mock_user_repository: AsyncMock, mock_user: Mock
+) -> None:
+    # given
+    mock_user_repository.find.return_value = mock_user
+
+    # when
+    result = await user_service.get_user_by_id(user_id=mock_user.id)
+
+    # then
+    assert result.id == mock_user.id
+    assert result.email == mock_user.email
+
+
+async def test_get_user_by_id_raises_when_user_not_found(
+    user_service: UserService, mock_user_repository: AsyncMock
+) -> None:
+    # given
+    mock_user_repository.find.return_value = None
+
+    # when / then
+    with pytest.raises(UserNotFoundException):
+        await user_service.get_user_by_id(user_id=uuid4())
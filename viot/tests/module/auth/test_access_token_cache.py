@@ -0,0 +1,70 @@
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+
+from app.module.auth.cache.access_token_cache import AccessTokenCache
+from app.module.auth.exception.token_exception import InvalidTokenException
+from app.module.auth.utils.token_utils import (
+    AccessToken,
+    create_access_token,
+    decode_access_token,
+)
+
+_MODULE = "app.module.auth.cache.access_token_cache"
+
+
+def test_parse_skips_decoding_of_cached_token() -> None:
+    # given
+    user_id = uuid4()
+    token, _ = create_access_token(access_token=AccessToken(user_id=user_id))
+    cache = AccessTokenCache()
+
+    # when
+    with patch(f"{_MODULE}.decode_access_token", wraps=decode_access_token) as decode:
+        first = cache.parse(token)
+        second = cache.parse(token)
+
+    # then
+    assert first.user_id == user_id
+    assert second.user_id == user_id
+    decode.assert_called_once_with(token)
+    metrics = cache.metrics()
+    assert (metrics.size, metrics.hits, metrics.misses, metrics.hit_rate) == (1, 1, 1, 0.5)
+
+
+def test_parse_does_not_cache_invalid_token() -> None:
+    # given
+    cache = AccessTokenCache()
+
+    # when
+    for _ in range(2):
+        with pytest.raises(InvalidTokenException):
+            cache.parse("invalid")
+
+    # then
+    metrics = cache.metrics()
+    assert (metrics.size, metrics.hits, metrics.misses) == (0, 0, 2)
+
+
+def test_parse_decodes_again_once_token_expired() -> None:
+    # given
+    access_token = AccessToken(user_id=uuid4())
+    cache = AccessTokenCache()
+
+    # when
+    with (
+        patch(f"{_MODULE}.decode_access_token", return_value=(access_token, 1000)) as decode,
+        patch(f"{_MODULE}.time.time", return_value=1000),
+    ):
+        cache.parse("token")
+        cache.parse("token")
+
+    # then
+    assert decode.call_count == 2
+    assert cache.metrics().hits == 0
+
+
+def test_metrics_without_lookups() -> None:
+    # then
+    assert AccessTokenCache().metrics().hit_rate is None
@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.module.auth.cache.current_user_cache import CurrentUserCache
+from app.module.auth.constants import ViotUserRole
+from app.module.auth.dto.user_dto import CurrentUser
+
+
+def _redis_client(*results: str | None) -> MagicMock:
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=list(results))
+    redis_client = MagicMock()
+    redis_client.pipeline.return_value.__aenter__.return_value = pipe
+    return redis_client
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "not json",
+        # Snapshot of a previous layout, without the disabled field
+        msgspec.json.encode([str(uuid4()), "user@viot.dev", "User", ViotUserRole.USER, True]),
+    ],
+)
+async def test_get_treats_undecodable_snapshot_as_miss(value: str) -> None:
+    # given
+    cache = CurrentUserCache(_redis_client("3", value))
+
+    # when
+    generation, user = await cache.get(uuid4())
+
+    # then
+    assert (generation, user) == ("3", None)
+
+
+async def test_get_decodes_snapshot() -> None:
+    # given
+    user = CurrentUser(
+        id=uuid4(),
+        email="user@viot.dev",
+        first_name="User",
+        role=ViotUserRole.USER,
+        verified=True,
+        disabled=False,
+    )
+    cache = CurrentUserCache(_redis_client("3", msgspec.json.encode(user).decode()))
+
+    # when
+    generation, cached = await cache.get(user.id)
+
+    # then
+    assert (generation, cached) == ("3", user)
@@ -0,0 +1,149 @@
+from unittest.mock import AsyncMock, Mock
+from uuid import uuid4
+
+import pytest
+from redis.exceptions import RedisError
+
+from app.module.auth.cache.current_user_cache import CurrentUserCache
+from app.module.auth.constants import ViotUserRole
+from app.module.auth.dependency import get_current_user
+from app.module.auth.dto.user_dto import CurrentUser
+from app.module.auth.exception.auth_exception import (
+    UnauthorizedException,
+    UserDisabledException,
+    UserNotVerifiedException,
+)
+from app.module.auth.utils.token_utils import (
+    AccessToken,
+    create_access_token,
+    parse_access_token,
+)
+
+
+@pytest.fixture
+def mock_user_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_current_user_cache() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get.return_value = ("1", None)
+    return mock
+
+
+def _current_user(*, verified: bool = True, disabled: bool = False) -> CurrentUser:
+    return CurrentUser(
+        id=uuid4(),
+        email="user@viot.dev",
+        first_name="User",
+        role=ViotUserRole.USER,
+        verified=verified,
+        disabled=disabled,
+    )
+
+
+async def test_get_current_user_from_cache(
+    mock_user_repository: AsyncMock, mock_current_user_cache: AsyncMock
+) -> None:
+    # given
+    user = _current_user()
+    mock_current_user_cache.get.return_value = ("", user)
+
+    # when
+    result = await get_current_user(
+        access_token=Mock(user_id=user.id),
+        user_repository=mock_user_repository,
+        current_user_cache=mock_current_user_cache,
+    )
+
+    # then
+    assert result == user
+    mock_user_repository.find.assert_not_called()
+
+
+async def test_get_current_user_caches_user_from_database(
+    mock_user_repository: AsyncMock, mock_current_user_cache: AsyncMock, mock_user: Mock
+) -> None:
+    # given
+    mock_user_repository.find.return_value = mock_user
+
+    # when
+    result = await get_current_user(
+        access_token=Mock(user_id=mock_user.id),
+        user_repository=mock_user_repository,
+        current_user_cache=mock_current_user_cache,
+    )
+
+    # then
+    assert result == CurrentUser.from_model(mock_user)
+    mock_current_user_cache.set.assert_awaited_once_with("1", result)
+
+
+async def test_get_current_user_raises_when_user_not_found(
+    mock_user_repository: AsyncMock, mock_current_user_cache: AsyncMock
+) -> None:
+    # given
+    mock_user_repository.find.return_value = None
+
+    # when / then
+    with pytest.raises(UnauthorizedException):
+        await get_current_user(
+            access_token=Mock(user_id=uuid4()),
+            user_repository=mock_user_repository,
+            current_user_cache=mock_current_user_cache,
+        )
+    mock_current_user_cache.set.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "user, exception",
+    [
+        (_current_user(verified=False), UserNotVerifiedException),
+        (_current_user(disabled=True), UserDisabledException),
+    ],
+)
+async def test_get_current_user_raises_when_cached_user_cannot_authenticate(
+    mock_user_repository: AsyncMock,
+    mock_current_user_cache: AsyncMock,
+    user: CurrentUser,
+    exception: type[Exception],
+) -> None:
+    # given
+    mock_current_user_cache.get.return_value = ("", user)
+
+    # when / then
+    with pytest.raises(exception):
+        await get_current_user(
+            access_token=Mock(user_id=user.id),
+            user_repository=mock_user_repository,
+            current_user_cache=mock_current_user_cache,
+        )
+
+
+async def test_get_current_user_snapshot_is_dropped_by_invalidate(
+    mock_user_repository: AsyncMock, mock_user: Mock
+) -> None:
+    # given
+    mock_user_repository.find.return_value = mock_user
+    redis_client = Mock()
+    redis_client.pipeline.side_effect = RedisError("unavailable")
+    current_user_cache = CurrentUserCache(redis_client)
+    token, _ = create_access_token(AccessToken(user_id=mock_user.id))
+    access_token = parse_access_token(token)
+
+    async def current_user() -> CurrentUser:
+        return await get_current_user(
+            access_token=access_token,
+            user_repository=mock_user_repository,
+            current_user_cache=current_user_cache,
+        )
+
+    # when
+    await current_user()
+    await current_user()
+    await current_user_cache.invalidate(mock_user.id)
+    await current_user()
+
+    # then
+    assert mock_user_repository.find.await_count == 2
@@ -0,0 +1,113 @@
+from pathlib import Path
+from typing import Any
+
+import jwt
+import pytest
+
+from app.module.auth.utils.jwt_utils import JwtKeySet
+
+_PAYLOAD = {"sub": "user", "exp": 2**32}
+
+
+def _write_ed25519_key(keys_dir: Path, key_id: str, *, public_only: bool = False) -> None:
+    pytest.importorskip("cryptography")
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric.ed25519 import Ed25519PrivateKey
+
+    private_key = Ed25519PrivateKey.generate()
+    if public_only:
+        pem = private_key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+    else:
+        pem = private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+    (keys_dir / f"{key_id}.pem").write_bytes(pem)
+
+
+def _eddsa_key_set(keys_dir: Path, signing_key_id: str, **kwargs: Any) -> JwtKeySet:
+    return JwtKeySet(
+        algorithm="EdDSA", keys_dir=str(keys_dir), signing_key_id=signing_key_id, **kwargs
+    )
+
+
+def test_hs256_tokens_have_no_key_id_and_no_published_key() -> None:
+    # given
+    key_set = JwtKeySet(algorithm="HS256", secret="secret")
+
+    # when
+    token = key_set.encode(dict(_PAYLOAD))
+
+    # then
+    assert "kid" not in jwt.get_unverified_header(token)
+    assert key_set.decode(token) == _PAYLOAD
+    assert key_set.jwks() == {"keys": []}
+
+
+def test_hs256_requires_secret() -> None:
+    # then
+    with pytest.raises(ValueError):
+        JwtKeySet(algorithm="HS256")
+
+
+def test_eddsa_tokens_are_verified_with_published_key(tmp_path: Path) -> None:
+    # given
+    _write_ed25519_key(tmp_path, "key-1")
+    key_set = _eddsa_key_set(tmp_path, "key-1")
+
+    # when
+    token = key_set.encode(dict(_PAYLOAD))
+
+    # then
+    assert jwt.get_unverified_header(token)["kid"] == "key-1"
+    assert key_set.decode(token) == _PAYLOAD
+    [jwk] = key_set.jwks()["keys"]
+    assert (jwk["kid"], jwk["alg"], jwk["kty"], jwk["crv"]) == ("key-1", "EdDSA", "OKP", "Ed25519")
+    assert "d" not in jwk
+    public_key = jwt.PyJWK(jwk).key
+    assert jwt.decode(token, public_key, algorithms=["EdDSA"]) == _PAYLOAD
+
+
+def test_rotation_keeps_verifying_tokens_of_previous_key(tmp_path: Path) -> None:
+    # given
+    _write_ed25519_key(tmp_path, "old")
+    _write_ed25519_key(tmp_path, "new")
+    old_token = _eddsa_key_set(tmp_path, "old").encode(dict(_PAYLOAD))
+
+    # when
+    key_set = _eddsa_key_set(tmp_path, "new")
+    new_token = key_set.encode(dict(_PAYLOAD))
+
+    # then
+    assert key_set.decode(old_token) == _PAYLOAD
+    assert jwt.get_unverified_header(new_token)["kid"] == "new"
+    assert {jwk["kid"] for jwk in key_set.jwks()["keys"]} == {"old", "new"}
+
+    (tmp_path / "old.pem").unlink()
+    with pytest.raises(jwt.InvalidKeyError):
+        _eddsa_key_set(tmp_path, "new").decode(old_token)
+
+
+def test_public_key_verifies_but_cannot_sign(tmp_path: Path) -> None:
+    # given
+    _write_ed25519_key(tmp_path, "retired", public_only=True)
+    _write_ed25519_key(tmp_path, "current")
+
+    # then
+    assert len(_eddsa_key_set(tmp_path, "current").jwks()["keys"]) == 2
+    with pytest.raises(ValueError):
+        _eddsa_key_set(tmp_path, "retired")
+
+
+def test_eddsa_accepts_hs256_tokens_only_with_secret(tmp_path: Path) -> None:
+    # given
+    _write_ed25519_key(tmp_path, "key-1")
+    hs256_token = JwtKeySet(algorithm="HS256", secret="secret").encode(dict(_PAYLOAD))
+
+    # then
+    assert _eddsa_key_set(tmp_path, "key-1", secret="secret").decode(hs256_token) == _PAYLOAD
+    with pytest.raises(jwt.InvalidKeyError):
+        _eddsa_key_set(tmp_path, "key-1").decode(hs256_token)
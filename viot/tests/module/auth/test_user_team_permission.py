@@ -0,0 +1,283 @@
+import asyncio
+from typing import Any, NamedTuple
+from uuid import UUID, uuid4
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import delete, except_, select, update
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.module.auth.model.permission import Permission
+from app.module.auth.model.role import Role
+from app.module.auth.model.role_permission import RolePermission
+from app.module.auth.model.user import User
+from app.module.auth.model.user_team_role import (
+    UserTeamPermission,
+    UserTeamPermissionScopeView,
+    UserTeamRole,
+)
+from app.module.team.model.team import Team
+
+
+class TeamSetup(NamedTuple):
+    user_id: UUID
+    team_id: UUID
+    # Role ids by name, "a" has scopes a1 and a2, "b" has scope b1
+    roles: dict[str, int]
+    # Permission ids by scope name
+    permissions: dict[str, int]
+    # Scopes by scope name, unique per test as the database is shared
+    scopes: dict[str, str]
+
+
+@pytest_asyncio.fixture  # type: ignore
+async def team_setup(
+    client: AsyncClient, async_session: AsyncSession, user_factory: Any
+) -> TeamSetup:
+    # The client fixture creates the schema, with the triggers
+    user: User = await user_factory()
+    suffix = uuid4().hex
+    team = Team(name="Permissions", slug=f"permissions-{suffix}", description=None, default=False)
+    async_session.add(team)
+    await async_session.flush()
+
+    scopes = {name: f"test:{name}:{suffix}" for name in ("a1", "a2", "b1")}
+    permissions = {
+        name: Permission(scope=scope, title=name, description=None)
+        for name, scope in scopes.items()
+    }
+    roles = {name: Role(team_id=team.id, name=name, description=None) for name in ("a", "b")}
+    async_session.add_all([*permissions.values(), *roles.values()])
+    await async_session.flush()
+    async_session.add_all(
+        [
+            RolePermission(role_id=roles[role].id, permission_id=permissions[name].id)
+            for role, name in (("a", "a1"), ("a", "a2"), ("b", "b1"))
+        ]
+    )
+    await async_session.commit()
+
+    return TeamSetup(
+        user_id=user.id,
+        team_id=team.id,
+        roles={name: role.id for name, role in roles.items()},
+        permissions={name: permission.id for name, permission in permissions.items()},
+        scopes=scopes,
+    )
+
+
+async def _scopes(session: AsyncSession, setup: TeamSetup) -> set[str]:
+    """Materialized scopes of the user in the team, checked against the view"""
+    materialized = set(
+        await session.scalars(
+            select(UserTeamPermission.permission_scope).where(
+                UserTeamPermission.user_id == setup.user_id,
+                UserTeamPermission.team_id == setup.team_id,
+            )
+        )
+    )
+    view_columns = UserTeamPermissionScopeView.__table__.c
+    view = set(
+        await session.scalars(
+            select(view_columns.permission_scope).where(
+                view_columns.user_id == setup.user_id,
+                view_columns.team_id == setup.team_id,
+            )
+        )
+    )
+    assert materialized == view
+    await _assert_no_drift(session)
+    return materialized
+
+
+async def _assert_no_drift(session: AsyncSession) -> None:
+    """The whole table holds the rows of the view"""
+    view_columns = UserTeamPermissionScopeView.__table__.c
+    materialized = select(
+        UserTeamPermission.user_id, UserTeamPermission.team_id, UserTeamPermission.permission_scope
+    )
+    view = select(view_columns.user_id, view_columns.team_id, view_columns.permission_scope)
+    assert (await session.execute(except_(materialized, view))).all() == []
+    assert (await session.execute(except_(view, materialized))).all() == []
+
+
+async def _add_member(session: AsyncSession, setup: TeamSetup, role: str) -> None:
+    session.add(
+        UserTeamRole(user_id=setup.user_id, team_id=setup.team_id, role_id=setup.roles[role])
+    )
+    await session.commit()
+
+
+async def test_member_add_role_change_and_remove(
+    async_session: AsyncSession, team_setup: TeamSetup
+) -> None:
+    # when
+    await _add_member(async_session, team_setup, "a")
+
+    # then
+    assert await _scopes(async_session, team_setup) == {
+        team_setup.scopes["a1"],
+        team_setup.scopes["a2"],
+    }
+
+    # when
+    await async_session.execute(
+        update(UserTeamRole)
+        .where(
+            UserTeamRole.user_id == team_setup.user_id,
+            UserTeamRole.team_id == team_setup.team_id,
+        )
+        .values(role_id=team_setup.roles["b"])
+    )
+    await async_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == {team_setup.scopes["b1"]}
+
+    # when
+    await async_session.execute(
+        delete(UserTeamRole).where(
+            UserTeamRole.user_id == team_setup.user_id,
+            UserTeamRole.team_id == team_setup.team_id,
+        )
+    )
+    await async_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == set()
+
+
+async def test_role_permission_update(async_session: AsyncSession, team_setup: TeamSetup) -> None:
+    # given
+    await _add_member(async_session, team_setup, "a")
+
+    # when
+    async_session.add(
+        RolePermission(role_id=team_setup.roles["a"], permission_id=team_setup.permissions["b1"])
+    )
+    await async_session.execute(
+        delete(RolePermission).where(
+            RolePermission.role_id == team_setup.roles["a"],
+            RolePermission.permission_id == team_setup.permissions["a1"],
+        )
+    )
+    await async_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == {
+        team_setup.scopes["a2"],
+        team_setup.scopes["b1"],
+    }
+
+
+async def test_role_delete(async_session: AsyncSession, team_setup: TeamSetup) -> None:
+    # given
+    await _add_member(async_session, team_setup, "a")
+
+    # when
+    await async_session.execute(delete(Role).where(Role.id == team_setup.roles["a"]))
+    await async_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == set()
+
+
+async def test_team_delete(async_session: AsyncSession, team_setup: TeamSetup) -> None:
+    # given
+    await _add_member(async_session, team_setup, "a")
+
+    # when
+    await async_session.execute(delete(Team).where(Team.id == team_setup.team_id))
+    await async_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == set()
+
+
+async def _delete_role_permission(session: AsyncSession, setup: TeamSetup) -> None:
+    await session.execute(
+        delete(RolePermission).where(
+            RolePermission.role_id == setup.roles["a"],
+            RolePermission.permission_id == setup.permissions["a1"],
+        )
+    )
+    await session.commit()
+
+
+async def test_concurrent_member_add_waits_for_role_permission_delete(
+    async_engine: AsyncEngine, async_session: AsyncSession, team_setup: TeamSetup
+) -> None:
+    # given
+    await async_session.execute(
+        delete(RolePermission).where(
+            RolePermission.role_id == team_setup.roles["a"],
+            RolePermission.permission_id == team_setup.permissions["a1"],
+        )
+    )
+
+    # when
+    async with AsyncSession(async_engine, expire_on_commit=False) as other_session:
+        add_member = asyncio.create_task(_add_member(other_session, team_setup, "a"))
+        await asyncio.sleep(0.5)
+        assert not add_member.done()
+        await async_session.commit()
+        await add_member
+
+    # then
+    assert await _scopes(async_session, team_setup) == {team_setup.scopes["a2"]}
+
+
+async def test_concurrent_role_permission_delete_waits_for_member_add(
+    async_engine: AsyncEngine, async_session: AsyncSession, team_setup: TeamSetup
+) -> None:
+    # given
+    async_session.add(
+        UserTeamRole(
+            user_id=team_setup.user_id, team_id=team_setup.team_id, role_id=team_setup.roles["a"]
+        )
+    )
+    await async_session.flush()
+
+    # when
+    async with AsyncSession(async_engine, expire_on_commit=False) as other_session:
+        delete_permission = asyncio.create_task(_delete_role_permission(other_session, team_setup))
+        await asyncio.sleep(0.5)
+        assert not delete_permission.done()
+        await async_session.commit()
+        await delete_permission
+
+    # then
+    assert await _scopes(async_session, team_setup) == {team_setup.scopes["a2"]}
+
+
+async def test_concurrent_role_changes_of_a_member(
+    async_engine: AsyncEngine, async_session: AsyncSession, team_setup: TeamSetup
+) -> None:
+    # given
+    await _add_member(async_session, team_setup, "a")
+    await _add_member(async_session, team_setup, "b")
+    await async_session.execute(
+        delete(UserTeamRole).where(
+            UserTeamRole.user_id == team_setup.user_id,
+            UserTeamRole.role_id == team_setup.roles["a"],
+        )
+    )
+
+    # when
+    async with AsyncSession(async_engine, expire_on_commit=False) as other_session:
+        remove_role = asyncio.create_task(
+            other_session.execute(
+                delete(UserTeamRole).where(
+                    UserTeamRole.user_id == team_setup.user_id,
+                    UserTeamRole.role_id == team_setup.roles["b"],
+                )
+            )
+        )
+        await asyncio.sleep(0.5)
+        assert not remove_role.done()
+        await async_session.commit()
+        await remove_role
+        await other_session.commit()
+
+    # then
+    assert await _scopes(async_session, team_setup) == set()
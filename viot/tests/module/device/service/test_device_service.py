@@ -1,3 +1,4 @@
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
@@ -21,14 +22,21 @@ def mock_team_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_device_presence_cache() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def device_service(
     mock_device_repository: AsyncMock,
     mock_team_repository: AsyncMock,
+    mock_device_presence_cache: AsyncMock,
 ) -> DeviceService:
     return DeviceService(
         device_repository=mock_device_repository,
         team_repository=mock_team_repository,
+        device_presence_cache=mock_device_presence_cache,
     )
 
 
@@ -159,9 +167,28 @@ async def test_create_device_raise_team_not_found(
         await device_service.create_device(team_id=team_id, device_create_dto=dto)
 
 
+async def test_get_online_devices_belong_to_team(
+    device_service: DeviceService,
+    mock_device_presence_cache: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    device_id = uuid4()
+    last_seen = datetime(2026, 10, 18, tzinfo=UTC)
+    mock_device_presence_cache.get_online.return_value = [(device_id, last_seen)]
+
+    # when
+    result = await device_service.get_online_devices_belong_to_team(team_id=team_id)
+
+    # then
+    mock_device_presence_cache.get_online.assert_awaited_once_with(team_id)
+    assert [(d.id, d.last_seen) for d in result] == [(device_id, last_seen)]
+
+
 async def test_delete_device_by_id_and_team_id(
     device_service: DeviceService,
     mock_device_repository: AsyncMock,
+    mock_device_presence_cache: AsyncMock,
 ) -> None:
     # given
     device_id = uuid4()
@@ -174,3 +201,4 @@ async def test_delete_device_by_id_and_team_id(
     mock_device_repository.delete_by_device_id_and_team_id.assert_called_once_with(
         device_id, team_id
     )
+    mock_device_presence_cache.remove.assert_awaited_once_with(device_id, team_id)
@@ -0,0 +1,97 @@
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.module.device.cache.device_presence_cache import PresenceChange
+from app.module.device.config import device_settings
+from app.module.device.constants import DeviceStatus
+from app.module.device.presence_flusher import DevicePresenceFlusher
+
+
+def _change() -> PresenceChange:
+    now = datetime.now(UTC)
+    return PresenceChange(
+        device_id=uuid4(), status=DeviceStatus.ONLINE, last_seen=now, last_connection=now
+    )
+
+
+@pytest.fixture
+def mock_device_presence_cache() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_status_batch_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def device_presence_flusher(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_device_presence_cache: AsyncMock,
+    mock_device_status_batch_repository: AsyncMock,
+) -> DevicePresenceFlusher:
+    monkeypatch.setattr(device_settings, "PRESENCE_FLUSH_BATCH_SIZE", 2)
+    return DevicePresenceFlusher(
+        device_presence_cache=mock_device_presence_cache,
+        device_status_batch_repository=mock_device_status_batch_repository,
+    )
+
+
+async def test_flush_writes_changes_in_batches(
+    device_presence_flusher: DevicePresenceFlusher,
+    mock_device_presence_cache: AsyncMock,
+    mock_device_status_batch_repository: AsyncMock,
+) -> None:
+    # given
+    batches = [[_change(), _change()], [_change()]]
+    mock_device_presence_cache.pop_changes.side_effect = batches
+
+    # when
+    written = await device_presence_flusher.flush()
+
+    # then
+    assert written == 3
+    assert mock_device_presence_cache.pop_changes.await_count == 2
+    assert [
+        call.args[0] for call in mock_device_status_batch_repository.update_many.call_args_list
+    ] == batches
+
+
+async def test_flush_marks_changes_again_on_failure(
+    device_presence_flusher: DevicePresenceFlusher,
+    mock_device_presence_cache: AsyncMock,
+    mock_device_status_batch_repository: AsyncMock,
+) -> None:
+    # given
+    changes = [_change(), _change()]
+    mock_device_presence_cache.pop_changes.return_value = changes
+    mock_device_status_batch_repository.update_many.side_effect = RuntimeError("update failed")
+
+    # when
+    written = await device_presence_flusher.flush()
+
+    # then
+    assert written == 0
+    mock_device_presence_cache.mark_changed.assert_awaited_once_with(
+        [change.device_id for change in changes]
+    )
+
+
+async def test_stop_runs_a_last_flush(
+    device_presence_flusher: DevicePresenceFlusher,
+    mock_device_presence_cache: AsyncMock,
+    mock_device_status_batch_repository: AsyncMock,
+) -> None:
+    # given
+    changes = [_change()]
+    mock_device_presence_cache.pop_changes.side_effect = [changes]
+    device_presence_flusher.start()
+
+    # when
+    await device_presence_flusher.stop()
+
+    # then
+    mock_device_status_batch_repository.update_many.assert_awaited_once_with(changes)
@@ -1,12 +1,16 @@
-from datetime import datetime
+from datetime import UTC, datetime
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
 
 from app.database.repository import Page
-from app.database.repository.pagination import SortDirection
+from app.database.repository.pagination import SortDirection, encode_cursor
 from app.module.device.exception.device_exception import DeviceNotFoundException
+from app.module.device_data.config import device_data_settings
+from app.module.device_data.exception.connect_log_exception import (
+    InvalidConnectLogCursorException,
+)
 from app.module.device_data.service.connect_log_service import ConnectLogService
 
 
@@ -155,3 +159,88 @@ async def test_validate_date_range_raise_exception(
             start_date=start_date,
             end_date=end_date,
         )
+
+
+async def test_scroll_connect_logs(
+    connect_log_service: ConnectLogService,
+    mock_connect_log_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+    mock_connect_log: Mock,
+) -> None:
+    # given
+    mock_device_repository.exists_by_id_and_team_id.return_value = True
+    mock_connect_log_repository.find_page_by_device_id.return_value = [
+        mock_connect_log,
+        mock_connect_log,
+        mock_connect_log,
+    ]
+
+    # when
+    result = await connect_log_service.scroll_connect_logs(
+        team_id=uuid4(),
+        device_id=mock_connect_log.device_id,
+        limit=2,
+        start_date=None,
+        end_date=None,
+        order_by="desc",
+        cursor=None,
+        include_total=False,
+    )
+
+    # then
+    assert len(result.items) == 2
+    assert result.next_cursor == encode_cursor((mock_connect_log.ts,))
+    assert result.total_items is None
+    assert mock_connect_log_repository.find_page_by_device_id.call_args.kwargs["limit"] == 3
+    mock_connect_log_repository.count_by_device_id.assert_not_called()
+
+
+async def test_scroll_connect_logs_resumes_after_cursor_with_capped_total(
+    connect_log_service: ConnectLogService,
+    mock_connect_log_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+    mock_connect_log: Mock,
+) -> None:
+    # given
+    after = datetime(2021, 1, 1, tzinfo=UTC)
+    mock_device_repository.exists_by_id_and_team_id.return_value = True
+    mock_connect_log_repository.find_page_by_device_id.return_value = [mock_connect_log]
+    mock_connect_log_repository.count_by_device_id.return_value = (
+        device_data_settings.CONNECT_LOG_COUNT_CAP + 1
+    )
+
+    # when
+    result = await connect_log_service.scroll_connect_logs(
+        team_id=uuid4(),
+        device_id=mock_connect_log.device_id,
+        limit=2,
+        start_date=None,
+        end_date=None,
+        order_by="desc",
+        cursor=encode_cursor((after,)),
+        include_total=True,
+    )
+
+    # then
+    assert result.next_cursor is None
+    assert result.total_items == device_data_settings.CONNECT_LOG_COUNT_CAP
+    assert result.total_items_capped
+    assert mock_connect_log_repository.find_page_by_device_id.call_args.kwargs["after"] == after
+
+
+async def test_scroll_connect_logs_invalid_cursor(
+    connect_log_service: ConnectLogService,
+    mock_connect_log: Mock,
+) -> None:
+    # when, then
+    with pytest.raises(InvalidConnectLogCursorException):
+        await connect_log_service.scroll_connect_logs(
+            team_id=uuid4(),
+            device_id=mock_connect_log.device_id,
+            limit=2,
+            start_date=None,
+            end_date=None,
+            order_by="desc",
+            cursor="not-a-cursor",
+            include_total=False,
+        )
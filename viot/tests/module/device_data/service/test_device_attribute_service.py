@@ -4,8 +4,20 @@ from uuid import uuid4
 
 import pytest
 
+from app.module.device.exception.device_exception import DeviceNotFoundException
 from app.module.device_data.constants import DeviceAttributeScope
-from app.module.device_data.repository.device_attribute_repository import KeyWithScope
+from app.module.device_data.dto.device_attribute_dto import (
+    AttributesUpsertDto,
+    AttributeUpsertDto,
+)
+from app.module.device_data.exception.device_attribute_exception import (
+    AttributeScopeNotWritableException,
+)
+from app.module.device_data.repository.device_attribute_repository import (
+    AttributeRow,
+    KeyWithScope,
+    UpsertedAttribute,
+)
 from app.module.device_data.service.device_attribute_service import DeviceAttributeService
 
 
@@ -14,12 +26,19 @@ def mock_device_attribute_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_device_repository() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def device_attribute_service(
     mock_device_attribute_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
 ) -> DeviceAttributeService:
     return DeviceAttributeService(
         device_attribute_repository=mock_device_attribute_repository,
+        device_repository=mock_device_repository,
     )
 
 
@@ -88,3 +107,74 @@ async def test_get_all_by_device_id(
     assert result[1].key == "key2"
     assert result[1].value == "value2"
     assert result[1].last_update == datetime(2021, 1, 1)
+
+
+async def test_upsert_attributes(
+    device_attribute_service: DeviceAttributeService,
+    mock_device_attribute_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    scope = DeviceAttributeScope.SHARED_SCOPE
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = [device_id]
+    mock_device_attribute_repository.upsert_many.return_value = [
+        UpsertedAttribute(device_id, "key1", datetime(2021, 1, 1), created=False),
+        UpsertedAttribute(device_id, "key2", datetime(2021, 1, 1), created=True),
+    ]
+    attributes_upsert_dto = AttributesUpsertDto(
+        attributes=[
+            AttributeUpsertDto(device_id=device_id, key="key1", value=1),
+            AttributeUpsertDto(device_id=device_id, key="key2", value={"a": True}),
+            AttributeUpsertDto(device_id=device_id, key="key1", value=2.5),
+        ]
+    )
+
+    # when
+    result = await device_attribute_service.upsert_attributes(
+        team_id=uuid4(), scope=scope, attributes_upsert_dto=attributes_upsert_dto
+    )
+
+    # then
+    mock_device_attribute_repository.upsert_many.assert_called_once_with(
+        scope,
+        [
+            AttributeRow(device_id, "key1", (None, None, None, 2.5, None)),
+            AttributeRow(device_id, "key2", (None, None, None, None, '{"a":true}')),
+        ],
+    )
+    assert [(r.key, r.created) for r in result] == [("key1", False), ("key2", True)]
+
+
+async def test_upsert_device_attributes_client_scope_not_writable(
+    device_attribute_service: DeviceAttributeService,
+    mock_device_attribute_repository: AsyncMock,
+) -> None:
+    # when, then
+    with pytest.raises(AttributeScopeNotWritableException):
+        await device_attribute_service.upsert_device_attributes(
+            team_id=uuid4(),
+            device_id=uuid4(),
+            scope=DeviceAttributeScope.CLIENT_SCOPE,
+            attributes={"key1": 1},
+        )
+    mock_device_attribute_repository.upsert_many.assert_not_called()
+
+
+async def test_upsert_device_attributes_device_not_in_team(
+    device_attribute_service: DeviceAttributeService,
+    mock_device_attribute_repository: AsyncMock,
+    mock_device_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = []
+
+    # when, then
+    with pytest.raises(DeviceNotFoundException):
+        await device_attribute_service.upsert_device_attributes(
+            team_id=uuid4(),
+            device_id=uuid4(),
+            scope=DeviceAttributeScope.SERVER_SCOPE,
+            attributes={"key1": 1},
+        )
+    mock_device_attribute_repository.upsert_many.assert_not_called()
@@ -0,0 +1,95 @@
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import Mock
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.module.device_data.constants import ExportFormat
+from app.module.device_data.dto.device_data_dto import TimeseriesExportQueryDto
+from app.module.device_data.service.device_data_export_service import DeviceDataExportService
+
+
+def _record(ts: datetime, key: str, **values: Any) -> dict[str, Any]:
+    record = dict.fromkeys(("bool_v", "str_v", "long_v", "double_v", "json_v"))
+    record.update(ts=ts, key=key, **values)
+    return record
+
+
+@pytest.fixture
+def records() -> list[list[dict[str, Any]]]:
+    ts = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        [_record(ts, "temperature", double_v=21.5), _record(ts, "enabled", bool_v=True)],
+        [_record(ts, "config", json_v={"mode": "eco"})],
+    ]
+
+
+@pytest.fixture
+def mock_device_data_export_repository(records: list[list[dict[str, Any]]]) -> Mock:
+    async def stream(**kwargs: Any) -> AsyncIterator[list[dict[str, Any]]]:
+        for batch in records:
+            yield batch
+
+    repository = Mock()
+    repository.stream_by_device_id_and_keys.side_effect = stream
+    return repository
+
+
+@pytest.fixture
+def device_data_export_service(
+    mock_device_data_export_repository: Mock,
+) -> DeviceDataExportService:
+    return DeviceDataExportService(device_data_export_repository=mock_device_data_export_repository)
+
+
+def _query_dto(export_format: ExportFormat) -> TimeseriesExportQueryDto:
+    return TimeseriesExportQueryDto(
+        keys="temperature,enabled,config",
+        startDate="2024-01-01T00:00:00",  # type: ignore
+        endDate="2024-01-02T00:00:00",  # type: ignore
+        format=export_format,
+    )
+
+
+async def test_export_timeseries_ndjson(
+    device_data_export_service: DeviceDataExportService,
+) -> None:
+    # when
+    chunks = [
+        chunk
+        async for chunk in device_data_export_service.export_timeseries(
+            device_id=uuid4(), query_dto=_query_dto(ExportFormat.NDJSON)
+        )
+    ]
+
+    # then
+    assert len(chunks) == 2
+    lines = b"".join(chunks).splitlines()
+    assert [msgspec.json.decode(line) for line in lines] == [
+        {"ts": "2024-01-01T00:00:00Z", "key": "temperature", "value": 21.5},
+        {"ts": "2024-01-01T00:00:00Z", "key": "enabled", "value": True},
+        {"ts": "2024-01-01T00:00:00Z", "key": "config", "value": {"mode": "eco"}},
+    ]
+
+
+async def test_export_timeseries_csv(
+    device_data_export_service: DeviceDataExportService,
+) -> None:
+    # when
+    chunks = [
+        chunk
+        async for chunk in device_data_export_service.export_timeseries(
+            device_id=uuid4(), query_dto=_query_dto(ExportFormat.CSV)
+        )
+    ]
+
+    # then
+    assert b"".join(chunks).decode().splitlines() == [
+        "ts,key,value",
+        "2024-01-01T00:00:00+00:00,temperature,21.5",
+        "2024-01-01T00:00:00+00:00,enabled,True",
+        '2024-01-01T00:00:00+00:00,config,"{""mode"":""eco""}"',
+    ]
@@ -0,0 +1,177 @@
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import msgspec
+import pytest
+
+from app.module.device.exception.device_exception import DeviceNotFoundException
+from app.module.device_data.cache.device_data_latest_cache import LatestDataPoint
+from app.module.device_data.constants import IngestFormat
+from app.module.device_data.exception.device_data_ingest_exception import (
+    InvalidTelemetryException,
+)
+from app.module.device_data.service.device_data_ingest_service import DeviceDataIngestService
+
+
+@pytest.fixture
+def mock_device_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_ingest_batcher() -> AsyncMock:
+    mock = AsyncMock()
+    # Every row is inserted
+    mock.submit.side_effect = lambda rows: rows
+    return mock
+
+
+@pytest.fixture
+def mock_device_data_latest_cache() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def mock_device_data_aggregation_cache() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def device_data_ingest_service(
+    mock_device_repository: AsyncMock,
+    mock_device_data_ingest_batcher: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+    mock_device_data_aggregation_cache: AsyncMock,
+) -> DeviceDataIngestService:
+    return DeviceDataIngestService(
+        device_repository=mock_device_repository,
+        device_data_ingest_batcher=mock_device_data_ingest_batcher,
+        device_data_latest_cache=mock_device_data_latest_cache,
+        device_data_aggregation_cache=mock_device_data_aggregation_cache,
+    )
+
+
+async def test_ingest_maps_values_to_columns(
+    device_data_ingest_service: DeviceDataIngestService,
+    mock_device_repository: AsyncMock,
+    mock_device_data_ingest_batcher: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+    mock_device_data_aggregation_cache: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    ts = datetime.now(UTC)
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = [device_id]
+    body = msgspec.msgpack.encode(
+        [
+            {
+                "deviceId": str(device_id),
+                "ts": ts.isoformat(),
+                "data": {"b": True, "l": 1, "d": 1.5, "s": "on", "j": {"x": 1}, "n": None},
+            }
+        ]
+    )
+
+    # when
+    result = await device_data_ingest_service.ingest(
+        team_id=uuid4(), body=body, ingest_format=IngestFormat.MSGPACK
+    )
+
+    # then
+    assert result.records == 1
+    assert result.data_points == 5
+    mock_device_data_ingest_batcher.submit.assert_called_once_with(
+        [
+            (device_id, ts, "b", True, None, None, None, None),
+            (device_id, ts, "l", None, None, 1, None, None),
+            (device_id, ts, "d", None, None, None, 1.5, None),
+            (device_id, ts, "s", None, "on", None, None, None),
+            (device_id, ts, "j", None, None, None, None, '{"x":1}'),
+        ]
+    )
+    written = mock_device_data_latest_cache.write_through.call_args.args[1]
+    assert written["l"] == LatestDataPoint(ts=ts, value=1)
+    assert "n" not in written
+    mock_device_data_aggregation_cache.invalidate.assert_not_called()
+
+
+async def test_ingest_invalidates_aggregation_cache_on_late_data(
+    device_data_ingest_service: DeviceDataIngestService,
+    mock_device_repository: AsyncMock,
+    mock_device_data_aggregation_cache: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    old_ts = datetime.now(UTC) - timedelta(days=1)
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = [device_id]
+    body = b"\n".join(
+        msgspec.json.encode({"deviceId": device_id, "ts": ts, "data": {"t": 1}})
+        for ts in (datetime.now(UTC), old_ts)
+    )
+
+    # when
+    await device_data_ingest_service.ingest(
+        team_id=uuid4(), body=body, ingest_format=IngestFormat.NDJSON
+    )
+
+    # then
+    mock_device_data_aggregation_cache.invalidate.assert_called_once_with(device_id, since=old_ts)
+
+
+async def test_ingest_writes_through_only_inserted_data_points(
+    device_data_ingest_service: DeviceDataIngestService,
+    mock_device_repository: AsyncMock,
+    mock_device_data_ingest_batcher: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    ts = datetime.now(UTC)
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = [device_id]
+    # A resend of "t" with a different value, "h" is new
+    mock_device_data_ingest_batcher.submit.side_effect = lambda rows: [
+        row for row in rows if row[2] == "h"
+    ]
+    body = msgspec.json.encode({"deviceId": device_id, "ts": ts, "data": {"t": 2, "h": 40}})
+
+    # when
+    result = await device_data_ingest_service.ingest(
+        team_id=uuid4(), body=body, ingest_format=IngestFormat.NDJSON
+    )
+
+    # then
+    assert result.data_points == 2
+    mock_device_data_latest_cache.write_through.assert_called_once_with(
+        device_id, {"h": LatestDataPoint(ts=ts, value=40)}
+    )
+
+
+async def test_ingest_device_not_in_team(
+    device_data_ingest_service: DeviceDataIngestService,
+    mock_device_repository: AsyncMock,
+    mock_device_data_ingest_batcher: AsyncMock,
+) -> None:
+    # given
+    mock_device_repository.find_ids_by_ids_and_team_id.return_value = []
+    body = msgspec.json.encode({"deviceId": uuid4(), "ts": datetime.now(UTC), "data": {"t": 1}})
+
+    # when, then
+    with pytest.raises(DeviceNotFoundException):
+        await device_data_ingest_service.ingest(
+            team_id=uuid4(), body=body, ingest_format=IngestFormat.NDJSON
+        )
+    mock_device_data_ingest_batcher.submit.assert_not_called()
+
+
+async def test_ingest_invalid_record(
+    device_data_ingest_service: DeviceDataIngestService,
+) -> None:
+    # given
+    body = msgspec.json.encode({"deviceId": uuid4(), "ts": "2024-01-01T00:00:00", "data": {}})
+
+    # when, then
+    with pytest.raises(InvalidTelemetryException):
+        await device_data_ingest_service.ingest(
+            team_id=uuid4(), body=body, ingest_format=IngestFormat.NDJSON
+        )
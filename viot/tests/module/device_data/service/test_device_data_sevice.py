@@ -1,11 +1,27 @@
-from datetime import datetime
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, Mock
 from uuid import uuid4
 
 import pytest
-
-from app.module.device_data.constants import AggregationType, IntervalType
-from app.module.device_data.dto.device_data_dto import AggregatedData, TimeseriesAggregationQueryDto
+from redis.asyncio import Redis
+
+from app.database.repository.pagination import decode_cursor, encode_cursor
+from app.module.device_data.cache.device_data_aggregation_cache import DeviceDataAggregationCache
+from app.module.device_data.cache.device_data_latest_cache import LatestDataPoint
+from app.module.device_data.constants import (
+    AggregationType,
+    DeviceDataRollup,
+    FillType,
+    IntervalType,
+    TimeseriesFormat,
+    Timezone,
+)
+from app.module.device_data.dto.device_data_dto import (
+    AggregatedData,
+    FleetLatestQueryDto,
+    TimeseriesAggregationQueryDto,
+    TimeseriesPageQueryDto,
+)
 from app.module.device_data.service.device_data_service import DeviceDataService
 
 
@@ -24,28 +40,48 @@ def mock_device_data_aggregation_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_device_data_latest_cache() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get_all.return_value = None
+    mock.get_many.return_value = ({}, False)
+    return mock
+
+
+@pytest.fixture
+def mock_device_data_aggregation_cache() -> AsyncMock:
+    mock = AsyncMock()
+    mock.get_many.return_value = ("0", {})
+    return mock
+
+
 @pytest.fixture
 def device_data_service(
     mock_device_data_repository: AsyncMock,
     mock_device_data_latest_repository: AsyncMock,
     mock_device_data_aggregation_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+    mock_device_data_aggregation_cache: AsyncMock,
 ) -> DeviceDataService:
     return DeviceDataService(
         device_data_repository=mock_device_data_repository,
         device_data_latest_repository=mock_device_data_latest_repository,
         device_data_aggregation_repository=mock_device_data_aggregation_repository,
+        device_data_latest_cache=mock_device_data_latest_cache,
+        device_data_aggregation_cache=mock_device_data_aggregation_cache,
     )
 
 
 async def test_get_all_keys(
     device_data_service: DeviceDataService,
     mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
 ) -> None:
     # given
     device_id = uuid4()
-    mock_device_data_latest_repository.find_all_keys_by_device_id.return_value = [
-        "key1",
-        "key2",
+    mock_device_data_latest_repository.find_all_by_device_id.return_value = [
+        Mock(key="key1", value=1, ts=datetime.now()),
+        Mock(key="key2", value=2, ts=datetime.now()),
     ]
 
     # when
@@ -53,11 +89,32 @@ async def test_get_all_keys(
 
     # then
     assert result == {"key1", "key2"}
+    mock_device_data_latest_cache.set_many.assert_awaited_once()
+    assert mock_device_data_latest_cache.set_many.await_args.kwargs["complete"] is True
+
+
+async def test_get_all_keys_from_cache(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_latest_cache.get_all.return_value = {
+        "key1": LatestDataPoint(ts=datetime.now(), value=1)
+    }
+
+    # when
+    result = await device_data_service.get_all_keys(device_id=uuid4())
+
+    # then
+    assert result == {"key1"}
+    mock_device_data_latest_repository.find_all_by_device_id.assert_not_called()
 
 
 async def test_get_latest_data_by_keys(
     device_data_service: DeviceDataService,
     mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
 ) -> None:
     # given
     device_id = uuid4()
@@ -79,6 +136,87 @@ async def test_get_latest_data_by_keys(
     assert result[0].value == 1
     assert result[1].key == "key2"
     assert result[1].value == 2
+    mock_device_data_latest_cache.set_many.assert_awaited_once()
+
+
+async def test_get_latest_data_by_keys_partially_cached(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    mock_device_data_latest_cache.get_many.return_value = (
+        {"key1": LatestDataPoint(ts=datetime.now(), value=1)},
+        False,
+    )
+    mock_device_data_latest_repository.find_all_by_device_id_and_keys.return_value = [
+        Mock(device_id=device_id, key="key2", value=2, ts=datetime.now()),
+    ]
+
+    # when
+    result = await device_data_service.get_latest_data_by_keys(
+        device_id=device_id, keys={"key1", "key2"}
+    )
+
+    # then
+    assert {(r.key, r.value) for r in result} == {("key1", 1), ("key2", 2)}
+    call = mock_device_data_latest_repository.find_all_by_device_id_and_keys.await_args
+    assert call.kwargs["keys"] == {"key2"}
+
+
+async def test_get_latest_data_by_keys_complete_cache_skips_db(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+    mock_device_data_latest_cache: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_latest_cache.get_many.return_value = (
+        {"key1": LatestDataPoint(ts=datetime.now(), value=1)},
+        True,
+    )
+
+    # when
+    result = await device_data_service.get_latest_data_by_keys(
+        device_id=uuid4(), keys={"key1", "unknown"}
+    )
+
+    # then
+    assert len(result) == 1
+    mock_device_data_latest_repository.find_all_by_device_id_and_keys.assert_not_called()
+
+
+async def test_get_fleet_latest_data(
+    device_data_service: DeviceDataService,
+    mock_device_data_latest_repository: AsyncMock,
+) -> None:
+    # given
+    team_id, device_1, device_2 = uuid4(), uuid4(), uuid4()
+    ts = datetime.now()
+    mock_device_data_latest_repository.find_all_by_team_id_and_keys.return_value = [
+        (device_1, "enabled", ts, False, None, None, None, None),
+        (device_1, "temperature", ts, None, None, None, 21.5, None),
+        (device_2, "temperature", ts, None, None, 23, None, None),
+    ]
+    query_dto = FleetLatestQueryDto(
+        keys={"temperature", "enabled"},
+        deviceIds={device_1, device_2},  # type: ignore
+    )
+
+    # when
+    result = await device_data_service.get_fleet_latest_data(team_id=team_id, query_dto=query_dto)
+
+    # then
+    assert result.device_ids == [device_1, device_1, device_2]
+    assert result.keys == ["enabled", "temperature", "temperature"]
+    assert result.ts == [ts, ts, ts]
+    assert result.values == [False, 21.5, 23]
+    mock_device_data_latest_repository.find_all_by_team_id_and_keys.assert_awaited_once_with(
+        team_id=team_id,
+        keys={"temperature", "enabled"},
+        device_ids={device_1, device_2},
+        device_type=None,
+    )
 
 
 async def test_get_timeseries_data_by_keys_without_aggregate(
@@ -117,6 +255,218 @@ async def test_get_timeseries_data_by_keys_without_aggregate(
     assert result["key2"][0].value == 2
 
 
+async def test_get_timeseries_columns_by_keys_without_aggregate(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    ts = datetime(2024, 1, 1)
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        format=TimeseriesFormat.COLUMNAR,
+    )
+    mock_device_data_repository.find_rows_by_device_id_and_keys.return_value = [
+        ("key1", ts, None, None, 1, None, None),
+        ("key1", ts.replace(second=1), None, None, None, 1.5, None),
+        ("key2", ts, False, None, None, None, None),
+    ]
+
+    # when
+    result = await device_data_service.get_timeseries_columns_by_keys(
+        device_id=uuid4(), query_dto=query_dto
+    )
+
+    # then
+    assert result["key1"].ts == [ts, ts.replace(second=1)]
+    assert result["key1"].values == [1, 1.5]
+    assert result["key2"].values == [False]
+
+
+async def test_get_downsampled_columns_by_keys(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    ts = datetime(2024, 1, 1)
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        maxPoints=3,  # type: ignore
+    )
+    key1_values = [0, 1.0, 9.0, 1.0, 0]
+    mock_device_data_repository.find_extreme_rows_by_device_id_and_keys.return_value = [
+        *(
+            ("key1", ts + timedelta(seconds=i), None, None, None, v, None)
+            for i, v in enumerate(key1_values)
+        ),
+        *(("key2", ts + timedelta(seconds=i), None, f"s{i}", None, None, None) for i in range(5)),
+    ]
+
+    # when
+    result = await device_data_service.get_downsampled_columns_by_keys(
+        device_id=uuid4(), query_dto=query_dto
+    )
+
+    # then
+    assert result["key1"].ts == [ts, ts + timedelta(seconds=2), ts + timedelta(seconds=4)]
+    assert result["key1"].values == [0, 9.0, 0]
+    assert result["key2"].values == ["s0", "s2", "s4"]
+    # 3 points, 4 pre-aggregated buckets per point
+    call = mock_device_data_repository.find_extreme_rows_by_device_id_and_keys.call_args
+    assert call.kwargs["bucket_width"] == (query_dto.end_date - query_dto.start_date) / 12
+
+
+async def test_get_timeseries_data_by_keys_downsampled_desc(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    ts = datetime(2024, 1, 1)
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        maxPoints=10,  # type: ignore
+        orderBy="desc",  # type: ignore
+    )
+    mock_device_data_repository.find_extreme_rows_by_device_id_and_keys.return_value = [
+        ("key1", ts, True, None, None, None, None),
+        ("key1", ts.replace(second=1), False, None, None, None, None),
+    ]
+
+    # when
+    result = await device_data_service.get_timeseries_data_by_keys(
+        device_id=uuid4(), query_dto=query_dto
+    )
+
+    # then
+    assert [(d.ts, d.value) for d in result["key1"]] == [
+        (ts.replace(second=1), False),
+        (ts, True),
+    ]
+    mock_device_data_repository.find_data_by_device_id_and_keys.assert_not_called()
+
+
+def test_timeseries_aggregation_query_dto_max_points_with_agg() -> None:
+    with pytest.raises(ValueError):
+        TimeseriesAggregationQueryDto(
+            keys="key1",
+            startDate="2023-01-01T00:00:00",  # type: ignore
+            endDate="2025-01-01T00:00:00",  # type: ignore
+            intervalType=IntervalType.HOUR,  # type: ignore
+            interval=1,
+            agg=[AggregationType.AVG],
+            maxPoints=100,  # type: ignore
+        )
+
+
+async def test_get_timeseries_columns_by_keys_with_aggregate(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    ts = datetime(2024, 1, 1)
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        intervalType=IntervalType.DAY,
+        interval=1,
+        agg=[AggregationType.AVG],
+        format=TimeseriesFormat.COLUMNAR,
+    )
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.return_value = {
+        "key1": [AggregatedData(ts=ts, value=1), AggregatedData(ts=ts, value=2)],
+        "key2": [],
+    }
+
+    # when
+    result = await device_data_service.get_timeseries_columns_by_keys(
+        device_id=uuid4(), query_dto=query_dto
+    )
+
+    # then
+    assert result["key1"].ts == [ts, ts]
+    assert result["key1"].values == [1, 2]
+    assert result["key2"].ts == []
+
+
+async def test_get_timeseries_page_by_keys_has_next_page(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    ts = datetime(2024, 1, 1)
+    query_dto = TimeseriesPageQueryDto(
+        keys="key1,key2",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        limit=2,
+        cursor=encode_cursor((ts, "key1")),
+    )
+    mock_device_data_repository.find_page_by_device_id_and_keys.return_value = [
+        Mock(key="key2", value=1, ts=ts),
+        Mock(key="key1", value=2, ts=ts.replace(second=1)),
+        Mock(key="key2", value=3, ts=ts.replace(second=1)),
+    ]
+
+    # when
+    result = await device_data_service.get_timeseries_page_by_keys(
+        device_id=device_id, query_dto=query_dto
+    )
+
+    # then
+    call = mock_device_data_repository.find_page_by_device_id_and_keys.await_args
+    assert call.kwargs["limit"] == 3
+    assert call.kwargs["after"] == (ts, "key1")
+    assert [p.value for p in result.data["key1"]] == [2]
+    assert [p.value for p in result.data["key2"]] == [1]
+    assert result.next_cursor is not None
+    assert decode_cursor(result.next_cursor, tuple[datetime, str]) == (
+        ts.replace(second=1),
+        "key1",
+    )
+
+
+async def test_get_timeseries_page_by_keys_last_page(
+    device_data_service: DeviceDataService,
+    mock_device_data_repository: AsyncMock,
+) -> None:
+    # given
+    query_dto = TimeseriesPageQueryDto(
+        keys="key1",
+        startDate="2023-01-01T00:00:00",  # type: ignore
+        endDate="2025-01-01T00:00:00",  # type: ignore
+        limit=2,
+    )
+    mock_device_data_repository.find_page_by_device_id_and_keys.return_value = [
+        Mock(key="key1", value=1, ts=datetime(2024, 1, 1)),
+    ]
+
+    # when
+    result = await device_data_service.get_timeseries_page_by_keys(
+        device_id=uuid4(), query_dto=query_dto
+    )
+
+    # then
+    assert len(result.data["key1"]) == 1
+    assert result.next_cursor is None
+
+
+def test_timeseries_page_query_dto_invalid_cursor() -> None:
+    with pytest.raises(ValueError):
+        TimeseriesPageQueryDto(
+            keys="key1",
+            startDate="2023-01-01T00:00:00",  # type: ignore
+            endDate="2025-01-01T00:00:00",  # type: ignore
+            cursor="invalid",
+        )
+
+
 async def test_get_timeseries_data_by_keys_with_aggregate(
     device_data_service: DeviceDataService,
     mock_device_data_aggregation_repository: AsyncMock,
@@ -132,12 +482,16 @@ async def test_get_timeseries_data_by_keys_with_aggregate(
         timezone=None,
         intervalType=IntervalType.DAY,
         interval=1,
-        agg=AggregationType.AVG,
+        agg=[AggregationType.AVG],
     )
-    mock_device_data_aggregation_repository.find_aggregation.return_value = [
+    aggregated_data = [
         AggregatedData(ts=datetime.now(), value=1),
         AggregatedData(ts=datetime.now(), value=2),
     ]
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.return_value = {
+        "key1": aggregated_data,
+        "key2": aggregated_data,
+    }
 
     # when
     result = await device_data_service.get_timeseries_data_by_keys(
@@ -170,12 +524,16 @@ async def test_find_aggregation_async(
         timezone=None,
         intervalType=IntervalType.DAY,
         interval=1,
-        agg=AggregationType.AVG,
+        agg=[AggregationType.AVG],
     )
-    mock_device_data_aggregation_repository.find_aggregation.return_value = [
+    aggregated_data = [
         AggregatedData(ts=datetime.now(), value=1),
         AggregatedData(ts=datetime.now(), value=2),
     ]
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.return_value = {
+        "key1": aggregated_data,
+        "key2": aggregated_data,
+    }
 
     # when
     result = await device_data_service.find_aggregation_async(
@@ -190,6 +548,181 @@ async def test_find_aggregation_async(
     assert len(result["key2"]) == 2
     assert result["key2"][0].value == 1
     assert result["key2"][1].value == 2
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.assert_awaited_once()
+
+
+async def test_find_aggregation_async_multiple_agg(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1",
+        startDate="2024-01-01T00:00:00",  # type: ignore
+        endDate="2024-01-02T00:00:00",  # type: ignore
+        intervalType=IntervalType.HOUR,  # type: ignore
+        interval=1,
+        agg="min,max",  # type: ignore
+    )
+    min_data = [AggregatedData(ts=datetime(2024, 1, 1), value=1)]
+    max_data = [AggregatedData(ts=datetime(2024, 1, 1), value=5)]
+    mock_device_data_aggregation_repository.find_aggregations_by_keys.return_value = {
+        "key1": {AggregationType.MIN: min_data, AggregationType.MAX: max_data},
+    }
+
+    # when
+    result = await device_data_service.find_aggregation_async(uuid4(), query_dto)
+
+    # then
+    assert result == {"key1:min": min_data, "key1:max": max_data}
+    call = mock_device_data_aggregation_repository.find_aggregations_by_keys.await_args
+    assert call.kwargs["aggregation_types"] == [AggregationType.MIN, AggregationType.MAX]
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.assert_not_called()
+
+
+async def test_find_aggregation_async_fill(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2024-01-01T00:00:00",  # type: ignore
+        endDate="2024-01-01T02:00:00",  # type: ignore
+        intervalType=IntervalType.HOUR,  # type: ignore
+        interval=1,
+        agg="avg",  # type: ignore
+        fill=FillType.PREVIOUS,
+    )
+    key1_data = [
+        AggregatedData(ts=datetime(2024, 1, 1, 0, 30), value=1.0),
+        AggregatedData(ts=datetime(2024, 1, 1, 1, 30), value=1.0),
+    ]
+    key2_data = [
+        AggregatedData(ts=datetime(2024, 1, 1, 0, 30), value=None),
+        AggregatedData(ts=datetime(2024, 1, 1, 1, 30), value=None),
+    ]
+    mock_device_data_aggregation_repository.find_filled_aggregations_by_keys.return_value = {
+        "key1": {AggregationType.AVG: key1_data},
+        "key2": {AggregationType.AVG: key2_data},
+    }
+
+    # when
+    result = await device_data_service.find_aggregation_async(uuid4(), query_dto)
+
+    # then
+    assert result == {"key1": key1_data, "key2": key2_data}
+    call = mock_device_data_aggregation_repository.find_filled_aggregations_by_keys.await_args
+    assert call.kwargs["fill"] == FillType.PREVIOUS
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.assert_not_called()
+
+
+def test_timeseries_aggregation_query_dto_fill_without_agg() -> None:
+    with pytest.raises(ValueError):
+        TimeseriesAggregationQueryDto(
+            keys="key1",
+            startDate="2023-01-01T00:00:00",  # type: ignore
+            endDate="2025-01-01T00:00:00",  # type: ignore
+            fill=FillType.NULL,
+        )
+
+
+async def test_find_aggregation_async_stitches_cached_closed_buckets(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+    mock_device_data_aggregation_cache: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1",
+        startDate="2024-01-01T00:00:00",  # type: ignore
+        endDate="2024-01-01T04:00:00",  # type: ignore
+        intervalType=IntervalType.HOUR,  # type: ignore
+        interval=1,
+        agg="avg",  # type: ignore
+    )
+    hour = timedelta(hours=1)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    cached = AggregatedData(ts=start + hour / 2, value=1.0)
+    mock_device_data_aggregation_cache.get_many.return_value = (
+        "3",
+        {("key1", AggregationType.AVG): [cached]},
+    )
+    live = [
+        AggregatedData(ts=start + hour * 2.5, value=3.0),
+        AggregatedData(ts=start + hour * 4.5, value=5.0),
+    ]
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.return_value = {"key1": live}
+
+    # when
+    result = await device_data_service.find_aggregation_async(device_id, query_dto)
+
+    # then
+    assert result == {"key1": [cached, *live]}
+    call = mock_device_data_aggregation_repository.find_aggregation_by_keys.await_args
+    assert call.kwargs["start_date"] == datetime(2024, 1, 1, 1)
+    assert mock_device_data_aggregation_cache.get_many.await_args.args[4] == [
+        start + hour * i for i in range(4)
+    ]
+    mock_device_data_aggregation_cache.set_many.assert_awaited_once_with(
+        device_id,
+        "3",
+        hour,
+        Timezone.UTC,
+        {
+            ("key1", AggregationType.AVG): {
+                start + hour: None,
+                start + hour * 2: live[0],
+                start + hour * 3: None,
+            }
+        },
+    )
+
+
+async def test_find_aggregation_async_second_call_reads_closed_buckets_from_cache(
+    mock_device_data_aggregation_repository: AsyncMock,
+    redis_client: Redis,  # type: ignore
+) -> None:
+    # given
+    device_data_service = DeviceDataService(
+        device_data_repository=AsyncMock(),
+        device_data_latest_repository=AsyncMock(),
+        device_data_aggregation_repository=mock_device_data_aggregation_repository,
+        device_data_latest_cache=AsyncMock(),
+        device_data_aggregation_cache=DeviceDataAggregationCache(redis_client),  # type: ignore
+    )
+    device_id = uuid4()
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1,key2",
+        startDate="2024-01-01T00:00:00",  # type: ignore
+        endDate="2024-01-01T04:30:00",  # type: ignore
+        intervalType=IntervalType.HOUR,  # type: ignore
+        interval=1,
+        agg="avg",  # type: ignore
+    )
+    hour = timedelta(hours=1)
+    start = datetime(2024, 1, 1, tzinfo=UTC)
+    # key1 has no data in the second bucket, key2 has no data at all
+    closed = [AggregatedData(ts=start + hour * i + hour / 2, value=float(i)) for i in (0, 2, 3)]
+    live = [AggregatedData(ts=start + hour * 4.5, value=4.0)]
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.side_effect = [
+        {"key1": [*closed, *live], "key2": []},
+        {"key1": live, "key2": []},
+    ]
+
+    # when
+    first = await device_data_service.find_aggregation_async(device_id, query_dto)
+    second = await device_data_service.find_aggregation_async(device_id, query_dto)
+
+    # then
+    assert first == second == {"key1": [*closed, *live], "key2": []}
+    first_call, second_call = (
+        mock_device_data_aggregation_repository.find_aggregation_by_keys.await_args_list
+    )
+    assert first_call.kwargs["start_date"] == datetime(2024, 1, 1)
+    assert second_call.kwargs["start_date"] == datetime(2024, 1, 1, 4)
+    assert second_call.kwargs["keys"] == {"key1", "key2"}
 
 
 async def test_find_aggregation_raise_value_error_missing_agg(
@@ -232,7 +765,7 @@ async def test_find_aggregation_raise_value_error_missing_interval_type(
         timezone=None,
         intervalType=None,  # missing intervalType
         interval=1,
-        agg=AggregationType.AVG,
+        agg=[AggregationType.AVG],
     )
 
     # when
@@ -257,7 +790,7 @@ async def test_find_aggregation_raise_value_error_missing_interval(
         timezone=None,
         intervalType=IntervalType.DAY,
         interval=0,  # interval must be greater than 0
-        agg=AggregationType.AVG,
+        agg=[AggregationType.AVG],
     )
 
     # when
@@ -266,3 +799,138 @@ async def test_find_aggregation_raise_value_error_missing_interval(
             device_id=device_id,
             query_dto=query_dto,
         )
+
+
+@pytest.mark.parametrize(
+    ("start_date", "end_date", "interval_type", "interval", "timezone", "expected"),
+    [
+        (
+            "2024-01-01T00:00:00",
+            "2025-01-01T00:00:00",
+            IntervalType.DAY,
+            1,
+            None,
+            DeviceDataRollup.ONE_DAY,
+        ),
+        (
+            "2024-01-01T00:00:00",
+            "2025-01-01T00:00:00",
+            IntervalType.DAY,
+            1,
+            Timezone.VIETNAM,
+            DeviceDataRollup.ONE_HOUR,
+        ),
+        (
+            "2024-01-01T05:00:00",
+            "2024-01-08T05:00:00",
+            IntervalType.DAY,
+            1,
+            None,
+            DeviceDataRollup.ONE_HOUR,
+        ),
+        (
+            "2024-01-01T05:30:00",
+            "2024-01-02T05:30:00",
+            IntervalType.HOUR,
+            1,
+            None,
+            DeviceDataRollup.ONE_MINUTE,
+        ),
+        ("2024-01-01T05:30:10", "2024-01-02T05:30:10", IntervalType.HOUR, 1, None, None),
+        ("2024-01-01T00:00:00", "2024-01-01T00:01:00", IntervalType.MILLISECOND, 500, None, None),
+    ],
+)
+async def test_find_aggregation_select_rollup(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+    start_date: str,
+    end_date: str,
+    interval_type: IntervalType,
+    interval: int,
+    timezone: Timezone | None,
+    expected: DeviceDataRollup | None,
+) -> None:
+    # given
+    query_dto = TimeseriesAggregationQueryDto(
+        keys="key1",
+        startDate=start_date,  # type: ignore
+        endDate=end_date,  # type: ignore
+        limit=0,
+        orderBy=None,
+        timezone=timezone,
+        intervalType=interval_type,
+        interval=interval,
+        agg=[AggregationType.AVG],
+    )
+    mock_device_data_aggregation_repository.find_aggregation_by_keys.return_value = {"key1": []}
+
+    # when
+    await device_data_service.find_aggregation_async(device_id=uuid4(), query_dto=query_dto)
+
+    # then
+    call = mock_device_data_aggregation_repository.find_aggregation_by_keys.await_args
+    assert call.kwargs["rollup"] == expected
+
+
+async def test_get_stats(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    device_id = uuid4()
+    first_ts = datetime(2026, 10, 1, tzinfo=UTC)
+    last_ts = datetime(2026, 10, 18, tzinfo=UTC)
+    mock_device_data_aggregation_repository.find_stats_by_device_id.return_value = [
+        Mock(
+            key="humidity",
+            count=10,
+            first_ts=first_ts,
+            last_ts=first_ts + timedelta(days=1),
+            min_long=None,
+            min_double=None,
+            max_long=None,
+            max_double=None,
+        ),
+        Mock(
+            key="temperature",
+            count=5,
+            first_ts=first_ts + timedelta(hours=1),
+            last_ts=last_ts,
+            min_long=-3,
+            min_double=1.5,
+            max_long=40,
+            max_double=42.5,
+        ),
+    ]
+
+    # when
+    result = await device_data_service.get_stats(device_id=device_id)
+
+    # then
+    mock_device_data_aggregation_repository.find_stats_by_device_id.assert_awaited_once_with(
+        device_id
+    )
+    assert result.count == 15
+    assert result.first_ts == first_ts
+    assert result.last_ts == last_ts
+    assert [k.key for k in result.keys] == ["humidity", "temperature"]
+    assert result.keys[0].min_value is None
+    assert result.keys[1].min_value == -3
+    assert result.keys[1].max_value == 42.5
+
+
+async def test_get_stats_without_data(
+    device_data_service: DeviceDataService,
+    mock_device_data_aggregation_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_aggregation_repository.find_stats_by_device_id.return_value = []
+
+    # when
+    result = await device_data_service.get_stats(device_id=uuid4())
+
+    # then
+    assert result.count == 0
+    assert result.first_ts is None
+    assert result.last_ts is None
+    assert result.keys == []
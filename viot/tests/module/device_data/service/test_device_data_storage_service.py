@@ -0,0 +1,153 @@
+from datetime import timedelta
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.module.device_data.dto.device_data_storage_dto import (
+    DeviceDataStoragePolicyUpdateDto,
+    RetentionPolicyUpdateDto,
+)
+from app.module.device_data.exception.device_data_storage_exception import (
+    RetentionPolicyNotFoundException,
+)
+from app.module.device_data.model.device_data_retention_policy import DeviceDataRetentionPolicy
+from app.module.device_data.service.device_data_storage_service import DeviceDataStorageService
+from app.module.team.exception.team_exception import TeamNotFoundException
+
+
+@pytest.fixture
+def mock_device_data_storage_repository() -> AsyncMock:
+    mock = AsyncMock()
+    mock.find_policy.return_value = (timedelta(days=14), timedelta(days=7), None)
+    return mock
+
+
+@pytest.fixture
+def mock_device_data_retention_policy_repository() -> AsyncMock:
+    mock = AsyncMock()
+    mock.save.side_effect = lambda policy: policy
+    return mock
+
+
+@pytest.fixture
+def mock_team_repository() -> AsyncMock:
+    return AsyncMock()
+
+
+@pytest.fixture
+def device_data_storage_service(
+    mock_device_data_storage_repository: AsyncMock,
+    mock_device_data_retention_policy_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> DeviceDataStorageService:
+    return DeviceDataStorageService(
+        device_data_storage_repository=mock_device_data_storage_repository,
+        device_data_retention_policy_repository=mock_device_data_retention_policy_repository,
+        team_repository=mock_team_repository,
+    )
+
+
+async def test_get_storage_policy(
+    device_data_storage_service: DeviceDataStorageService,
+) -> None:
+    # when
+    result = await device_data_storage_service.get_storage_policy()
+
+    # then
+    assert result.chunk_time_interval_hours == 14 * 24
+    assert result.compress_after_days == 7
+    assert result.drop_after_days is None
+
+
+async def test_update_storage_policy_only_changes_given_fields(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_storage_repository: AsyncMock,
+) -> None:
+    # given
+    policy_update_dto = DeviceDataStoragePolicyUpdateDto.model_validate(
+        {"chunkTimeIntervalHours": 24, "compressAfterDays": None}
+    )
+
+    # when
+    await device_data_storage_service.update_storage_policy(policy_update_dto=policy_update_dto)
+
+    # then
+    mock_device_data_storage_repository.set_chunk_time_interval.assert_called_once_with(
+        timedelta(hours=24)
+    )
+    mock_device_data_storage_repository.set_compression_policy.assert_called_once_with(None)
+    mock_device_data_storage_repository.set_retention_policy.assert_not_called()
+
+
+async def test_set_retention_policy_creates_policy(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_policy_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    mock_device_data_retention_policy_repository.find.return_value = None
+    mock_team_repository.exists_by_id.return_value = True
+
+    # when
+    result = await device_data_storage_service.set_retention_policy(
+        team_id=team_id,
+        retention_policy_update_dto=RetentionPolicyUpdateDto(retention_days=30),
+    )
+
+    # then
+    assert result.team_id == team_id
+    assert result.retention_days == 30
+    mock_device_data_retention_policy_repository.save.assert_called_once()
+
+
+async def test_set_retention_policy_updates_existing_policy(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_policy_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    team_id = uuid4()
+    policy = DeviceDataRetentionPolicy(team_id=team_id, retention_days=90)
+    mock_device_data_retention_policy_repository.find.return_value = policy
+
+    # when
+    result = await device_data_storage_service.set_retention_policy(
+        team_id=team_id,
+        retention_policy_update_dto=RetentionPolicyUpdateDto(retention_days=30),
+    )
+
+    # then
+    assert result.retention_days == 30
+    mock_team_repository.exists_by_id.assert_not_called()
+
+
+async def test_set_retention_policy_team_not_found(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_policy_repository: AsyncMock,
+    mock_team_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_retention_policy_repository.find.return_value = None
+    mock_team_repository.exists_by_id.return_value = False
+
+    # when, then
+    with pytest.raises(TeamNotFoundException):
+        await device_data_storage_service.set_retention_policy(
+            team_id=uuid4(),
+            retention_policy_update_dto=RetentionPolicyUpdateDto(retention_days=30),
+        )
+    mock_device_data_retention_policy_repository.save.assert_not_called()
+
+
+async def test_delete_retention_policy_not_found(
+    device_data_storage_service: DeviceDataStorageService,
+    mock_device_data_retention_policy_repository: AsyncMock,
+) -> None:
+    # given
+    mock_device_data_retention_policy_repository.find.return_value = None
+
+    # when, then
+    with pytest.raises(RetentionPolicyNotFoundException):
+        await device_data_storage_service.delete_retention_policy(team_id=uuid4())
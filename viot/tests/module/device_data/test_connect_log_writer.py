@@ -0,0 +1,117 @@
+import asyncio
+from datetime import UTC, datetime
+from typing import Any
+from unittest.mock import AsyncMock
+from uuid import UUID, uuid4
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.module.device_data.config import device_data_settings
+from app.module.device_data.connect_log_writer import ConnectLogWriter
+from app.module.device_data.constants import ConnectStatus
+
+
+def _enqueue(writer: ConnectLogWriter, device_id: UUID | None = None) -> bool:
+    return writer.enqueue(
+        device_id=device_id or uuid4(),
+        ts=datetime.now(UTC),
+        connect_status=ConnectStatus.CONNECTED,
+        ip="192.168.1.1",
+    )
+
+
+async def test_writer_flushes_by_size(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_FLUSH_SIZE", 2)
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_FLUSH_INTERVAL_MS", 60_000)
+    repository = AsyncMock()
+    writer = ConnectLogWriter(connect_log_batch_repository=repository)
+
+    # when
+    for _ in range(3):
+        _enqueue(writer)
+    await asyncio.sleep(0.01)
+
+    # then
+    repository.insert_many.assert_called_once()
+    assert len(repository.insert_many.call_args.args[0]) == 2
+    assert writer.metrics().queue_depth == 0
+    await writer.drain()
+    assert repository.insert_many.call_count == 2
+    assert writer.metrics().written == 3
+
+
+async def test_writer_flushes_by_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_FLUSH_INTERVAL_MS", 10)
+    repository = AsyncMock()
+    writer = ConnectLogWriter(connect_log_batch_repository=repository)
+
+    # when
+    _enqueue(writer)
+    await asyncio.sleep(0.05)
+
+    # then
+    repository.insert_many.assert_called_once()
+    metrics = writer.metrics()
+    assert metrics.flushes == 1
+    assert metrics.last_flush_latency_ms is not None
+    await writer.drain()
+
+
+async def test_writer_drops_logs_when_queue_is_full(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_QUEUE_SIZE", 1)
+    repository = AsyncMock()
+    writer = ConnectLogWriter(connect_log_batch_repository=repository)
+
+    # when
+    results = [_enqueue(writer), _enqueue(writer)]
+
+    # then
+    assert results == [True, False]
+    assert writer.metrics().dropped == 1
+    await writer.drain()
+    assert writer.metrics().written == 1
+
+
+async def test_writer_counts_failed_logs(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    repository = AsyncMock()
+    repository.insert_many.side_effect = RuntimeError("insert failed")
+    writer = ConnectLogWriter(connect_log_batch_repository=repository)
+
+    # when
+    _enqueue(writer)
+    await writer.drain()
+
+    # then
+    assert writer.metrics().failed == 1
+    assert writer.metrics().written == 0
+
+
+async def test_writer_drops_only_the_logs_failing_on_their_own(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_FLUSH_SIZE", 8)
+    monkeypatch.setattr(device_data_settings, "CONNECT_LOG_FLUSH_INTERVAL_MS", 60_000)
+    deleted_device_id = uuid4()
+
+    async def insert_many(rows: list[dict[str, Any]]) -> None:
+        if any(row["device_id"] == deleted_device_id for row in rows):
+            raise IntegrityError("INSERT", None, Exception("foreign key violation"))
+
+    repository = AsyncMock()
+    repository.insert_many.side_effect = insert_many
+    writer = ConnectLogWriter(connect_log_batch_repository=repository)
+
+    # when
+    for i in range(8):
+        _enqueue(writer, deleted_device_id if i == 5 else None)
+    await writer.drain()
+
+    # then
+    metrics = writer.metrics()
+    assert (metrics.written, metrics.failed, metrics.flushes) == (7, 1, 1)
@@ -0,0 +1,27 @@
+from datetime import UTC, datetime
+from uuid import uuid4
+
+from redis.asyncio import Redis
+
+from app.module.device_data.cache.device_data_latest_cache import (
+    DeviceDataLatestCache,
+    LatestDataPoint,
+    device_data_latest_cache_key,
+)
+
+
+async def test_read_through_doesnt_extend_the_ttl(redis_client: Redis) -> None:  # type: ignore
+    # given
+    cache = DeviceDataLatestCache(redis_client)  # type: ignore
+    device_id = uuid4()
+    cache_key = device_data_latest_cache_key(device_id)
+    await cache.set_many(device_id, {"temperature": LatestDataPoint(datetime.now(UTC), 20.0)})
+    await redis_client.expire(cache_key, 1)
+
+    # when
+    await cache.set_many(device_id, {"humidity": LatestDataPoint(datetime.now(UTC), 40.0)})
+
+    # then
+    assert await redis_client.ttl(cache_key) == 1
+    cached, _ = await cache.get_many(device_id, {"temperature", "humidity"})
+    assert cached.keys() == {"temperature", "humidity"}
@@ -0,0 +1,46 @@
+import numpy as np
+
+from app.module.device_data.downsampling import lttb_indices, stride_indices
+
+
+def test_lttb_indices_keeps_first_last_and_extremes() -> None:
+    # given
+    x = np.arange(7, dtype=np.float64)
+    y = np.array([0, 1, 10, 1, -10, 1, 0], dtype=np.float64)
+
+    # when
+    result = lttb_indices(x, y, 4)
+
+    # then
+    assert result.tolist() == [0, 2, 4, 6]
+
+
+def test_lttb_indices_returns_max_points_in_order() -> None:
+    # given
+    x = np.arange(10_000, dtype=np.float64) + 1.7e9
+    y = np.sin(x / 100)
+
+    # when
+    result = lttb_indices(x, y, 100)
+
+    # then
+    assert len(result) == 100
+    assert result[0] == 0
+    assert result[-1] == 9_999
+    assert np.all(np.diff(result) > 0)
+
+
+def test_lttb_indices_less_points_than_max_points() -> None:
+    # given
+    x = np.arange(5, dtype=np.float64)
+
+    # when
+    result = lttb_indices(x, x, 10)
+
+    # then
+    assert result.tolist() == [0, 1, 2, 3, 4]
+
+
+def test_stride_indices() -> None:
+    assert stride_indices(10, 4).tolist() == [0, 3, 6, 9]
+    assert stride_indices(3, 10).tolist() == [0, 1, 2]
@@ -0,0 +1,90 @@
+import asyncio
+from datetime import UTC, datetime
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.module.device_data.config import device_data_settings
+from app.module.device_data.ingest_batcher import DeviceDataIngestBatcher
+from app.module.device_data.repository.device_data_ingest_repository import IngestRow
+
+
+def _row(key: str) -> IngestRow:
+    return (uuid4(), datetime.now(UTC), key, None, None, 1, None, None)
+
+
+async def test_submit_coalesces_concurrent_rows_into_one_write(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "INGEST_BATCH_WINDOW_MS", 10)
+    repository = AsyncMock()
+    batcher = DeviceDataIngestBatcher(device_data_ingest_repository=repository)
+
+    # when
+    await asyncio.gather(batcher.submit([_row("a")]), batcher.submit([_row("b"), _row("c")]))
+
+    # then
+    repository.insert_rows.assert_called_once()
+    assert [row[2] for row in repository.insert_rows.call_args.args[0]] == ["a", "b", "c"]
+
+
+async def test_submit_writes_full_batch_right_away(monkeypatch: pytest.MonkeyPatch) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "INGEST_BATCH_WINDOW_MS", 60_000)
+    monkeypatch.setattr(device_data_settings, "INGEST_BATCH_MAX_ROWS", 2)
+    repository = AsyncMock()
+    batcher = DeviceDataIngestBatcher(device_data_ingest_repository=repository)
+
+    # when
+    await asyncio.wait_for(batcher.submit([_row("a"), _row("b")]), timeout=1)
+
+    # then
+    repository.insert_rows.assert_called_once()
+
+
+async def test_submit_isolates_the_error_of_a_submitter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "INGEST_BATCH_WINDOW_MS", 10)
+
+    async def insert_rows(rows: list[IngestRow]) -> set[IngestRow]:
+        if any(row[2] == "bad" for row in rows):
+            raise RuntimeError("copy failed")
+        return set(rows)
+
+    repository = AsyncMock()
+    repository.insert_rows.side_effect = insert_rows
+    batcher = DeviceDataIngestBatcher(device_data_ingest_repository=repository)
+    good_rows = [_row("a")]
+
+    # when
+    results = await asyncio.gather(
+        batcher.submit(good_rows), batcher.submit([_row("bad")]), return_exceptions=True
+    )
+
+    # then
+    assert results[0] == good_rows
+    assert isinstance(results[1], RuntimeError)
+    assert repository.insert_rows.call_count == 3
+
+
+async def test_submit_returns_the_inserted_rows_of_the_submitter(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # given
+    monkeypatch.setattr(device_data_settings, "INGEST_BATCH_WINDOW_MS", 10)
+    a, b, c = _row("a"), _row("b"), _row("c")
+    repository = AsyncMock()
+    # b already exists
+    repository.insert_rows.return_value = {a, c}
+    batcher = DeviceDataIngestBatcher(device_data_ingest_repository=repository)
+
+    # when
+    first, second = await asyncio.gather(batcher.submit([a, b]), batcher.submit([c]))
+
+    # then
+    assert (first, second) == ([a], [c])
+    repository.insert_rows.assert_called_once()
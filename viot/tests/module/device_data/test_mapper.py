@@ -4,8 +4,9 @@ from unittest.mock import Mock
 import pytest
 from pytest import approx  # type: ignore
 
+from app.module.device_data.constants import AggregationType
 from app.module.device_data.dto.device_data_dto import AggregatedData
-from app.module.device_data.mapper import AggregatedDataMapper
+from app.module.device_data.mapper import AggregatedDataMapper, TypedValueMapper
 
 
 @pytest.fixture
@@ -101,3 +102,75 @@ def test_map_from_count_rows_with_json_value(mock_sample_row: Mock) -> None:
     result = AggregatedDataMapper.map_from_count_rows(rows)
     assert len(result) == 1
     assert result[0].value == 9
+
+
+def test_map_rows_by_key(mock_sample_row: Mock) -> None:
+    mock_sample_row.key = "key1"
+    other_row = Mock(
+        key="key2",
+        bucket=datetime(2023, 1, 1),
+        interval=timedelta(seconds=3600),
+        long_value=1,
+        double_value=0,
+    )
+    rows = [mock_sample_row, other_row]
+    result = AggregatedDataMapper.map_rows_by_key(
+        rows, ["key1", "key2", "key3"], AggregatedDataMapper.map_from_sum_rows
+    )
+    assert result.keys() == {"key1", "key2", "key3"}
+    assert result["key1"][0].value == approx(15.5)
+    assert result["key2"][0].value == approx(1)
+    assert result["key3"] == []
+
+
+def test_map_from_combined_rows() -> None:
+    row = Mock(
+        bucket=datetime(2023, 1, 1),
+        interval=timedelta(seconds=3600),
+        sum_long=10,
+        sum_double=5.5,
+        min_long=4,
+        min_double=5.5,
+        max_long=6,
+        max_double=5.5,
+        count_long_value=2,
+        count_double_value=1,
+        count_bool_value=0,
+        count_str_value=0,
+        count_json_value=0,
+    )
+    result = AggregatedDataMapper.map_from_combined_rows(
+        [row], [AggregationType.MIN, AggregationType.AVG, AggregationType.MAX]
+    )
+    assert list(result) == [AggregationType.MIN, AggregationType.AVG, AggregationType.MAX]
+    assert result[AggregationType.MIN][0].value == 4
+    assert result[AggregationType.AVG][0].value == approx(15.5 / 3)
+    assert result[AggregationType.MAX][0].value == 6
+    assert result[AggregationType.AVG][0].ts == datetime(2023, 1, 1, 0, 30)
+
+
+def test_map_from_filled_rows() -> None:
+    rows = [
+        Mock(bucket=datetime(2023, 1, 1, hour), interval=timedelta(hours=1), avg_value=value)
+        for hour, value in ((0, 1.5), (1, None))
+    ]
+    result = AggregatedDataMapper.map_from_filled_rows(rows, [AggregationType.AVG])
+    assert result[AggregationType.AVG] == [
+        AggregatedData(ts=datetime(2023, 1, 1, 0, 30), value=1.5),
+        AggregatedData(ts=datetime(2023, 1, 1, 1, 30), value=None),
+    ]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (True, (True, None, None, None, None)),
+        ("on", (None, "on", None, None, None)),
+        (1, (None, None, 1, None, None)),
+        (2**64, (None, None, None, float(2**64), None)),
+        (1.5, (None, None, None, 1.5, None)),
+        ([1, {"a": None}], (None, None, None, None, '[1,{"a":null}]')),
+    ],
+)
+def test_typed_value_mapper_to_columns(value: object, expected: tuple[object, ...]) -> None:
+    assert TypedValueMapper.to_columns(value) == expected
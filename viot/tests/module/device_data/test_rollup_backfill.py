@@ -0,0 +1,85 @@
+from datetime import UTC, datetime, timedelta
+from uuid import uuid4
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.database.context import session_ctx
+from app.module.device.constants import DeviceType
+from app.module.device.model.device import Device
+from app.module.device_data.model.device_data import DeviceData
+from app.module.device_data.repository.device_data_aggregation_repository import (
+    DeviceDataAggregationRepository,
+)
+from app.module.team.model.team import Team
+from tests.utils import migrations
+
+# Revision before the backfill of the rollups
+_PRE_BACKFILL_REVISION = "e5707fb8d3f7"
+
+# Windows refreshed by the policies of the rollups, (view, start offset, end offset)
+_POLICY_WINDOWS = (
+    ("device_data_1m", "3 hours", "1 minute"),
+    ("device_data_1h", "3 days", "1 hour"),
+    ("device_data_1d", "30 days", "1 day"),
+)
+
+
+async def test_stats_include_history_older_than_the_policy_windows(
+    migrated_engine: AsyncEngine,
+) -> None:
+    # given
+    now = datetime.now(UTC)
+    old_ts = now - timedelta(days=90)
+    recent_ts = now - timedelta(days=2)
+    async with AsyncSession(migrated_engine, expire_on_commit=False) as session:
+        team = Team(name="Rollups", slug=f"rollups-{uuid4().hex}", description=None, default=False)
+        session.add(team)
+        await session.flush()
+        device = Device(
+            name=f"Rollups {uuid4().hex}",
+            description="",
+            device_type=DeviceType.DEVICE,
+            team_id=team.id,
+        )
+        session.add(device)
+        await session.flush()
+        session.add_all(
+            [
+                DeviceData(device_id=device.id, ts=old_ts, key="temperature", double_v=10.0),
+                DeviceData(device_id=device.id, ts=recent_ts, key="temperature", double_v=30.0),
+            ]
+        )
+        await session.commit()
+
+    # The policies materialize their windows, which moves the watermark past the history
+    async with migrated_engine.connect() as conn:
+        conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+        for view, start_offset, end_offset in _POLICY_WINDOWS:
+            await conn.execute(
+                text(
+                    f"CALL refresh_continuous_aggregate('{view}', "
+                    f"now() - INTERVAL '{start_offset}', now() - INTERVAL '{end_offset}');"
+                )
+            )
+
+    # when
+    async with migrated_engine.connect() as conn:
+        await conn.run_sync(migrations.downgrade, _PRE_BACKFILL_REVISION)
+    async with migrated_engine.connect() as conn:
+        await conn.run_sync(migrations.upgrade)
+
+    async with AsyncSession(migrated_engine) as session:
+        token = session_ctx.set(session)
+        try:
+            rows = await DeviceDataAggregationRepository(session_ctx).find_stats_by_device_id(
+                device.id
+            )
+        finally:
+            session_ctx.reset(token)
+
+    # then
+    [(key, count, first_ts, last_ts, _, min_double, _, max_double)] = rows
+    assert (key, count) == ("temperature", 2)
+    assert (first_ts, last_ts) == (old_ts, recent_ts)
+    assert (min_double, max_double) == (10.0, 30.0)
@@ -25,7 +25,12 @@ def mock_device_repository() -> AsyncMock:
 
 
 @pytest.fixture
-def mock_connect_log_repository() -> AsyncMock:
+def mock_connect_log_writer() -> Mock:
+    return Mock()
+
+
+@pytest.fixture
+def mock_device_presence_cache() -> AsyncMock:
     return AsyncMock()
 
 
@@ -37,12 +42,14 @@ def mock_mqtt_whitelist_service() -> Mock:
 @pytest.fixture
 def emqx_device_auth_service(
     mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
+    mock_device_presence_cache: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
 ) -> EmqxDeviceAuthService:
     return EmqxDeviceAuthService(
         device_repository=mock_device_repository,
-        connect_log_repository=mock_connect_log_repository,
+        connect_log_writer=mock_connect_log_writer,
+        device_presence_cache=mock_device_presence_cache,
         mqtt_whitelist_service=mock_mqtt_whitelist_service,
     )
 
@@ -59,7 +66,7 @@ def emqx_authen_request_dto() -> EmqxAuthenRequestDto:
 
 async def test_authenticate_device_in_whitelist(
     emqx_device_auth_service: EmqxDeviceAuthService,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
@@ -74,7 +81,7 @@ async def test_authenticate_device_in_whitelist(
     assert response.is_superuser is True
 
     # then
-    mock_connect_log_repository.save.assert_not_called()
+    mock_connect_log_writer.enqueue.assert_not_called()
 
 
 async def test_authenticate_device_not_found(
@@ -95,7 +102,7 @@ async def test_authenticate_device_not_found(
 async def test_authenticate_device_credentials_invalid(
     emqx_device_auth_service: EmqxDeviceAuthService,
     mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
@@ -108,13 +115,13 @@ async def test_authenticate_device_credentials_invalid(
         await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
 
     # then
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_writer.enqueue.assert_called_once()
 
 
 async def test_authenticate_device_disabled(
     emqx_device_auth_service: EmqxDeviceAuthService,
     mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
@@ -129,22 +136,21 @@ async def test_authenticate_device_disabled(
         await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
 
     # then
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_writer.enqueue.assert_called_once()
 
 
 async def test_authenticate_success(
     emqx_device_auth_service: EmqxDeviceAuthService,
     mock_device_repository: AsyncMock,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
+    mock_device_presence_cache: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
     emqx_authen_request_dto: EmqxAuthenRequestDto,
 ) -> None:
     # given
+    device = Mock(id=uuid4(), team_id=uuid4(), token="valid_token", disabled=False)
     mock_mqtt_whitelist_service.validate_mqtt_client = Mock(return_value=False)
-    mock_device_repository.find = AsyncMock(
-        return_value=Mock(id=uuid4(), token="valid_token", disabled=False)
-    )
-    mock_connect_log_repository.save = AsyncMock()
+    mock_device_repository.find = AsyncMock(return_value=device)
 
     # when
     response = await emqx_device_auth_service.authenticate(request_dto=emqx_authen_request_dto)
@@ -153,7 +159,9 @@ async def test_authenticate_success(
     assert response.result == "allow"
     assert response.is_superuser is False
 
-    mock_connect_log_repository.save.assert_called_once()
+    mock_connect_log_writer.enqueue.assert_called_once()
+    mock_device_presence_cache.set_online.assert_awaited_once()
+    assert mock_device_presence_cache.set_online.call_args.args[:2] == (device.id, device.team_id)
 
 
 @pytest.mark.parametrize(
@@ -11,12 +11,12 @@ from app.module.emqx.service.emqx_event_service import EmqxEventService
 
 
 @pytest.fixture
-def mock_connect_log_repository() -> AsyncMock:
-    return AsyncMock()
+def mock_connect_log_writer() -> Mock:
+    return Mock()
 
 
 @pytest.fixture
-def mock_device_repository() -> AsyncMock:
+def mock_device_presence_cache() -> AsyncMock:
     return AsyncMock()
 
 
@@ -27,13 +27,13 @@ def mock_mqtt_whitelist_service() -> Mock:
 
 @pytest.fixture
 def emqx_event_service(
-    mock_connect_log_repository: AsyncMock,
-    mock_device_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
+    mock_device_presence_cache: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
 ) -> EmqxEventService:
     return EmqxEventService(
-        connect_log_repository=mock_connect_log_repository,
-        device_repository=mock_device_repository,
+        connect_log_writer=mock_connect_log_writer,
+        device_presence_cache=mock_device_presence_cache,
         mqtt_whitelist_service=mock_mqtt_whitelist_service,
     )
 
@@ -74,7 +74,8 @@ async def test_handle_device_connected_in_whitelist(
 
 async def test_handle_device_disconnected_not_in_whitelist(
     emqx_event_service: EmqxEventService,
-    mock_connect_log_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
+    mock_device_presence_cache: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
 ) -> None:
     # given
@@ -89,13 +90,16 @@ async def test_handle_device_disconnected_not_in_whitelist(
     await emqx_event_service.handle_device_disconnected(event=event)
 
     # then
-    mock_connect_log_repository.save.assert_awaited_once()
+    mock_connect_log_writer.enqueue.assert_called_once()
+    mock_device_presence_cache.set_offline.assert_awaited_once_with(
+        device_id, event.disconnected_at
+    )
 
 
 async def test_handle_device_disconnected_in_whitelist(
     emqx_event_service: EmqxEventService,
-    mock_connect_log_repository: AsyncMock,
-    mock_device_repository: AsyncMock,
+    mock_connect_log_writer: Mock,
+    mock_device_presence_cache: AsyncMock,
     mock_mqtt_whitelist_service: Mock,
 ) -> None:
     # given
@@ -110,16 +114,16 @@ async def test_handle_device_disconnected_in_whitelist(
     await emqx_event_service.handle_device_disconnected(event=event)
 
     # then
-    mock_connect_log_repository.save.assert_not_called()
-    mock_device_repository.update_device_status.assert_not_called()
+    mock_connect_log_writer.enqueue.assert_not_called()
+    mock_device_presence_cache.set_offline.assert_not_called()
 
 
 @patch("app.module.emqx.service.emqx_event_service.AsyncClient")
 async def test_subscribe_device_topics(mock_async_client: AsyncMock) -> None:
     # given
     emqx_event_service = EmqxEventService(
-        connect_log_repository=AsyncMock(),
-        device_repository=AsyncMock(),
+        connect_log_writer=Mock(),
+        device_presence_cache=AsyncMock(),
         mqtt_whitelist_service=Mock(),
     )
     device_id = uuid4()
@@ -141,8 +145,8 @@ async def test_subscribe_device_topics_throws_exception_on_failure(
 ) -> None:
     # given
     emqx_event_service = EmqxEventService(
-        connect_log_repository=AsyncMock(),
-        device_repository=AsyncMock(),
+        connect_log_writer=Mock(),
+        device_presence_cache=AsyncMock(),
         mqtt_whitelist_service=Mock(),
     )
     device_id = uuid4()
@@ -3,7 +3,9 @@ from unittest.mock import AsyncMock, Mock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.context import run_after_commit
 from app.database.repository.pagination import Page
 from app.module.auth.constants import TEAM_ROLE_OWNER
 from app.module.auth.exception.role_exception import RoleIdNotFoundException
@@ -29,16 +31,23 @@ def mock_user_team_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_team_permission_cache() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def member_service(
     mock_user_repository: AsyncMock,
     mock_role_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
 ) -> MemberService:
     return MemberService(
         user_repository=mock_user_repository,
         role_repository=mock_role_repository,
         user_team_role_repository=mock_user_team_role_repository,
+        team_permission_cache=mock_team_permission_cache,
     )
 
 
@@ -123,7 +132,11 @@ async def test_get_member_by_id_and_team_id(
 
 
 async def test_update_member(
-    member_service: MemberService, mock_role_repository: AsyncMock, mock_user: Mock
+    member_service: MemberService,
+    mock_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
+    mock_user: Mock,
+    session_context: AsyncSession,
 ) -> None:
     # given
     team_id = uuid4()
@@ -147,6 +160,9 @@ async def test_update_member(
     # then
     assert result.id == mock_user.id
     assert result.role == role_name
+    mock_team_permission_cache.invalidate_member.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_team_permission_cache.invalidate_member.assert_awaited_once_with(member_id, team_id)
 
 
 async def test_update_member_no_role_id(member_service: MemberService, mock_user: Mock) -> None:
@@ -220,7 +236,10 @@ async def test_update_member_same_role(
 
 
 async def test_delete_member(
-    member_service: MemberService, mock_user_repository: AsyncMock
+    member_service: MemberService,
+    mock_user_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
+    session_context: AsyncSession,
 ) -> None:
     # given
     team_id = uuid4()
@@ -231,6 +250,9 @@ async def test_delete_member(
 
     # then
     mock_user_repository.delete_user_by_id_and_team_id.assert_called_once()
+    mock_team_permission_cache.invalidate_member.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_team_permission_cache.invalidate_member.assert_awaited_once_with(member_id, team_id)
 
 
 async def test_validate_sensitive_role(
@@ -1,7 +1,9 @@
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.context import run_after_commit
 from app.database.repository import Page
 from app.module.auth.exception.user_exception import UserNotFoundException
 from app.module.team.dto.team_invitation_dto import TeamInvitationCreateDto
@@ -40,6 +42,11 @@ def mock_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_team_permission_cache() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def team_invitation_service(
     mock_email_service: Mock,
@@ -48,6 +55,7 @@ def team_invitation_service(
     mock_team_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
     mock_role_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
 ) -> TeamInvitationService:
     return TeamInvitationService(
         email_service=mock_email_service,
@@ -56,6 +64,7 @@ def team_invitation_service(
         team_repository=mock_team_repository,
         user_team_role_repository=mock_user_team_role_repository,
         role_repository=mock_role_repository,
+        team_permission_cache=mock_team_permission_cache,
     )
 
 
@@ -214,8 +223,10 @@ async def test_accept_team_invitation_correctly(
     team_invitation_service: TeamInvitationService,
     mock_team_invitation_repository: AsyncMock,
     mock_user_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
     mock_user: Mock,
     mock_team_invitation: Mock,
+    session_context: AsyncSession,
 ) -> None:
     # given
     mock_team_invitation_repository.find_by_token.return_value = mock_team_invitation
@@ -230,6 +241,11 @@ async def test_accept_team_invitation_correctly(
     )
     mock_user_repository.find_id_by_email.assert_called_once_with(mock_team_invitation.email)
     mock_team_invitation_repository.delete.assert_called_once_with(mock_team_invitation)
+    mock_team_permission_cache.invalidate_member.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_team_permission_cache.invalidate_member.assert_awaited_once_with(
+        mock_user.id, mock_team_invitation.team_id
+    )
 
 
 async def test_accept_team_invitation_raises_when_invitation_not_found(
@@ -2,7 +2,9 @@ from unittest.mock import AsyncMock, Mock, call, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database.context import run_after_commit
 from app.module.team.dto.team_dto import TeamCreateDto, TeamUpdateDto
 from app.module.team.exception.team_exception import (
     TeamNotFoundException,
@@ -32,18 +34,25 @@ def mock_user_team_role_repository() -> AsyncMock:
     return AsyncMock()
 
 
+@pytest.fixture
+def mock_team_permission_cache() -> AsyncMock:
+    return AsyncMock()
+
+
 @pytest.fixture
 def team_service(
     mock_team_repository: AsyncMock,
     mock_permission_repository: AsyncMock,
     mock_user_team_role_repository: AsyncMock,
     mock_team_role_service: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
 ) -> TeamService:
     return TeamService(
         team_repository=mock_team_repository,
         team_role_service=mock_team_role_service,
         permission_repository=mock_permission_repository,
         user_team_role_repository=mock_user_team_role_repository,
+        team_permission_cache=mock_team_permission_cache,
     )
 
 
@@ -247,8 +256,15 @@ async def test_update_team_correctly_when_slug_already_exists(
 
 
 async def test_delete_team_correctly(
-    team_service: TeamService, mock_team_repository: AsyncMock, mock_team: Mock
+    team_service: TeamService,
+    mock_team_repository: AsyncMock,
+    mock_team_permission_cache: AsyncMock,
+    mock_team: Mock,
+    session_context: AsyncSession,
 ) -> None:
     await team_service.delete_team_by_id(team_id=mock_team.id)
 
     mock_team_repository.delete_by_id.assert_called_once_with(mock_team.id)
+    mock_team_permission_cache.invalidate_team.assert_not_awaited()
+    await run_after_commit(session_context)
+    mock_team_permission_cache.invalidate_team.assert_awaited_once_with(mock_team.id)